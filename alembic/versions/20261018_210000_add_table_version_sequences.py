@@ -0,0 +1,28 @@
+"""Add table version sequences
+
+Revision ID: 9c3d5e7f1a2b
+Revises: c27a9d4e5f18
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "9c3d5e7f1a2b"
+down_revision = "c27a9d4e5f18"
+branch_labels = None
+depends_on = None
+
+# the versioned tables of the food catalog, see table_versions.py
+versioned_tables = ["food", "food_category", "item", "item_has_food", "item_can_eat_at"]
+
+
+def upgrade():
+    for table_name in versioned_tables:
+        op.execute(sa.schema.CreateSequence(sa.Sequence(f"{table_name}_version_seq")))
+
+
+def downgrade():
+    for table_name in versioned_tables:
+        op.execute(sa.schema.DropSequence(sa.Sequence(f"{table_name}_version_seq")))
@@ -0,0 +1,23 @@
+"""Add forbidden foods version sequence
+
+Revision ID: 4d8a2c6e0b13
+Revises: 9c3d5e7f1a2b
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "4d8a2c6e0b13"
+down_revision = "9c3d5e7f1a2b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(sa.schema.CreateSequence(sa.Sequence("forbidden_foods_version_seq")))
+
+
+def downgrade():
+    op.execute(sa.schema.DropSequence(sa.Sequence("forbidden_foods_version_seq")))
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 from dotenv import load_dotenv
 
@@ -28,3 +29,16 @@ DATABASE_NAME = os.getenv("DATABASE_NAME") if APP_ENV != "test" else TEST_DATABA
 TOKEN_SECRET_KEY = os.getenv("TOKEN_SECRET_KEY")
 TOKEN_EXPIRATION_MINUTES = int(os.getenv("TOKEN_EXPIRATION_MINUTES"))
 TOKEN_ALGORITHM = os.getenv("TOKEN_ALGORITHM")
+PREVIEW_EXPIRATION_MINUTES = int(os.getenv("PREVIEW_EXPIRATION_MINUTES", 60))
+
+# --------------- DEFAULT BACKGROUND JOBS --------------- #
+JOB_BACKEND = os.getenv("JOB_BACKEND", "local")
+JOB_STORE = os.getenv("JOB_STORE", "sqlite")
+JOB_SQLITE_PATH = os.getenv("JOB_SQLITE_PATH") or os.path.join(ROOT_DIR, "jobs.sqlite3")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
+
+# --------------- DEFAULT FOOD CATALOG SNAPSHOT --------------- #
+FOOD_CATALOG_SNAPSHOT_DIR = os.getenv("FOOD_CATALOG_SNAPSHOT_DIR") or os.path.join(
+    tempfile.gettempdir(), "aquavitae_food_catalog"
+)
@@ -0,0 +1,13 @@
+"""
+Celery worker of the background jobs, when JOB_BACKEND=celery:
+
+    $ celery -A src.celery_worker worker
+"""
+from src.modules.app import app_routers  # noqa: F401 (registers every job function)
+from src.modules.infrastructure.database.entity_registry import entity_registry
+from src.modules.infrastructure.jobs import job_queue
+
+# Precompute the mapper information of every entity used by the repositories
+entity_registry.build()
+
+celery_app = job_queue.backend.app
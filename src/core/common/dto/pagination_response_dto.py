@@ -8,28 +8,37 @@ T = TypeVar("T")
 
 class PaginationResponseDto(GenericModel, Generic[T]):
     data: List[T]
-    count: int
+    count: Union[int, None]
     limit: int
     current_page: int
     next_page: Union[int, None]
     prev_page: Union[int, None]
-    last_page: int
+    last_page: Union[int, None]
+    next_cursor: Union[str, None]
 
     class Config:
         extra = Extra.forbid
 
 
 def create_pagination_response_dto(
-    data: List[Type[T]], total: int, skip: int, limit: int
+    data: List[Type[T]],
+    total: Union[int, None],
+    skip: int,
+    limit: int,
+    next_cursor: Union[str, None] = None,
 ) -> PaginationResponseDto:
     current_page = skip // limit + 1
     prev_page = current_page - 1 if current_page > 1 else None
-    last_page = (
-        (total // limit if total // limit > 0 else total // limit + 1)
-        if total % limit == 0
-        else total // limit + 1
-    )
-    next_page = current_page + 1 if current_page < last_page else None
+    if total is None:
+        # the pages after a cursor are not counted, they are followed with the next_cursor
+        last_page = next_page = None
+    else:
+        last_page = (
+            (total // limit if total // limit > 0 else total // limit + 1)
+            if total % limit == 0
+            else total // limit + 1
+        )
+        next_page = current_page + 1 if current_page < last_page else None
 
     return PaginationResponseDto(
         data=data,
@@ -39,4 +48,5 @@ def create_pagination_response_dto(
         prev_page=prev_page,
         last_page=last_page,
         next_page=next_page,
+        next_cursor=next_cursor,
     )
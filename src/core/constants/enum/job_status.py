@@ -0,0 +1,13 @@
+from enum import Enum
+from typing import List
+
+
+class JobStatus(Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+    @staticmethod
+    def active_statuses() -> List[str]:
+        return [JobStatus.PENDING.value, JobStatus.RUNNING.value]
@@ -36,6 +36,14 @@ class GetPagination(object):
         ),
         columns: Union[list[str], None] = Query(default=None, regex=".*", example=["field"]),
         search_all: Union[str, None] = Query(default=None),
+        cursor: Union[str, None] = Query(
+            default=None,
+            description="Keyset pagination instead of skip: empty for the first page, then the "
+            "next_cursor of the previous one",
+        ),
+        estimate_count: bool = Query(
+            default=False, description="Approximate count from the table statistics"
+        ),
     ) -> FindManyOptions:
         paging_params = PaginationUtils.generate_paging_parameters(
             skip,
@@ -44,9 +52,10 @@ class GetPagination(object):
             sort,
             self.find_all_query,
             self.order_by_query,
+            cursor,
         )
 
-        return PaginationUtils.get_paging_data(
+        paging_data = PaginationUtils.get_paging_data(
             self.entity,
             paging_params,
             search_all,
@@ -54,3 +63,7 @@ class GetPagination(object):
             self.columns_query,
             self.find_all_query,
         )
+        if estimate_count:
+            paging_data["estimate_count"] = True
+
+        return paging_data
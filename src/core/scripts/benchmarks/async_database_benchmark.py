@@ -0,0 +1,87 @@
+"""
+Concurrent-request throughput of BaseRepository with the blocking Session against the AsyncSession.
+
+Every simulated request runs a paginated `find_and_count` over `food` whose statement also waits
+`--query-delay` seconds inside Postgres, standing in for a slow recommendation query. With the
+blocking Session the event loop is stalled while each statement runs, so requests are served one
+after the other; with the AsyncSession the waits overlap.
+
+    $ python src/core/scripts/benchmarks/async_database_benchmark.py --requests 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy import func, select, String
+
+from src.modules.domain.food.entities.food_entity import Food
+from src.modules.domain.food.repositories.food_repository import FoodRepository
+from src.modules.infrastructure.database import get_async_db, get_db
+from src.modules.app import app_entities  # noqa: F401 (registers every mapper)
+
+food_repository = FoodRepository()
+
+
+def paging_options(query_delay: float) -> dict:
+    return {
+        "skip": 0,
+        "take": 10,
+        "where": [select(func.pg_sleep(query_delay)).scalar_subquery().cast(String) == ""],
+        "order_by": [Food.description.asc()],
+    }
+
+
+async def sync_request(query_delay: float) -> None:
+    db = next(get_db())
+    try:
+        await food_repository.find_and_count(paging_options(query_delay), db)
+    finally:
+        db.close()
+
+
+async def async_request(query_delay: float) -> None:
+    db_generator = get_async_db()
+    db = await db_generator.__anext__()
+    try:
+        await food_repository.find_and_count(paging_options(query_delay), db)
+    finally:
+        await db_generator.aclose()
+
+
+async def run(
+    request: Callable[[float], Awaitable[None]], requests: int, concurrency: int, query_delay: float
+) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited_request() -> None:
+        async with semaphore:
+            await request(query_delay)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(limited_request() for _ in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main(requests: int, concurrency: int, query_delay: float) -> None:
+    # Warm up both engines so connection setup is not measured
+    await run(sync_request, concurrency, concurrency, 0)
+    await run(async_request, concurrency, concurrency, 0)
+
+    sync_throughput = await run(sync_request, requests, concurrency, query_delay)
+    async_throughput = await run(async_request, requests, concurrency, query_delay)
+
+    print(f"requests={requests} concurrency={concurrency} query_delay={query_delay}s")
+    print(f"Session (blocking): {sync_throughput:8.1f} req/s")
+    print(f"AsyncSession:       {async_throughput:8.1f} req/s")
+    print(f"Speedup:            {async_throughput / sync_throughput:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--query-delay", type=float, default=0.01)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.concurrency, args.query_delay))
@@ -0,0 +1,198 @@
+"""
+Food preference scoring on a generated catalog, without a database.
+
+Scores the same preferences, fatigued foods and consumption with the previous implementation, that
+scanned the food DataFrame once per graded food of every preference, and with the
+FoodScoringEngine, and checks that both give the same ranking.
+
+    $ python src/core/scripts/benchmarks/food_scoring_benchmark.py --foods 5000 --preferences 40
+"""
+import argparse
+import random
+import time
+import uuid
+from math import floor
+from types import SimpleNamespace
+from typing import List, Tuple
+
+import pandas as pd
+
+from src.core.constants.enum.specificity_type import SpecificityTypes
+from src.modules.domain.food.dto.food.food_dto import FoodDto
+from src.modules.domain.recommendation_system.utils.food_category_index import (
+    FoodCategoryIndex,
+)
+from src.modules.domain.recommendation_system.utils.food_scoring_engine import FoodScoringEngine
+
+AMOUNT_TO_FATIGUE = 45
+PERCENTAGE_NEAR_FATIGUE = 0.9
+PERCENTAGE_FOR_IDENTIFICATION = 0.15
+
+
+def generate_catalog(foods: int, seed: int) -> Tuple[List[FoodDto], list]:
+    """Three levels of categories, as in the initial data, with the foods in the third one"""
+    rng = random.Random(seed)
+
+    def category(parent=None):
+        _category = SimpleNamespace(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            food_category_id=parent.id if parent else None,
+            parent=parent,
+            children=[],
+            foods=[],
+        )
+        if parent:
+            parent.children.append(_category)
+        return _category
+
+    roots = [category() for _ in range(10)]
+    middles = [category(rng.choice(roots)) for _ in range(50)]
+    leaves = [category(rng.choice(middles)) for _ in range(200)]
+
+    food_dtos = []
+    for index in range(foods):
+        leaf = rng.choice(leaves)
+        food_id = uuid.UUID(int=rng.getrandbits(128))
+        food_dtos.append(FoodDto(id=food_id, description=f"Food {index}", food_category=leaf.id))
+        leaf.foods.append(SimpleNamespace(id=food_id, food_category_id=leaf.id, food_category=leaf))
+
+    return food_dtos, roots + middles + leaves
+
+
+def generate_user_data(food_dtos: List[FoodDto], preferences: int, seed: int):
+    rng = random.Random(seed)
+    food_ids = [food.id for food in food_dtos]
+
+    user_preferences = pd.DataFrame.from_records(
+        [
+            {
+                "food_id": food_id,
+                "specificity_type_description": rng.choice(
+                    SpecificityTypes.specificity_preferences_consumption()
+                ),
+            }
+            for food_id in rng.sample(food_ids, preferences)
+        ]
+    )
+    fatigued_food = rng.sample(food_ids, 20)
+    user_consumption = [(food_id, rng.randint(1, 44)) for food_id in rng.sample(food_ids, 200)]
+
+    return user_preferences, fatigued_food, user_consumption
+
+
+def consumption_score(food_amount: int) -> int:
+    return (
+        10
+        if food_amount >= floor(AMOUNT_TO_FATIGUE * PERCENTAGE_NEAR_FATIGUE)
+        else 30
+        if food_amount >= floor(AMOUNT_TO_FATIGUE * PERCENTAGE_FOR_IDENTIFICATION)
+        else 20
+    )
+
+
+def legacy_ranking(food_dtos, categories, user_preferences, fatigued, consumption):
+    all_food_categories = pd.DataFrame.from_records([vars(category) for category in categories])
+    food_data = pd.DataFrame.from_records([food.dict() for food in food_dtos])
+    food_data["score"] = 0
+
+    def award_score(food_id, score):
+        food_data.loc[food_data["id"] == food_id, "score"] += score
+
+    def foods_from_category(food_category):
+        all_food = []
+        for children in food_category.children:
+            all_food += foods_from_category(children)
+        return all_food + food_category.foods
+
+    for _, food_preference in user_preferences.iterrows():
+        current_food = food_data.loc[food_data["id"] == food_preference["food_id"]]
+        current_category = all_food_categories.loc[
+            all_food_categories["id"] == current_food["food_category"].iloc[0]
+        ]
+        root_category = current_category["parent"].iloc[0]
+        while root_category is not None:
+            root_category = root_category.parent
+            if root_category.parent is None:
+                break
+
+        positive = (
+            food_preference["specificity_type_description"]
+            in SpecificityTypes.specificity_likes_consume()
+        )
+        for food_to_grade in foods_from_category(root_category):
+            if food_to_grade.id == current_food["id"].iloc[0]:
+                score = 50
+            elif food_to_grade.food_category_id == current_category["id"].iloc[0]:
+                score = 25
+            elif food_to_grade.food_category.parent.id == current_category["parent"].iloc[0].id:
+                score = 12
+            else:
+                score = 7
+
+            award_score(food_to_grade.id, score if positive else -score)
+
+    for food_id in fatigued:
+        award_score(food_id, -100)
+    for food_id, food_amount in consumption:
+        award_score(food_id, consumption_score(food_amount))
+
+    food_data.sort_values("score", ascending=False, inplace=True)
+    return list(zip(food_data["id"], food_data["score"]))
+
+
+def engine_ranking(food_dtos, categories, user_preferences, fatigued, consumption):
+    foods = [(food.id, food.food_category) for food in food_dtos]
+    category_index = FoodCategoryIndex(
+        None, [(category.id, category.food_category_id) for category in categories], foods
+    )
+    engine = FoodScoringEngine(foods, category_index)
+    scores = engine.new_scores()
+    engine.award_preferences(
+        scores,
+        user_preferences["food_id"],
+        user_preferences["specificity_type_description"].map(
+            lambda description: 1
+            if description in SpecificityTypes.specificity_likes_consume()
+            else -1
+        ),
+    )
+    engine.award(scores, fatigued, -100)
+    engine.award(
+        scores,
+        [food_id for food_id, _ in consumption],
+        [consumption_score(food_amount) for _, food_amount in consumption],
+    )
+
+    food_data = pd.DataFrame.from_records([food.dict() for food in food_dtos])
+    food_data["score"] = scores
+    food_data.sort_values("score", ascending=False, inplace=True)
+    return list(zip(food_data["id"], food_data["score"]))
+
+
+def main(foods: int, preferences: int, seed: int) -> None:
+    food_dtos, categories = generate_catalog(foods, seed)
+    user_preferences, fatigued, consumption = generate_user_data(food_dtos, preferences, seed)
+
+    start = time.perf_counter()
+    legacy = legacy_ranking(food_dtos, categories, user_preferences, fatigued, consumption)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = engine_ranking(food_dtos, categories, user_preferences, fatigued, consumption)
+    engine_time = time.perf_counter() - start
+
+    assert legacy == vectorized, "The rankings differ"
+
+    print(f"foods={foods} preferences={preferences}")
+    print(f"DataFrame scans:     {legacy_time:8.3f}s")
+    print(f"FoodScoringEngine:   {engine_time:8.3f}s ({legacy_time / engine_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--foods", type=int, default=5000)
+    parser.add_argument("--preferences", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    main(args.foods, args.preferences, args.seed)
@@ -0,0 +1,173 @@
+"""
+Item nutrient and score table generation on a generated catalog, without a database.
+
+Builds the table of the same items with the previous implementation, that submitted one thread per
+item to filter and write into a shared DataFrame, and with the ItemFoodMatrix product. The `+=`
+of concurrent threads on the shared DataFrame loses updates, so the product is checked against the
+previous implementation run on a single thread, and the items the threaded run got wrong are
+counted. The matrix is cached per catalog version, so its build time is reported apart.
+
+    $ python src/core/scripts/benchmarks/item_table_benchmark.py --foods 1300 --items 1000
+"""
+import argparse
+import random
+import time
+import uuid
+from concurrent.futures import as_completed, ThreadPoolExecutor
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.core.constants.default_values import DEFAULT_AMOUNT_GRAMS
+from src.modules.domain.recommendation_system.dto.user_preferences_table_dto import (
+    DetailedUserPreferencesTable,
+)
+from src.modules.domain.recommendation_system.utils.item_food_matrix import ItemFoodMatrix
+
+NUTRIENTS = ["proteins", "lipids", "carbohydrates", "energy_value"]
+
+
+def generate_catalog(foods: int, items: int, seed: int) -> Tuple[list, list]:
+    rng = random.Random(seed)
+
+    def nutrient() -> Decimal:
+        return Decimal(rng.randint(0, 5000)) / 100
+
+    food_preferences = [
+        DetailedUserPreferencesTable(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            description=f"Food {index}",
+            score=rng.randint(-100, 200),
+            **{name: nutrient() for name in NUTRIENTS},
+        )
+        for index in range(foods)
+    ]
+    types_of_meal = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(6)]
+
+    all_items = [
+        SimpleNamespace(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            description=f"Item {index}",
+            foods=[
+                SimpleNamespace(food_id=food.id, amount_grams=float(rng.randint(10, 300)))
+                for food in rng.sample(food_preferences, rng.randint(1, 6))
+            ],
+            can_eat_at=[
+                SimpleNamespace(type_of_meal_id=type_of_meal)
+                for type_of_meal in rng.sample(types_of_meal, rng.randint(1, 3))
+            ],
+        )
+        for index in range(items)
+    ]
+
+    return food_preferences, all_items
+
+
+def items_dataframe(all_items: list) -> pd.DataFrame:
+    return pd.DataFrame.from_records(
+        [{"id": item.id, "description": item.description} for item in all_items]
+    )
+
+
+def threaded_table(
+    food_preferences: List[DetailedUserPreferencesTable], all_items: list, max_workers: int = None
+):
+    dataframe = items_dataframe(all_items).assign(
+        score=0,
+        **dict.fromkeys(NUTRIENTS, 0.0),
+        can_eat_at=[[] for _ in range(len(all_items))],
+    )
+    food_preferences_dictionary = {
+        food.id: pd.DataFrame.from_records([food.__dict__]) for food in food_preferences
+    }
+
+    def set_item_data(current_item) -> None:
+        item_dataframe = dataframe[dataframe.id == current_item.id]
+        dataframe.at[item_dataframe.index[0], "can_eat_at"] = [
+            can_eat_at.type_of_meal_id for can_eat_at in current_item.can_eat_at
+        ]
+
+        for item_has_food in current_item.foods:
+            food = food_preferences_dictionary[item_has_food.food_id]
+            amount_multiplier = item_has_food.amount_grams / DEFAULT_AMOUNT_GRAMS
+
+            dataframe.loc[item_dataframe.index, "score"] += food["score"].values
+            dataframe.loc[item_dataframe.index, NUTRIENTS] += (
+                food[NUTRIENTS].astype(float).values * amount_multiplier
+            )
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        for future in as_completed([executor.submit(set_item_data, item) for item in all_items]):
+            future.result()
+
+    return dataframe
+
+
+def matrix_table(
+    food_preferences: List[DetailedUserPreferencesTable], all_items: list, matrix: ItemFoodMatrix
+):
+    item_ids = [item.id for item in all_items]
+    food_ids = [food.id for food in food_preferences]
+
+    def item_values(field: str, weighted: bool = True) -> np.ndarray:
+        food_vector = matrix.food_vector(
+            food_ids, [getattr(food, field) for food in food_preferences]
+        )
+        return matrix.multiply(item_ids, food_vector, weighted)
+
+    return items_dataframe(all_items).assign(
+        score=item_values("score", weighted=False).astype(np.int64),
+        **{nutrient: item_values(nutrient) for nutrient in NUTRIENTS},
+        can_eat_at=[
+            [can_eat_at.type_of_meal_id for can_eat_at in item.can_eat_at] for item in all_items
+        ],
+    )
+
+
+def main(foods: int, items: int, seed: int) -> None:
+    food_preferences, all_items = generate_catalog(foods, items, seed)
+
+    start = time.perf_counter()
+    threaded = threaded_table(food_preferences, all_items)
+    threaded_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matrix = ItemFoodMatrix(
+        None,
+        [
+            (item.id, item_has_food.food_id, item_has_food.amount_grams)
+            for item in all_items
+            for item_has_food in item.foods
+        ],
+    )
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = matrix_table(food_preferences, all_items, matrix)
+    matrix_time = time.perf_counter() - start
+
+    sequential = threaded_table(food_preferences, all_items, max_workers=1)
+    assert (sequential["score"].values == vectorized["score"].values).all(), "The scores differ"
+    assert np.allclose(
+        sequential[NUTRIENTS].astype(float).values, vectorized[NUTRIENTS].values
+    ), "The nutrients differ"
+    assert sequential["can_eat_at"].tolist() == vectorized["can_eat_at"].tolist()
+    lost_updates = (threaded["score"].values != sequential["score"].values).sum()
+
+    print(f"foods={foods} items={items} item_has_food={len(matrix.rows)}")
+    print(f"Thread per item:     {threaded_time:8.3f}s ({lost_updates} items with lost updates)")
+    print(f"Matrix build:        {build_time:8.3f}s (once per catalog version)")
+    print(f"Matrix product:      {matrix_time:8.3f}s ({threaded_time / matrix_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--foods", type=int, default=1300)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    main(args.foods, args.items, args.seed)
@@ -0,0 +1,100 @@
+"""
+Selection of the items of each meal of a plan on a generated catalog, without a database.
+
+Selects the items that can be eaten at every type of meal of the plan with the previous
+implementation, a membership test on the list of types of meal of each item, and with the can eat
+at bitmasks of the ItemCatalog, a bitwise AND over the items, and checks that both select the same
+items. Building the masks is done once per plan, so its time is reported apart.
+
+    $ python src/core/scripts/benchmarks/meal_type_mask_benchmark.py --items 5000 --types 8
+"""
+import argparse
+import random
+import time
+import uuid
+from typing import Any, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.modules.domain.recommendation_system.utils.item_catalog import ItemCatalog
+
+
+def generate_catalog(items: int, types: int, seed: int) -> Tuple[List[Any], List[Tuple]]:
+    rng = random.Random(seed)
+    type_of_meal_ids = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(types)]
+
+    # most items fit a couple of types of meal (breakfast and snacks, lunch and dinner...)
+    return type_of_meal_ids, [
+        (
+            uuid.UUID(int=rng.getrandbits(128)),
+            f"item {index}",
+            rng.sample(type_of_meal_ids, rng.randint(1, min(4, types))),
+        )
+        for index in range(items)
+    ]
+
+
+def membership_selection(items: pd.DataFrame, type_of_meal_ids: List[Any]) -> List[pd.DataFrame]:
+    return [
+        items[items["can_eat_at"].apply(lambda x: type_of_meal_id in x)]
+        for type_of_meal_id in type_of_meal_ids
+    ]
+
+
+def mask_selection(items: pd.DataFrame, type_of_meal_bits: List[int]) -> List[pd.DataFrame]:
+    can_eat_at = items["can_eat_at"].to_numpy(dtype=np.uint64)
+    return [items[(can_eat_at & np.uint64(bit)) != 0] for bit in type_of_meal_bits]
+
+
+def main(items: int, types: int, seed: int, repeat: int) -> None:
+    type_of_meal_ids, catalog_items = generate_catalog(items, types, seed)
+    catalog = ItemCatalog(None, catalog_items, [])
+    rows = np.arange(len(catalog))
+    # the meals of a plan, some types of meal more than once in a day
+    plan = type_of_meal_ids + type_of_meal_ids[: types // 2]
+
+    lists_table = pd.DataFrame(
+        {"id": catalog.item_ids, "can_eat_at": [can_eat_at for _, _, can_eat_at in catalog_items]}
+    )
+
+    start = time.perf_counter()
+    type_of_meal_bits = ItemCatalog.type_of_meal_bits(plan)
+    masks_table = pd.DataFrame(
+        {"id": catalog.item_ids, "can_eat_at": catalog.can_eat_at_masks(rows, type_of_meal_bits)}
+    )
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        by_membership = membership_selection(lists_table, plan)
+    membership_time = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        by_mask = mask_selection(
+            masks_table, [type_of_meal_bits[type_of_meal_id] for type_of_meal_id in plan]
+        )
+    mask_time = (time.perf_counter() - start) / repeat
+
+    for membership, mask in zip(by_membership, by_mask):
+        assert membership["id"].tolist() == mask["id"].tolist(), "The selected items differ"
+
+    print(f"items={items} types_of_meal={types} meals={len(plan)}")
+    print(f"List membership:     {membership_time * 1000:8.2f}ms per plan")
+    print(f"Masks build:         {build_time * 1000:8.2f}ms (once per plan)")
+    print(
+        f"Bitwise AND:         {mask_time * 1000:8.2f}ms per plan "
+        f"({membership_time / mask_time:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--types", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    main(args.items, args.types, args.seed, args.repeat)
@@ -0,0 +1,151 @@
+"""
+Soft-delete cascade throughput on a large food category.
+
+Creates a category with `--foods` foods, each of them used by `--items-per-food` items, and soft
+deletes the category (its foods and their item_has_food rows cascade) with the previous
+implementation, that loaded every relation and flushed one UPDATE per row, and with the current
+one, that runs one set-based UPDATE per table and depth. Every run happens inside a transaction
+that is rolled back, so the database is left as it was.
+
+    $ python src/core/scripts/benchmarks/soft_delete_cascade_benchmark.py --foods 500
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from src.modules.app import app_entities  # noqa: F401 (registers every mapper)
+from src.modules.domain.food.entities.food_category_entity import FoodCategory
+from src.modules.domain.food.entities.food_entity import Food
+from src.modules.domain.food.repositories.food_category_repository import FoodCategoryRepository
+from src.modules.domain.item.entities.item_entity import Item
+from src.modules.domain.item.entities.item_has_food_entity import ItemHasFood
+from src.modules.infrastructure.database import get_db
+from src.modules.infrastructure.database.entity_registry import entity_registry
+
+food_category_repository = FoodCategoryRepository()
+
+
+def seed(db: Session, foods: int, items_per_food: int) -> Tuple[uuid.UUID, int]:
+    now = datetime.now()
+    timestamps = {"created_at": now, "updated_at": now}
+
+    category_id = uuid.uuid4()
+    db.execute(
+        insert(FoodCategory),
+        [{"id": category_id, "description": "Benchmark", "level": 1, **timestamps}],
+    )
+
+    food_ids = [uuid.uuid4() for _ in range(foods)]
+    nutrients = dict.fromkeys(
+        (
+            "proteins",
+            "lipids",
+            "carbohydrates",
+            "energy_value",
+            "potassium",
+            "phosphorus",
+            "sodium",
+        ),
+        1.0,
+    )
+    db.execute(
+        insert(Food),
+        [
+            {
+                "id": _id,
+                "description": f"Food {index}",
+                "food_category_id": category_id,
+                **nutrients,
+                **timestamps,
+            }
+            for index, _id in enumerate(food_ids)
+        ],
+    )
+
+    item_ids = [uuid.uuid4() for _ in range(items_per_food)]
+    db.execute(
+        insert(Item),
+        [{"id": _id, "description": f"Item {_id}", **timestamps} for _id in item_ids],
+    )
+    db.execute(
+        insert(ItemHasFood),
+        [
+            {"id": uuid.uuid4(), "item_id": item_id, "food_id": food_id, **timestamps}
+            for food_id in food_ids
+            for item_id in item_ids
+        ],
+    )
+
+    return category_id, 1 + foods + foods * items_per_food
+
+
+def legacy_soft_delete(db: Session, entity: Any) -> int:
+    rowcount = 0
+    for relation in entity_registry.get(type(entity)).cascade_relations:
+        cascade_relation = getattr(entity, relation.key) or []
+        if not isinstance(cascade_relation, list):
+            cascade_relation = [cascade_relation]
+
+        for cascade_entity in cascade_relation:
+            if not cascade_entity.deleted_at:
+                cascade_entity = db.query(type(cascade_entity)).get(cascade_entity.id)
+                rowcount += legacy_soft_delete(db, cascade_entity)
+
+    if not entity.deleted_at:
+        entity.deleted_at = datetime.now()
+        db.flush()
+        rowcount += 1
+
+    return rowcount
+
+
+async def legacy(db: Session, category_id: uuid.UUID) -> int:
+    return legacy_soft_delete(db, db.query(FoodCategory).get(category_id))
+
+
+async def set_based(db: Session, category_id: uuid.UUID) -> int:
+    return (await food_category_repository.soft_delete(str(category_id), db))["affected"]
+
+
+async def measure(
+    soft_delete: Callable[[Session, uuid.UUID], Awaitable[int]], foods: int, items_per_food: int
+) -> Tuple[float, int, int]:
+    db = next(get_db())
+    try:
+        category_id, expected = seed(db, foods, items_per_food)
+
+        db.begin_nested()
+        start = time.perf_counter()
+        affected = await soft_delete(db, category_id)
+        elapsed = time.perf_counter() - start
+
+        return elapsed, affected, expected
+    finally:
+        db.rollback()
+        db.close()
+
+
+async def main(foods: int, items_per_food: int) -> None:
+    entity_registry.build()
+
+    print(f"foods={foods} items_per_food={items_per_food}")
+    for name, soft_delete in (("Per-row cascade:  ", legacy), ("Set-based cascade:", set_based)):
+        elapsed, affected, expected = await measure(soft_delete, foods, items_per_food)
+        assert affected == expected, f"{affected} rows soft deleted, expected {expected}"
+
+        print(f"{name} {elapsed:8.3f}s, {affected / elapsed:10.0f} rows/s ({affected} rows)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--foods", type=int, default=500)
+    parser.add_argument("--items-per-food", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.foods, args.items_per_food))
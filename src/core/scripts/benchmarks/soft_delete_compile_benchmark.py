@@ -0,0 +1,103 @@
+"""
+Per-query overhead of the soft-delete `before_compile` hook.
+
+Builds the statement of the same ORM query over and over (no database round trip) with the hook
+disabled, with the previous implementation that reflected the entity columns and walked the where
+clause with hasattr on every query, and with the current one backed by the entity registry.
+
+    $ python src/core/scripts/benchmarks/soft_delete_compile_benchmark.py --iterations 20000
+"""
+import argparse
+import time
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy import event, null
+from sqlalchemy.orm import DeclarativeMeta, Query, Session
+from sqlalchemy.sql.elements import BinaryExpression
+from sqlalchemy_utils import get_columns
+
+from src.core.utils.database_utils import DatabaseUtils
+from src.modules.app import app_entities  # noqa: F401 (registers every mapper)
+from src.modules.domain.food.entities.food_entity import Food
+from src.modules.infrastructure.database.entity_registry import entity_registry
+from src.modules.infrastructure.database.repository_methods.soft_delete_filter import no_deleted
+
+
+def reflection_where_clauses(whereclauses: Any) -> List[Any]:
+    if whereclauses is None:
+        return []
+
+    clauses = []
+    if isinstance(whereclauses, BinaryExpression):
+        whereclauses = [whereclauses]
+
+    for clause in whereclauses:
+        if hasattr(clause, "left"):
+            clauses += reflection_where_clauses([clause.left])
+        elif hasattr(clause, "clause"):
+            clauses += reflection_where_clauses([clause.clause])
+        else:
+            clauses.append(clause)
+
+    return clauses
+
+
+def reflection_no_deleted(query: Query) -> Query:
+    columns = (
+        []
+        if not isinstance(query.column_descriptions[0]["entity"], DeclarativeMeta)
+        else get_columns(query.column_descriptions[0]["entity"])
+    )
+
+    column = DatabaseUtils.get_column_represent_deleted(columns)
+    if column is not None:
+        for clause in reflection_where_clauses(query.whereclause):
+            if clause.description is column.description:
+                return query
+
+        query = query.enable_assertions(False).where(column == null())
+
+    return query
+
+
+def measure(hook: Optional[Callable[[Query], Query]], iterations: int) -> float:
+    event.remove(Query, "before_compile", no_deleted)
+    if hook:
+        event.listen(Query, "before_compile", hook, retval=True)
+
+    db = Session()
+    try:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            db.query(Food).filter(Food.description == "Rice", Food.proteins > 1).statement
+        return (time.perf_counter() - start) / iterations * 1_000_000
+    finally:
+        if hook:
+            event.remove(Query, "before_compile", hook)
+        event.listen(Query, "before_compile", no_deleted, retval=True)
+        db.close()
+
+
+def main(iterations: int) -> None:
+    entity_registry.build()
+
+    # Warm up the statement caches of every variant
+    for hook in (None, reflection_no_deleted, no_deleted):
+        measure(hook, 1000)
+
+    without_hook = measure(None, iterations)
+    reflection = measure(reflection_no_deleted, iterations)
+    registry = measure(no_deleted, iterations)
+
+    print(f"iterations={iterations}")
+    print(f"Without hook:    {without_hook:8.1f} us/query")
+    print(f"Reflection hook: {reflection:8.1f} us/query (+{reflection - without_hook:.1f} us)")
+    print(f"Registry hook:   {registry:8.1f} us/query (+{registry - without_hook:.1f} us)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    main(args.iterations)
@@ -96,38 +96,46 @@ async def import_default_foods(df: pd.DataFrame, system_types: pd.DataFrame) ->
 
     food_interface = FoodInterface()
 
-    for index, row in df.iterrows():
-        row["Nome do alimento"] = row["Nome do alimento"].strip()
-        with next(get_db()) as db_session:
-            try:
-                await food_interface.find_one_food_by_description(
-                    row["Nome do alimento"], db_session
-                )
-            except NotFoundException:
-                row = fix_row_values(row, food_columns)
-                food_category_id = (
-                    system_types[system_types["description"] == row["Nível 3"]]["id"].values[0]
-                    if not pd.isna(row["Nível 3"])
-                    else None
-                )
+    with next(get_db()) as db_session:
+        existing_foods = {
+            food.description for food in await food_interface.get_all_food(db_session)
+        }
+
+        new_foods = []
+        for index, row in df.iterrows():
+            row["Nome do alimento"] = row["Nome do alimento"].strip()
+            if row["Nome do alimento"] in existing_foods:
+                continue
 
-                if food_category_id is None:
-                    print(f"{index} Skipped: {row['Nome do alimento']} (category not found)")
-                    continue
-
-                await food_interface.create_food(
-                    description=row["Nome do alimento"],
-                    proteins=row["Proteínas\n[g]"],
-                    lipids=row["Lípidos\n[g]"],
-                    carbohydrates=row["Hidratos de carbono\n[g]"],
-                    energy_value=row["Energia\n[kcal]"],
-                    potassium=row["Potássio\n[mg]"],
-                    phosphorus=row["Fósforo\n[mg]"],
-                    sodium=row["Sódio\n[mg]"],
-                    food_category_id=food_category_id,
-                    db=db_session,
-                )
-                print(f"{index} Created: {row['Nome do alimento']}")
+            row = fix_row_values(row, food_columns)
+            food_category_id = (
+                system_types[system_types["description"] == row["Nível 3"]]["id"].values[0]
+                if not pd.isna(row["Nível 3"])
+                else None
+            )
+
+            if food_category_id is None:
+                print(f"{index} Skipped: {row['Nome do alimento']} (category not found)")
+                continue
+
+            existing_foods.add(row["Nome do alimento"])
+            new_foods.append(
+                {
+                    "description": row["Nome do alimento"],
+                    "proteins": row["Proteínas\n[g]"],
+                    "lipids": row["Lípidos\n[g]"],
+                    "carbohydrates": row["Hidratos de carbono\n[g]"],
+                    "energy_value": row["Energia\n[kcal]"],
+                    "potassium": row["Potássio\n[mg]"],
+                    "phosphorus": row["Fósforo\n[mg]"],
+                    "sodium": row["Sódio\n[mg]"],
+                    "food_category": food_category_id,
+                }
+            )
+
+        # All the new foods are written with a few multi-row inserts and a single commit
+        for new_food in await food_interface.create_many_food(new_foods, db_session):
+            print(f"Created: {new_food.description}")
 
     print("\nImported default foods.\n")
 
@@ -0,0 +1,18 @@
+"""
+Refresh the food scores of the users not scored yet, marked stale by a change, or scored on a
+previous day or on an older food catalog, so the consumption windows of their scores move every
+day. Until then, their scores are computed on every read. Meant to run daily, e.g. from cron:
+
+    $ python src/core/scripts/maintenance/refresh_user_food_scores.py
+"""
+from src.modules.app import app_entities  # noqa: F401 (registers every mapper)
+from src.modules.domain.recommendation_system.interfaces.user_food_score_interface import (
+    UserFoodScoreInterface,
+)
+from src.modules.infrastructure.database import get_db
+
+if __name__ == "__main__":
+    with next(get_db()) as db_session:
+        refreshed = UserFoodScoreInterface().refresh_stale_user_food_scores(db_session)
+
+    print(f"Refreshed the food scores of {refreshed} users")
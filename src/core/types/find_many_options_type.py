@@ -1,6 +1,11 @@
 from src.core.types.find_one_options_type import FindOneOptions
+from src.core.types.pagination_type import PaginationSeek
 
 
 class FindManyOptions(FindOneOptions, total=False):
     skip: int
     take: int
+    # keyset pagination, filters the rows but not their count
+    seek: PaginationSeek
+    # count from the planner statistics instead of counting the rows
+    estimate_count: bool
@@ -5,5 +5,6 @@ class FindOneOptions(TypedDict, total=False):
     select: List[str]
     where: Any
     order_by: Any
+    # relation names, or relation name -> loading strategy (see QueryConstructor)
     relations: Any
     with_deleted: bool
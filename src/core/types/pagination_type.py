@@ -1,4 +1,4 @@
-from typing import List, TypedDict
+from typing import Any, List, TypedDict, Union
 
 
 class PaginationSearch(TypedDict):
@@ -11,8 +11,16 @@ class PaginationSort(TypedDict):
     by: str
 
 
+class PaginationSeek(TypedDict):
+    # requested sort followed by the primary key, which makes the order of the rows unique
+    sort: List[PaginationSort]
+    # rows after the cursor, empty for the first page
+    where: List[Any]
+
+
 class Pagination(TypedDict):
     skip: int
     take: int
     sort: List[PaginationSort]
     search: List[PaginationSearch]
+    cursor: Union[str, None]
@@ -1,6 +1,6 @@
-from typing import Any, List, TypeVar, Union
+from typing import Any, Iterator, List, TypeVar, Union
 
-from sqlalchemy import Column, inspect
+from sqlalchemy import Column
 from sqlalchemy.orm import Query
 from sqlalchemy.sql.elements import BinaryExpression, BooleanClauseList
 from sqlalchemy_utils import get_columns
@@ -21,34 +21,48 @@ class DatabaseUtils:
         return None
 
     @staticmethod
-    def should_apply_filter(query: Query, column: Column) -> bool:
-        for clause in DatabaseUtils.get_where_clauses(query.whereclause):
-            if clause.description is column.description:
-                return False
+    def get_column_represent_updated(columns: List[Column]) -> Union[Column, None]:
+        for column in columns:
+            if "update_column" in column.info and column.info["update_column"]:
+                return column
 
-        return True
+        return None
+
+    @staticmethod
+    def should_apply_filter(query: Query, column: Column) -> bool:
+        description = column.description
+        return not any(
+            clause.description is description
+            for clause in DatabaseUtils.iterate_where_clauses(query.whereclause)
+        )
 
     @staticmethod
     def get_where_clauses(
         whereclauses: Union[BooleanClauseList, BinaryExpression, List[Any]]
     ) -> List[Column]:
-        if whereclauses is None:
-            return []
+        return list(DatabaseUtils.iterate_where_clauses(whereclauses))
 
-        clauses = []
+    @staticmethod
+    def iterate_where_clauses(
+        whereclauses: Union[BooleanClauseList, BinaryExpression, List[Any]]
+    ) -> Iterator[Column]:
+        # Lazy, so the callers looking for a single column stop at the first match
+        if whereclauses is None:
+            return
 
         if isinstance(whereclauses, BinaryExpression):
             whereclauses = [whereclauses]
 
         for clause in whereclauses:
-            if hasattr(clause, "left"):
-                clauses += DatabaseUtils.get_where_clauses([clause.left])
-            elif hasattr(clause, "clause"):
-                clauses += DatabaseUtils.get_where_clauses([clause.clause])
+            # Looked up on the instance: a missing attribute on a column goes through its comparator
+            # and raises internally, which costs more than the rest of the walk
+            attributes = clause.__dict__
+            if "left" in attributes:
+                yield from DatabaseUtils.iterate_where_clauses([clause.left])
+            elif "clause" in attributes:
+                yield from DatabaseUtils.iterate_where_clauses([clause.clause])
             else:
-                clauses.append(clause)
-
-        return clauses
+                yield clause
 
     @staticmethod
     def is_with_deleted_data(condition: Union[FindOneOptions, FindManyOptions]) -> bool:
@@ -60,32 +74,18 @@ class DatabaseUtils:
 
         return is_with_deleted_data
 
+    @staticmethod
+    def is_estimated_count(condition: FindManyOptions) -> bool:
+        is_estimated_count = False
+
+        if condition and "estimate_count" in condition:
+            is_estimated_count = condition["estimate_count"]
+            del condition["estimate_count"]
+
+        return is_estimated_count
+
     @staticmethod
     def is_deleted(element: T) -> bool:
         result_class = type(element)
         deleted_column = DatabaseUtils.get_column_represent_deleted(get_columns(result_class))
         return getattr(element, str(deleted_column.description))
-
-    @staticmethod
-    def get_cascade_relations(entity: T) -> List[Any]:
-        cascade_relations = []
-
-        for relation in inspect(type(entity)).relationships:
-            delete_column = DatabaseUtils.get_column_represent_deleted(
-                get_columns(relation.mapper.class_)
-            )
-            if delete_column is None:
-                raise ValueError(f'Relation "{relation.key}" has no "deleted" column')
-
-            cr = getattr(entity, relation.key)
-            if cr and relation.cascade.delete_orphan:
-                if not isinstance(cr, List):
-                    cr = [cr]
-
-                cascade_relations.extend(
-                    cascade_relation
-                    for cascade_relation in cr
-                    if not getattr(cascade_relation, delete_column.name, True)
-                )
-
-        return cascade_relations
@@ -1,4 +1,6 @@
 from datetime import date, datetime
+from enum import Enum
+from uuid import UUID
 
 from src.core.common.dto.exception_response_dto import DetailResponseDto
 
@@ -10,6 +12,10 @@ class JsonUtils:
 
         if isinstance(obj, (datetime, date)):
             return obj.isoformat()
+        elif isinstance(obj, UUID):
+            return str(obj)
+        elif isinstance(obj, Enum):
+            return obj.value
         elif isinstance(obj, DetailResponseDto):
             return obj.__dict__
         raise TypeError("Type %s not serializable" % type(obj))
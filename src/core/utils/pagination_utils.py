@@ -1,12 +1,21 @@
-from typing import List, TypeVar, Union
+import base64
+import json
+from datetime import date, datetime, time
+from typing import Any, List, TypeVar, Union
 
 from pydantic.main import ModelMetaclass
-from sqlalchemy import inspect, or_, String
+from sqlalchemy import and_, cast, false, inspect, or_, String, tuple_
 from sqlalchemy_utils import cast_if, get_columns
 
 from src.core.types.exceptions_type import BadRequestException
 from src.core.types.find_many_options_type import FindManyOptions
-from src.core.types.pagination_type import Pagination, PaginationSearch, PaginationSort
+from src.core.types.pagination_type import (
+    Pagination,
+    PaginationSearch,
+    PaginationSeek,
+    PaginationSort,
+)
+from src.core.utils.json_utils import JsonUtils
 
 E = TypeVar("E")
 F = TypeVar("F")
@@ -23,11 +32,14 @@ class PaginationUtils:
         sort: Union[list[str], None],
         find_all_query: F = None,
         order_by_query: O = None,
+        cursor: Union[str, None] = None,
     ) -> Pagination:
         paging_params = Pagination(skip=skip, take=take)
+        if cursor is not None:
+            paging_params["cursor"] = cursor
 
         if sort:
-            sort = list(set(sort))
+            sort = list(dict.fromkeys(sort))
             paging_params["sort"] = []
             for sort_param in sort:
                 sort_param_split = sort_param.split(":")
@@ -79,8 +91,16 @@ class PaginationUtils:
             relations=[],
         )
 
-        if "sort" in paging_params:
-            for sort_param in paging_params["sort"]:
+        sort = paging_params["sort"] if "sort" in paging_params else []
+        if "cursor" in paging_params:
+            paging_data["skip"] = 0
+            paging_data["seek"] = PaginationUtils.get_seek_data(
+                entity, sort, paging_params["cursor"]
+            )
+            sort = paging_data["seek"]["sort"]
+
+        if sort:
+            for sort_param in sort:
                 sort_obj = getattr(entity, sort_param["field"])
                 sort_func = "asc" if (sort_param["by"] == "ASC") else "desc"
                 paging_data["order_by"].append(getattr(sort_obj, sort_func)())
@@ -112,8 +132,121 @@ class PaginationUtils:
         else:
             raise BadRequestException("Invalid columns")
 
+        if "seek" in paging_data and "select" in paging_data:
+            # the next cursor is read from the sort columns of the last row
+            paging_data["select"] += [
+                sort_param["field"]
+                for sort_param in paging_data["seek"]["sort"]
+                if sort_param["field"] not in paging_data["select"]
+            ]
+
         return paging_data
 
+    @staticmethod
+    def get_seek_data(entity: E, sort: List[PaginationSort], cursor: str) -> PaginationSeek:
+        primary_key = inspect(entity).primary_key[0].key
+        if primary_key not in [sort_param["field"] for sort_param in sort]:
+            sort = sort + [PaginationSort(field=primary_key, by="ASC")]
+
+        where = []
+        if cursor:
+            values = PaginationUtils.decode_cursor(entity, sort, cursor)
+            where.append(PaginationUtils.get_seek_criteria(entity, sort, values))
+
+        return PaginationSeek(sort=sort, where=where)
+
+    @staticmethod
+    def get_seek_criteria(entity: E, sort: List[PaginationSort], values: List[Any]) -> Any:
+        """
+        Rows placed after the cursor values in the sort order, with Postgres' default NULLS LAST
+        for ascending and NULLS FIRST for descending columns.
+        """
+        mapper = inspect(entity)
+        columns = [getattr(entity, sort_param["field"]) for sort_param in sort]
+        nullable = [mapper.columns[sort_param["field"]].nullable for sort_param in sort]
+        directions = {sort_param["by"] for sort_param in sort}
+        # Cast to the column type, a real column is never equal to the same value as a double
+        values = [
+            None if value is None else cast(value, column.type)
+            for column, value in zip(columns, values)
+        ]
+
+        if (
+            len(directions) == 1
+            and not any(nullable)
+            and not any(value is None for value in values)
+        ):
+            # a row value comparison, which an index on the sort columns can seek to
+            row, cursor_row = tuple_(*columns), tuple_(*values)
+            return row > cursor_row if "ASC" in directions else row < cursor_row
+
+        clauses = []
+        for index, sort_param in enumerate(sort):
+            column, value = columns[index], values[index]
+            if sort_param["by"] == "ASC":
+                after = false() if value is None else column > value
+                if value is not None and nullable[index]:
+                    after = or_(after, column.is_(None))
+            else:
+                after = column.isnot(None) if value is None else column < value
+
+            clauses.append(
+                and_(
+                    *(
+                        previous_column.is_(None)
+                        if previous_value is None
+                        else previous_column == previous_value
+                        for previous_column, previous_value in zip(columns[:index], values[:index])
+                    ),
+                    after,
+                )
+            )
+
+        return or_(*clauses)
+
+    @staticmethod
+    def get_next_cursor(paging_data: FindManyOptions, results: List[E]) -> Union[str, None]:
+        if "seek" not in paging_data or len(results) < paging_data["take"]:
+            return None
+
+        fields = [sort_param["field"] for sort_param in paging_data["seek"]["sort"]]
+        cursor = json.dumps(
+            [fields, [getattr(results[-1], field) for field in fields]],
+            default=JsonUtils.json_serial,
+        )
+
+        return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(entity: E, sort: List[PaginationSort], cursor: str) -> List[Any]:
+        try:
+            fields, values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if fields != [sort_param["field"] for sort_param in sort] or len(values) != len(fields):
+                raise ValueError
+
+            return [
+                PaginationUtils.parse_cursor_value(getattr(entity, field), value)
+                for field, value in zip(fields, values)
+            ]
+
+        except (TypeError, ValueError):
+            raise BadRequestException("Invalid cursor")
+
+    @staticmethod
+    def parse_cursor_value(column: Any, value: Any) -> Any:
+        if value is None:
+            return None
+
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return value
+
+        if python_type in (datetime, date, time):
+            return python_type.fromisoformat(value)
+
+        return python_type(value)
+
     @staticmethod
     def validate_search_filter(search: List[PaginationSearch], find_all_query_dto: F) -> bool:
         find_all_query_dto_fields = find_all_query_dto.__fields__
@@ -10,6 +10,7 @@ from src.core.common.custom_error_response import custom_error_response
 from src.core.handlers.http_exceptions_handler import HttpExceptionsHandler
 from src.core.middlewares.limit_upload_size import LimitUploadSize
 from src.modules.app import app_routers
+from src.modules.infrastructure.database.entity_registry import entity_registry
 
 app = FastAPI(title="Aquavitae App", version="0.0.1")
 
@@ -34,6 +35,9 @@ time.tzset()
 # Register all routers
 app.include_router(app_routers)
 
+# Precompute the mapper information of every entity used by the repositories
+entity_registry.build()
+
 # Modifies the error response pattern
 custom_error_response(app)
 
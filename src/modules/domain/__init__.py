@@ -13,7 +13,7 @@ from .meal import meal_entities, meal_routers
 from .nutritional_plan import nutritional_plan_entities, nutritional_plan_routers
 from .personal_data import personal_data_entities, personal_data_routers
 from .plan_meals import plan_meals_entities, plan_meals_routers
-from .recommendation_system import rs_routers
+from .recommendation_system import rs_entities, rs_routers
 from .specificity import specificity_entities, specificity_routers
 from .diary import diary_entities, diary_routers
 
@@ -53,4 +53,5 @@ domain_entities = (
     + forbidden_foods_entities
     + plan_meals_entities
     + diary_entities
+    + rs_entities
 )
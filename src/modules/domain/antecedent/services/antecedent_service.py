@@ -8,6 +8,7 @@ from src.core.common.dto.pagination_response_dto import (
 )
 from src.core.types.find_many_options_type import FindManyOptions
 from src.core.types.update_result_type import UpdateResult
+from src.core.utils.pagination_utils import PaginationUtils
 from src.modules.domain.antecedent.dto.antecedent.antecedent_dto import AntecedentDto
 from src.modules.domain.antecedent.dto.antecedent.create_antecedent import CreateAntecedentDto
 from src.modules.domain.antecedent.dto.antecedent.update_antecedent_dto import UpdateAntecedentDto
@@ -25,7 +26,7 @@ class AntecedentService:
     ) -> Optional[AntecedentDto]:
         new_antecedent = await self.antecedent_repository.create(antecedent_type_dto, db)
 
-        new_antecedent = self.antecedent_repository.save(new_antecedent, db)
+        new_antecedent = await self.antecedent_repository.save(new_antecedent, db)
         return AntecedentDto.from_orm(new_antecedent)
 
     async def find_one_antecedent(self, id: str, db: Session) -> Optional[AntecedentDto]:
@@ -53,4 +54,5 @@ class AntecedentService:
             total,
             pagination["skip"],
             pagination["take"],
+            PaginationUtils.get_next_cursor(pagination, all_antecedent),
         )
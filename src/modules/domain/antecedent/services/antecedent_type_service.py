@@ -8,6 +8,7 @@ from src.core.common.dto.pagination_response_dto import (
 )
 from src.core.types.find_many_options_type import FindManyOptions
 from src.core.types.update_result_type import UpdateResult
+from src.core.utils.pagination_utils import PaginationUtils
 from src.modules.domain.antecedent.dto.antecedent_type.antecedent_type_dto import AntecedentTypeDto
 from src.modules.domain.antecedent.dto.antecedent_type.create_antecedent_type_dto import (
     CreateAntecedentTypeDto,
@@ -31,7 +32,7 @@ class AntecedentTypeService:
     ) -> Optional[AntecedentTypeDto]:
         new_antecedent_type = await self.antecedent_type_repository.create(antecedent_type_dto, db)
 
-        new_antecedent_type = self.antecedent_type_repository.save(new_antecedent_type, db)
+        new_antecedent_type = await self.antecedent_type_repository.save(new_antecedent_type, db)
         return AntecedentTypeDto.from_orm(new_antecedent_type)
 
     async def find_one_antecedent_type(self, id: str, db: Session) -> Optional[AntecedentTypeDto]:
@@ -64,4 +65,5 @@ class AntecedentTypeService:
             total,
             pagination["skip"],
             pagination["take"],
+            PaginationUtils.get_next_cursor(pagination, all_antecedent_type),
         )
@@ -1,4 +1,5 @@
 from typing import Optional
+from uuid import uuid4
 
 import pytest
 from httpx import AsyncClient
@@ -69,6 +70,33 @@ class TestCreateAntecedent(TestBaseE2E):
         assert data["detail"][0]["msg"] == "field required"
         assert data["detail"][0]["loc"] == ["body", "description"]
 
+    @pytest.mark.asyncio
+    @pytest.mark.it("Failure: Create an antecedent with an invalid type and user")
+    async def test_create_antecedent_with_invalid_relations(
+        self, user_admin: Optional[LoginPayloadDto]
+    ) -> None:
+        antecedent_type_id, user_id = str(uuid4()), str(uuid4())
+        async with AsyncClient(app=app, base_url=self.base_url) as ac:
+            response = await ac.post(
+                self.route,
+                json={
+                    "description": "Antecedent Test invalid relations",
+                    "antecedent_type": antecedent_type_id,
+                    "user": user_id,
+                },
+                headers={"Authorization": f"Bearer {user_admin.access_token}"},
+            )
+
+        data = response.json()
+
+        # both missing references are reported at once
+        assert response.status_code == HTTP_404_NOT_FOUND
+        assert sorted(data["detail"][0]["loc"]) == ["AntecedentType", "User"]
+        assert sorted(data["detail"][0]["msg"].split("; ")) == [
+            f'Could not find any entity of type "AntecedentType" with id "{antecedent_type_id}"',
+            f'Could not find any entity of type "User" with id "{user_id}"',
+        ]
+
     @pytest.mark.asyncio
     @pytest.mark.it("Failure: Create an antecedent without required authorization")
     async def test_create_type_of_meal_without_required_authorization(
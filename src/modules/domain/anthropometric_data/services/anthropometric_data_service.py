@@ -15,6 +15,7 @@ from src.core.types.exceptions_type import BadRequestException
 from src.core.types.find_many_options_type import FindManyOptions
 from src.core.types.update_result_type import UpdateResult
 from src.core.utils.image_utils import ImageUtils
+from src.core.utils.pagination_utils import PaginationUtils
 from src.modules.domain.anthropometric_data.dto.anthropometric_data_dto import AnthropometricDataDto
 from src.modules.domain.anthropometric_data.dto.create_anthropometric_data_dto import (
     CreateAnthropometricDataDto,
@@ -117,6 +118,7 @@ class AnthropometricDataService:
             total,
             pagination["skip"],
             pagination["take"],
+            PaginationUtils.get_next_cursor(pagination, all_user_anthropometric_data),
         )
 
     async def get_anthropometric_data_by_id(
@@ -8,6 +8,7 @@ from src.core.common.dto.pagination_response_dto import (
 )
 from src.core.types.find_many_options_type import FindManyOptions
 from src.core.types.update_result_type import UpdateResult
+from src.core.utils.pagination_utils import PaginationUtils
 from src.modules.domain.appointment.dto.appointment_goal.appointment_goal_dto import (
     AppointmentGoalDto,
 )
@@ -36,7 +37,7 @@ class AppointmentGoalService:
             appointment_goal_dto, db
         )
 
-        new_appointment_goal = self.appointment_goal_repository.save(new_appointment_goal, db)
+        new_appointment_goal = await self.appointment_goal_repository.save(new_appointment_goal, db)
         return AppointmentGoalDto(**new_appointment_goal.__dict__)
 
     async def get_all_appointment_goal(
@@ -55,6 +56,7 @@ class AppointmentGoalService:
             total,
             pagination["skip"],
             pagination["take"],
+            PaginationUtils.get_next_cursor(pagination, all_appointment_goal),
         )
 
     async def get_appointment_goal_by_id(
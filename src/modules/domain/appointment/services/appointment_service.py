@@ -12,6 +12,7 @@ from src.core.constants.enum.user_role import UserRole
 from src.core.types.exceptions_type import BadRequestException
 from src.core.types.find_many_options_type import FindManyOptions
 from src.core.types.update_result_type import UpdateResult
+from src.core.utils.pagination_utils import PaginationUtils
 from src.modules.domain.appointment.dto.appointment.appointment_dto import AppointmentDto
 from src.modules.domain.appointment.dto.appointment.create_appointment_dto import (
     CreateAppointmentDto,
@@ -78,6 +79,7 @@ class AppointmentService:
             total,
             pagination["skip"],
             pagination["take"],
+            PaginationUtils.get_next_cursor(pagination, all_appointment),
         )
 
     async def get_appointment_by_id(
@@ -9,6 +9,9 @@ from src.modules.infrastructure.database.base_entity import BaseEntity
 
 @dataclass
 class Diary(BaseEntity):
+    # the food scores follow its writes from after_flush (see user_food_score_interface.py)
+    __table_args__ = {"info": {"flush_only": True}}
+
     item_id: UUID = Column(
         UUID(as_uuid=True), ForeignKey("item.id", ondelete="CASCADE"), nullable=False
     )
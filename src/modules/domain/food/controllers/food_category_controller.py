@@ -2,6 +2,7 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from starlette.status import HTTP_201_CREATED
 
@@ -24,7 +25,7 @@ from src.modules.domain.food.dto.food_category.update_food_category_dto import (
 )
 from src.modules.domain.food.entities.food_category_entity import FoodCategory
 from src.modules.domain.food.services.food_category_service import FoodCategoryService
-from src.modules.infrastructure.database import get_db
+from src.modules.infrastructure.database import get_async_db, get_db
 
 food_category_router = APIRouter(tags=["Food Category"], prefix="/food-category")
 
@@ -55,7 +56,7 @@ async def get_all_food_category_paginated(
             FoodCategory, FoodCategoryDto, FindAllFoodCategoryQueryDto, OrderByFoodCategoryQueryDto
         )
     ),
-    database: Session = Depends(get_db),
+    database: AsyncSession = Depends(get_async_db),
 ) -> Optional[PaginationResponseDto[FoodCategoryDto]]:
     return await food_category_service.get_all_food_category_paginated(pagination, database)
 
@@ -66,7 +67,7 @@ async def get_all_food_category_paginated(
     dependencies=[Depends(Auth([UserRole.ADMIN, UserRole.NUTRITIONIST]))],
 )
 async def get_food_category_by_id(
-    id: UUID, database: Session = Depends(get_db)
+    id: UUID, database: AsyncSession = Depends(get_async_db)
 ) -> Optional[FoodCategoryDto]:
     return await food_category_service.find_one_food_category(str(id), database)
 
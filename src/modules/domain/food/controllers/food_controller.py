@@ -2,6 +2,7 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from starlette.status import HTTP_201_CREATED
 
@@ -20,7 +21,7 @@ from src.modules.domain.food.dto.food.food_query_dto import (
 from src.modules.domain.food.dto.food.update_food_dto import UpdateFoodDto
 from src.modules.domain.food.entities.food_entity import Food
 from src.modules.domain.food.services.food_service import FoodService
-from src.modules.infrastructure.database import get_db
+from src.modules.infrastructure.database import get_async_db, get_db
 
 food_router = APIRouter(tags=["Food"], prefix="/food")
 
@@ -49,7 +50,7 @@ async def get_all_food_paginated(
     pagination: FindManyOptions = Depends(
         GetPagination(Food, FoodDto, FindAllFoodQueryDto, OrderByFoodQueryDto)
     ),
-    database: Session = Depends(get_db),
+    database: AsyncSession = Depends(get_async_db),
 ) -> Optional[PaginationResponseDto[FoodDto]]:
     return await food_service.get_all_food_paginated(pagination, database)
 
@@ -59,7 +60,9 @@ async def get_all_food_paginated(
     response_model=FoodDto,
     dependencies=[Depends(Auth([UserRole.ADMIN, UserRole.NUTRITIONIST]))],
 )
-async def get_food_by_id(id: UUID, database: Session = Depends(get_db)) -> Optional[FoodDto]:
+async def get_food_by_id(
+    id: UUID, database: AsyncSession = Depends(get_async_db)
+) -> Optional[FoodDto]:
     return await food_service.find_one_food(str(id), database)
 
 
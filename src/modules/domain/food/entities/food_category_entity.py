@@ -9,6 +9,8 @@ from src.modules.infrastructure.database.base_entity import BaseEntity
 
 @dataclass
 class FoodCategory(BaseEntity):
+    __table_args__ = {"info": {"versioned": True}}
+
     description: str = Column(String(255), nullable=False)
     level: int = Column(Integer, nullable=False)
 
@@ -9,6 +9,8 @@ from src.modules.infrastructure.database.base_entity import BaseEntity
 
 @dataclass
 class Food(BaseEntity):
+    __table_args__ = {"info": {"versioned": True}}
+
     description: String = Column(String(255), nullable=False)
     proteins: Float(2) = Column(Float(2), nullable=False)
     lipids: Float(2) = Column(Float(2), nullable=False)
@@ -1,4 +1,4 @@
-from typing import Optional, Union
+from typing import List, Optional, Union
 from uuid import UUID
 
 from sqlalchemy.orm import Session
@@ -49,3 +49,8 @@ class FoodInterface:
 
     async def get_all_food(self, db: Session) -> Optional[list[FoodDto]]:
         return await self.food_service.get_all_food(db)
+
+    async def create_many_food(self, foods: List[dict], db: Session) -> Optional[List[FoodDto]]:
+        return await self.food_service.create_many_food(
+            [CreateFoodDto(**food) for food in foods], db
+        )
@@ -8,6 +8,7 @@ from src.core.common.dto.pagination_response_dto import (
 )
 from src.core.types.find_many_options_type import FindManyOptions
 from src.core.types.update_result_type import UpdateResult
+from src.core.utils.pagination_utils import PaginationUtils
 from src.modules.domain.food.dto.food_category.create_food_category_dto import (
     CreateFoodCategoryDto,
 )
@@ -31,7 +32,7 @@ class FoodCategoryService:
     ) -> Optional[FoodCategoryDto]:
         new_food_category = await self.food_category_repository.create(food_category_dto, db)
 
-        new_food_category = self.food_category_repository.save(new_food_category, db)
+        new_food_category = await self.food_category_repository.save(new_food_category, db)
         return FoodCategoryDto(**new_food_category.__dict__)
 
     async def get_all_food_category_paginated(
@@ -47,6 +48,7 @@ class FoodCategoryService:
             total,
             pagination["skip"],
             pagination["take"],
+            PaginationUtils.get_next_cursor(pagination, all_food_categories),
         )
 
     async def find_one_food_category(
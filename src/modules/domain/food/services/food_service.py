@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
@@ -8,6 +8,7 @@ from src.core.common.dto.pagination_response_dto import (
 )
 from src.core.types.find_many_options_type import FindManyOptions
 from src.core.types.update_result_type import UpdateResult
+from src.core.utils.pagination_utils import PaginationUtils
 from src.modules.domain.food.dto.food.create_food_dto import CreateFoodDto
 from src.modules.domain.food.dto.food.food_dto import FoodDto
 from src.modules.domain.food.dto.food.update_food_dto import UpdateFoodDto
@@ -26,7 +27,7 @@ class FoodService:
     async def create_food(self, food_dto: CreateFoodDto, db: Session) -> Optional[FoodDto]:
         try:
             new_food = await self.food_repository.create(food_dto, db)
-            new_food = self.food_repository.save(new_food, db)
+            new_food = await self.food_repository.save(new_food, db)
             return FoodDto(**new_food.__dict__)
         except Exception as e:
             db.rollback()
@@ -42,6 +43,7 @@ class FoodService:
             total,
             pagination["skip"],
             pagination["take"],
+            PaginationUtils.get_next_cursor(pagination, all_food),
         )
 
     async def find_one_food(self, food_id: str, db: Session) -> Optional[FoodDto]:
@@ -76,3 +78,13 @@ class FoodService:
         all_food = await self.food_repository.find(db=db)
 
         return [FoodDto(**food.__dict__) for food in all_food]
+
+    async def create_many_food(
+        self, foods_dto: List[CreateFoodDto], db: Session
+    ) -> Optional[List[FoodDto]]:
+        try:
+            new_foods = await self.food_repository.create_many(foods_dto, db)
+            return [FoodDto(**food.__dict__) for food in new_foods]
+        except Exception as e:
+            db.rollback()
+            raise e
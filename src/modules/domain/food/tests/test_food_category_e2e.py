@@ -1,4 +1,6 @@
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
 
 import pytest
 from _pytest.fixtures import FixtureRequest
@@ -12,11 +14,25 @@ from starlette.status import (
 )
 
 from src.main import app
+from src.modules.domain.food.dto.food_category.create_food_category_dto import (
+    CreateFoodCategoryDto,
+)
 from src.modules.domain.food.entities.food_category_entity import FoodCategory
 from src.modules.domain.food.entities.food_entity import Food
+from src.modules.domain.food.repositories.food_category_repository import (
+    FoodCategoryRepository,
+)
 from src.modules.domain.food.repositories.food_repository import FoodRepository
 from src.modules.domain.food.services.food_category_service import FoodCategoryService
+from src.modules.domain.forbidden_foods.entities.forbidden_foods_entity import ForbiddenFoods
+from src.modules.domain.item.entities.item_has_food_entity import ItemHasFood
+from src.modules.domain.recommendation_system.entities.user_food_score_version_entity import (
+    UserFoodScoreVersion,
+)
+from src.modules.domain.specificity.entities.specificity_entity import Specificity
 from src.modules.infrastructure.auth.dto.login_payload_dto import LoginPayloadDto
+from src.modules.infrastructure.database import AsyncSessionLocal, SessionLocal
+from src.modules.infrastructure.database.control_transaction import keep_nested_transaction
 from test.test_base_e2e import TestBaseE2E
 
 CONTROLLER = "food-category"
@@ -352,3 +368,170 @@ class TestUpdateFoodCategory(TestBaseE2E):
         await self.patch_different_required_authentication(
             f"{self.route}/{food_category_item['id']}", user
         )
+
+
+@pytest.mark.describe("Repository: FoodCategoryRepository.upsert_many")
+class TestUpsertFoodCategories(TestBaseE2E):
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: Upsert food categories, keeping the existing ones' state")
+    async def test_upsert_food_categories(self) -> None:
+        food_category_item, deleted_food_category_item = self.db_test_utils.get_entity_objects(
+            FoodCategory
+        )[:2]
+
+        response = await FoodCategoryRepository().upsert_many(
+            [
+                FoodCategory(
+                    id=UUID(food_category_item["id"]),
+                    description="Level 1 upserted",
+                    level=1,
+                    deleted_at=None,
+                ),
+                FoodCategory(
+                    id=UUID(deleted_food_category_item["id"]),
+                    description="Level Teste Deleted upserted",
+                    level=1,
+                    deleted_at=None,
+                ),
+                FoodCategory(description="Level 10", level=10),
+            ],
+            self.db_test_utils.db,
+        )
+
+        def to_datetime(value: str) -> datetime:
+            return datetime.strptime(value, "%Y-%m-%d %H:%M:%S.%f %z")
+
+        assert [food_category.description for food_category in response] == [
+            "Level 1 upserted",
+            "Level Teste Deleted upserted",
+            "Level 10",
+        ]
+        assert response[0].created_at == to_datetime(food_category_item["created_at"])
+        assert response[0].deleted_at is None
+        assert response[1].created_at == to_datetime(deleted_food_category_item["created_at"])
+        assert response[1].deleted_at == to_datetime(deleted_food_category_item["deleted_at"])
+        assert response[2].created_at is not None
+
+
+@pytest.mark.describe("Service: FoodCategoryService.create_food_category with an AsyncSession")
+class TestCreateFoodCategoryAsyncSession(TestBaseE2E):
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: Create and save a food category through the AsyncSession")
+    async def test_create_food_category_async_session(self) -> None:
+        async with AsyncSessionLocal() as async_db:
+            food_category_dto = await food_category_service.create_food_category(
+                CreateFoodCategoryDto(description="Level 50", level=50), async_db
+            )
+
+            refreshed_food_category = await FoodCategoryRepository.refresh_entity(
+                await FoodCategoryRepository().find_one(str(food_category_dto.id), async_db),
+                async_db,
+            )
+
+        assert food_category_dto.description == "Level 50"
+        assert food_category_dto.created_at is not None
+        assert refreshed_food_category.description == "Level 50"
+
+        food_category = await FoodCategoryRepository().find_one(
+            str(food_category_dto.id), self.db_test_utils.db
+        )
+
+        assert food_category is not None
+        assert food_category.level == 50
+
+
+@pytest.mark.describe("Repository: soft deleted entities in the loaded relations")
+class TestSoftDeletedRelations(TestBaseE2E):
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: Leave the soft deleted foods out of the foods of a category")
+    @pytest.mark.parametrize("strategy", ["selectin", "joined", "subquery"])
+    async def test_soft_deleted_foods_of_food_category(self, strategy: str) -> None:
+        food_category_item = self.db_test_utils.get_entity_objects(FoodCategory)[3]
+        food_items = [
+            food_item
+            for food_item in self.db_test_utils.get_entity_objects(Food)
+            if food_item["food_category_id"] == food_category_item["id"]
+        ]
+
+        async def find_food_ids(with_deleted: bool) -> List[str]:
+            # a session of its own, so the foods are loaded by the query and not by another one
+            db = SessionLocal()
+            try:
+                food_category = await FoodCategoryRepository().find_one(
+                    {
+                        "where": FoodCategory.id == food_category_item["id"],
+                        "relations": {"foods": strategy},
+                        "with_deleted": with_deleted,
+                    },
+                    db,
+                )
+                return sorted(str(food.id) for food in food_category.foods)
+            finally:
+                db.close()
+
+        assert any(food_item["deleted_at"] for food_item in food_items)
+        assert await find_food_ids(with_deleted=False) == sorted(
+            food_item["id"] for food_item in food_items if not food_item["deleted_at"]
+        )
+        assert await find_food_ids(with_deleted=True) == sorted(
+            food_item["id"] for food_item in food_items
+        )
+
+
+@pytest.mark.describe("Repository: FoodCategoryRepository.soft_delete cascade")
+class TestSoftDeleteFoodCategoryCascade(TestBaseE2E):
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: Soft delete a category with its foods and their relations")
+    async def test_soft_delete_food_category_cascade(self) -> None:
+        food_category_item = self.db_test_utils.get_entity_objects(FoodCategory)[3]
+        food_ids = [
+            food_item["id"]
+            for food_item in self.db_test_utils.get_entity_objects(Food)
+            if food_item["food_category_id"] == food_category_item["id"]
+            and not food_item["deleted_at"]
+        ]
+        food_relation_items = {
+            entity: [
+                item
+                for item in self.db_test_utils.get_entity_objects(entity)
+                if item["food_id"] in food_ids and not item["deleted_at"]
+            ]
+            for entity in [Specificity, ItemHasFood, ForbiddenFoods]
+        }
+        specificity_item = food_relation_items[Specificity][0]
+        db = SessionLocal()
+
+        def get_user_version() -> int:
+            return (
+                db.query(UserFoodScoreVersion.version)
+                .filter(UserFoodScoreVersion.user_id == specificity_item["user_id"])
+                .scalar()
+                or 0
+            )
+
+        try:
+            # loaded before the cascade, which updates their rows without the ORM
+            food = db.get(Food, food_ids[0])
+            specificity = db.get(Specificity, specificity_item["id"])
+            user_version = get_user_version()
+
+            with keep_nested_transaction(db, commit_on_complete=False):
+                response = await FoodCategoryRepository().soft_delete(food_category_item["id"], db)
+
+                assert response["affected"] == 1 + len(food_ids) + sum(
+                    len(items) for items in food_relation_items.values()
+                )
+                assert db.query(Food).filter(Food.id.in_(food_ids)).count() == 0
+                for entity in food_relation_items:
+                    assert db.query(entity).filter(entity.food_id.in_(food_ids)).count() == 0
+
+                # the session sees the deletion of every level, as its committed state
+                assert food.deleted_at is not None
+                assert specificity.deleted_at == food.deleted_at
+                assert not db.is_modified(food) and not db.is_modified(specificity)
+
+                # the listeners of the deleted specificities changed the scores of their user
+                assert get_user_version() == user_version + 1
+        finally:
+            db.rollback()
+            db.close()
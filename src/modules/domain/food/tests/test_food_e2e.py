@@ -1,4 +1,5 @@
 from typing import Optional
+from uuid import uuid4
 
 import pytest
 from _pytest.fixtures import FixtureRequest
@@ -6,17 +7,27 @@ from httpx import AsyncClient
 from starlette.status import (
     HTTP_200_OK,
     HTTP_201_CREATED,
+    HTTP_400_BAD_REQUEST,
     HTTP_403_FORBIDDEN,
     HTTP_404_NOT_FOUND,
     HTTP_422_UNPROCESSABLE_ENTITY,
 )
 
 from src.core.constants.default_values import DEFAULT_AMOUNT_GRAMS
+from src.core.types.exceptions_type import NotFoundException
 from src.main import app
+from src.modules.domain.food.entities.food_category_entity import FoodCategory
 from src.modules.domain.food.entities.food_entity import Food
+from src.modules.domain.food.repositories.food_category_repository import (
+    FoodCategoryRepository,
+)
+from src.modules.domain.food.repositories.food_repository import FoodRepository
 from src.modules.domain.food.services.food_service import FoodService
 from src.modules.domain.item.entities.item_has_food_entity import ItemHasFood
 from src.modules.infrastructure.auth.dto.login_payload_dto import LoginPayloadDto
+from src.modules.infrastructure.database import SessionLocal
+from src.modules.infrastructure.database.control_transaction import keep_nested_transaction
+from src.modules.infrastructure.database.identity_cache import get_identity_cache
 from test.test_base_e2e import TestBaseE2E
 
 CONTROLLER = "food"
@@ -165,6 +176,61 @@ class TestGetAllFoods(TestBaseE2E):
                     == "75827c83-d4cb-46cb-a092-9ba2dd962023"
                 )
 
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: Get every food page by page with a cursor")
+    async def test_get_foods_with_cursor(self, user_admin: Optional[LoginPayloadDto]) -> None:
+        food_ids, counts, cursor = [], [], ""
+        async with AsyncClient(app=app, base_url=self.base_url) as ac:
+            while cursor is not None:
+                response = await ac.get(
+                    self.route,
+                    headers={"Authorization": f"Bearer {user_admin.access_token}"},
+                    params={"take": 2, "sort": ["description:-"], "cursor": cursor},
+                )
+                assert response.status_code == HTTP_200_OK
+
+                body = response.json()
+                food_ids += [food["id"] for food in body["data"]]
+                counts.append(body["count"])
+                cursor = body["next_cursor"]
+
+        # only the first page is counted
+        assert len(counts) > 1
+        assert counts[1:] == [None] * (len(counts) - 1)
+        assert len(food_ids) == len(set(food_ids)) == counts[0]
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: Get a list of all food with an estimated count")
+    async def test_get_foods_with_estimated_count(
+        self, user_admin: Optional[LoginPayloadDto]
+    ) -> None:
+        async with AsyncClient(app=app, base_url=self.base_url) as ac:
+            response = await ac.get(
+                self.route,
+                headers={"Authorization": f"Bearer {user_admin.access_token}"},
+                params={"take": 1, "estimate_count": True},
+            )
+
+        body = response.json()
+
+        assert response.status_code == HTTP_200_OK
+        assert len(body["data"]) == 1
+        assert body["count"] >= 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Failure: Get a list of all food with an invalid cursor")
+    async def test_get_foods_with_invalid_cursor(
+        self, user_admin: Optional[LoginPayloadDto]
+    ) -> None:
+        async with AsyncClient(app=app, base_url=self.base_url) as ac:
+            response = await ac.get(
+                self.route,
+                headers={"Authorization": f"Bearer {user_admin.access_token}"},
+                params={"cursor": "invalid"},
+            )
+
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
     @pytest.mark.asyncio
     @pytest.mark.it("Failure: Get a list of all food without authentication")
     async def test_no_authentication(self) -> None:
@@ -317,3 +383,101 @@ class TestUpdateFood(TestBaseE2E):
         food_item = self.db_test_utils.get_entity_objects(Food)[1]
         user: LoginPayloadDto = request.getfixturevalue(user)
         await self.patch_different_required_authentication(f"{self.route}/{food_item['id']}", user)
+
+
+@pytest.mark.describe("Repository: identity cache of the related entities")
+class TestIdentityCache(TestBaseE2E):
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: Load the relations of a food once per session")
+    async def test_identity_cache_hits_and_misses(self) -> None:
+        # not deleted by the previous tests of the module
+        food_item = self.db_test_utils.get_entity_objects(Food)[3]
+        db = SessionLocal()
+        identity_cache = get_identity_cache(db)
+
+        try:
+            await FoodRepository().find_one(food_item["id"], db)
+            misses = identity_cache.misses
+
+            assert identity_cache.hits == 0
+            assert misses > 0
+
+            await FoodRepository().find_one(food_item["id"], db)
+
+            assert identity_cache.hits == misses
+            assert identity_cache.misses == misses
+        finally:
+            db.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: The created, updated and deleted entities are loaded again")
+    async def test_identity_cache_invalidation(self) -> None:
+        category_id = uuid4()
+        db = SessionLocal()
+        identity_cache = get_identity_cache(db)
+
+        def new_food() -> Food:
+            return Food(
+                description="Food identity cache",
+                proteins=0,
+                lipids=0,
+                carbohydrates=0,
+                energy_value=0,
+                potassium=0,
+                phosphorus=0,
+                sodium=0,
+                food_category_id=category_id,
+            )
+
+        try:
+            with keep_nested_transaction(db, commit_on_complete=False):
+                with pytest.raises(NotFoundException):
+                    await FoodRepository().create(new_food(), db)
+                # cached as missing
+                assert identity_cache.get_many(FoodCategory, [category_id]) == ({}, set())
+
+                await FoodCategoryRepository().create(
+                    FoodCategory(id=category_id, description="Level identity cache", level=1), db
+                )
+                assert identity_cache.get_many(FoodCategory, [category_id]) == ({}, {category_id})
+
+                food = await FoodRepository().create(new_food(), db)
+                await FoodRepository().find_one(str(food.id), db)
+                assert category_id in identity_cache.get_many(FoodCategory, [category_id])[0]
+
+                await FoodCategoryRepository().update(
+                    str(category_id), {"description": "Level identity cache updated"}, db
+                )
+                assert identity_cache.get_many(FoodCategory, [category_id]) == ({}, {category_id})
+
+                await FoodRepository().find_one(str(food.id), db)
+                await FoodRepository().delete(str(food.id), db)
+                await FoodCategoryRepository().delete(str(category_id), db)
+                assert identity_cache.get_many(FoodCategory, [category_id]) == ({}, {category_id})
+        finally:
+            db.rollback()
+            db.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: A rollback clears the identity cache")
+    async def test_identity_cache_cleared_on_rollback(self) -> None:
+        # not deleted by the previous tests of the module
+        food_item = self.db_test_utils.get_entity_objects(Food)[3]
+        db = SessionLocal()
+        identity_cache = get_identity_cache(db)
+
+        try:
+            await FoodRepository().find_one(food_item["id"], db)
+            assert (
+                food_item["food_category_id"]
+                in identity_cache.get_many(FoodCategory, [food_item["food_category_id"]])[0]
+            )
+
+            db.rollback()
+
+            assert identity_cache.get_many(FoodCategory, [food_item["food_category_id"]]) == (
+                {},
+                {food_item["food_category_id"]},
+            )
+        finally:
+            db.close()
@@ -10,6 +10,8 @@ from src.modules.infrastructure.database.base_entity import BaseEntity
 
 @dataclass
 class ForbiddenFoods(BaseEntity):
+    __table_args__ = {"info": {"versioned": True}}
+
     food_id: UUID = Column(
         UUID(as_uuid=True), ForeignKey("food.id", ondelete="CASCADE"), nullable=False
     )
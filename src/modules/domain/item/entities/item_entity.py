@@ -8,6 +8,8 @@ from src.modules.infrastructure.database.base_entity import BaseEntity
 
 @dataclass
 class Item(BaseEntity):
+    __table_args__ = {"info": {"versioned": True}}
+
     description: str = Column(String(255), nullable=False)
 
     foods = relationship(
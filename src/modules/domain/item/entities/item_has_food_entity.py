@@ -10,6 +10,8 @@ from src.modules.infrastructure.database.base_entity import BaseEntity
 
 @dataclass
 class ItemHasFood(BaseEntity):
+    __table_args__ = {"info": {"versioned": True}}
+
     amount_grams: float = Column(Float, nullable=False, default=DEFAULT_AMOUNT_GRAMS)
 
     item_id: UUID = Column(
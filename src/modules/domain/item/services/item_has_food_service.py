@@ -32,12 +32,9 @@ class ItemHasFoodService:
     async def _create_item_has_food(
         self, item_has_foods: List[CreateItemHasFoodDto], db: Session
     ) -> Optional[List[ItemHasFoodDto]]:
-        new_item_has_foods: List[ItemHasFood] = []
-        for food in item_has_foods:
-            tmp_item_has_food = await self.item_has_food_repository.create(food, db)
-            new_item_has_foods.append(tmp_item_has_food)
-
-        new_item_has_foods = self.item_has_food_repository.save(new_item_has_foods, db)
+        new_item_has_foods: List[ItemHasFood] = await self.item_has_food_repository.create_many(
+            item_has_foods, db
+        )
         return [ItemHasFoodDto(**item_has_food.__dict__) for item_has_food in new_item_has_foods]
 
     async def _update_item_has_food(
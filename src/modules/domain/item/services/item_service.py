@@ -8,6 +8,7 @@ from src.core.common.dto.pagination_response_dto import (
 )
 from src.core.types.find_many_options_type import FindManyOptions
 from src.core.types.update_result_type import UpdateResult
+from src.core.utils.pagination_utils import PaginationUtils
 from src.modules.domain.item.dto.item.create_item_dto import CreateItemDto
 from src.modules.domain.item.dto.item.item_dto import ItemDto
 from src.modules.domain.item.dto.item.update_item_dto import UpdateItemDto
@@ -40,7 +41,7 @@ class ItemService:
                     new_item.id, item_dto.can_eat_at, db
                 )
 
-            new_item = self.item_repository.save(new_item, db)
+            new_item = await self.item_repository.save(new_item, db)
             response = ItemDto(**new_item.__dict__)
             response.foods = new_item_foods
             response.can_eat_at = new_item_can_eat_at
@@ -59,6 +60,7 @@ class ItemService:
             total,
             pagination["skip"],
             pagination["take"],
+            PaginationUtils.get_next_cursor(pagination, all_item),
         )
 
     async def find_one_item(self, item_id: str, db: Session) -> Optional[ItemDto]:
@@ -1,7 +1,10 @@
-from typing import Optional
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
 from starlette.status import (
     HTTP_200_OK,
     HTTP_201_CREATED,
@@ -13,8 +16,16 @@ from starlette.status import (
 from src.main import app
 from src.modules.domain.item.entities.item_entity import Item
 from src.modules.domain.item.entities.item_has_food_entity import ItemHasFood
+from src.modules.domain.item.repositories.item_has_food_repository import ItemHasFoodRepository
+from src.modules.domain.item.repositories.item_repository import ItemRepository
 from src.modules.domain.item.services.item_service import ItemService
+from src.modules.domain.meal.entities.item_can_eat_at_entity import ItemCanEatAt
 from src.modules.infrastructure.auth.dto.login_payload_dto import LoginPayloadDto
+from src.modules.infrastructure.database import SessionLocal
+from src.modules.infrastructure.database.repository_methods.query_constructor import (
+    QueryConstructor,
+)
+from src.modules.infrastructure.database.session import engine
 from test.test_base_e2e import TestBaseE2E
 
 CONTROLLER = "item"
@@ -354,3 +365,103 @@ class TestUpdateItem(TestBaseE2E):
         await self.patch_different_required_authentication(
             f"{self.route}/{item['id']}", user_common
         )
+
+
+@contextmanager
+def record_statements() -> Iterator[List[str]]:
+    statements = []
+
+    def record(conn, cursor, statement: str, *args) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.describe("Repository: loading strategy of the relations")
+class TestRelationLoadingStrategy(TestBaseE2E):
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: Load each collection of a page of items with one more query")
+    async def test_load_collections_with_selectin(self) -> None:
+        item = self.db_test_utils.get_entity_objects(Item)[0]
+        db = SessionLocal()
+
+        try:
+            food_count = db.query(ItemHasFood).filter(ItemHasFood.item_id == item["id"]).count()
+            can_eat_at_count = (
+                db.query(ItemCanEatAt).filter(ItemCanEatAt.item_id == item["id"]).count()
+            )
+            db.expunge_all()
+
+            with record_statements() as statements:
+                items = await ItemRepository().find(
+                    {
+                        "where": Item.id == item["id"],
+                        "take": 1,
+                        "relations": ["foods", "can_eat_at"],
+                    },
+                    db,
+                )
+
+            # the page itself, then one IN query per collection, none of them multiplying its rows
+            assert len(statements) == 3
+            assert len(items) == 1
+            assert len(items[0].foods) == food_count
+            assert len(items[0].can_eat_at) == can_eat_at_count
+        finally:
+            db.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: Join the single related entities")
+    async def test_join_single_relations(self) -> None:
+        db = SessionLocal()
+
+        try:
+            assert QueryConstructor.get_relation_strategies(ItemHasFood, ["item", "food"]) == {
+                "item": "joined",
+                "food": "joined",
+            }
+
+            item_foods = await ItemHasFoodRepository().find({"relations": ["item", "food"]}, db)
+
+            with record_statements() as statements:
+                for item_food in item_foods:
+                    assert item_food.item is not None and item_food.food is not None
+
+            assert len(item_foods) > 0
+            assert statements == []
+        finally:
+            db.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: Load a relation with the given strategy")
+    async def test_given_loading_strategy(self) -> None:
+        item = self.db_test_utils.get_entity_objects(Item)[0]
+        db = SessionLocal()
+
+        try:
+            with record_statements() as statements:
+                items = await ItemRepository().find(
+                    {"where": Item.id == item["id"], "relations": {"foods": "joined"}}, db
+                )
+            # a collection joined on request, in the same query as the item
+            assert len(statements) == 1
+            assert len(items) == 1
+            db.expunge_all()
+
+            items = await ItemRepository().find(
+                {"where": Item.id == item["id"], "relations": {"foods": "raise"}}, db
+            )
+            with pytest.raises(InvalidRequestError):
+                items[0].foods
+        finally:
+            db.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Failure: Load a relation with an unknown strategy")
+    async def test_unknown_loading_strategy(self) -> None:
+        with pytest.raises(KeyError):
+            QueryConstructor.get_relation_strategies(Item, {"foods": "lazy"})
@@ -9,6 +9,8 @@ from src.modules.infrastructure.database.base_entity import BaseEntity
 
 @dataclass
 class ItemCanEatAt(BaseEntity):
+    __table_args__ = {"info": {"versioned": True}}
+
     type_of_meal_id: UUID = Column(
         UUID(as_uuid=True), ForeignKey("type_of_meal.id", ondelete="CASCADE"), nullable=False
     )
@@ -25,22 +25,22 @@ class ItemCanEatAtService:
         self, item_can_eat_at_dto: CreateItemCanEatAtDto, db: Session
     ) -> Optional[List[ItemCanEatAtDto]]:
         try:
-            all_item_can_eat_at = []
             with keep_nested_transaction(db):
-                for meal_type_id in item_can_eat_at_dto.type_of_meal_id:
-                    new_item_can_eat_at = await self.item_can_eat_at_repository.create(
+                all_item_can_eat_at = await self.item_can_eat_at_repository.create_many(
+                    [
                         ItemCanEatAt(
                             type_of_meal_id=meal_type_id, item_id=item_can_eat_at_dto.item_id
-                        ),
-                        db,
-                    )
-                    new_item_can_eat_at = self.item_can_eat_at_repository.save(
-                        new_item_can_eat_at, db
-                    )
-                    all_item_can_eat_at.append(ItemCanEatAtDto(**new_item_can_eat_at.__dict__))
+                        )
+                        for meal_type_id in item_can_eat_at_dto.type_of_meal_id
+                    ],
+                    db,
+                )
 
             db.commit()
-            return all_item_can_eat_at
+            return [
+                ItemCanEatAtDto(**item_can_eat_at.__dict__)
+                for item_can_eat_at in all_item_can_eat_at
+            ]
         except Exception as e:
             db.rollback()
             raise e
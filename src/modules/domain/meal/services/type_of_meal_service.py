@@ -8,6 +8,7 @@ from src.core.common.dto.pagination_response_dto import (
 )
 from src.core.types.find_many_options_type import FindManyOptions
 from src.core.types.update_result_type import UpdateResult
+from src.core.utils.pagination_utils import PaginationUtils
 from src.modules.domain.meal.dto.type_of_meal.create_type_of_meal_dto import CreateTypeOfMealDto
 from src.modules.domain.meal.dto.type_of_meal.type_of_meal_dto import TypeOfMealDto
 from src.modules.domain.meal.dto.type_of_meal.update_type_of_meal_dto import UpdateTypeOfMealDto
@@ -25,7 +26,7 @@ class TypeOfMealService:
     ) -> Optional[TypeOfMealDto]:
         new_type_of_meal = await self.type_of_meal_repository.create(type_of_meal_dto, db)
 
-        new_type_of_meal = self.type_of_meal_repository.save(new_type_of_meal, db)
+        new_type_of_meal = await self.type_of_meal_repository.save(new_type_of_meal, db)
         return TypeOfMealDto(**new_type_of_meal.__dict__)
 
     async def find_one_type_of_meal(self, id: str, db: Session) -> Optional[TypeOfMealDto]:
@@ -55,6 +56,7 @@ class TypeOfMealService:
             total,
             pagination["skip"],
             pagination["take"],
+            PaginationUtils.get_next_cursor(pagination, all_type_of_meal),
         )
 
     # ---------------------- INTERFACE METHODS ----------------------
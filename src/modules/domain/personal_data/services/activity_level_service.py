@@ -8,6 +8,7 @@ from src.core.common.dto.pagination_response_dto import (
 )
 from src.core.types.find_many_options_type import FindManyOptions
 from src.core.types.update_result_type import UpdateResult
+from src.core.utils.pagination_utils import PaginationUtils
 from src.modules.domain.personal_data.dto.activity_level.activity_level_dto import ActivityLevelDto
 from src.modules.domain.personal_data.dto.activity_level.create_activity_level_dto import (
     CreateActivityLevelDto,
@@ -31,7 +32,7 @@ class ActivityLevelService:
     ) -> Optional[ActivityLevelDto]:
         new_activity_level = await self.activity_level_repository.create(activity_level_dto, db)
 
-        new_activity_level = self.activity_level_repository.save(new_activity_level, db)
+        new_activity_level = await self.activity_level_repository.save(new_activity_level, db)
         return ActivityLevelDto(**new_activity_level.__dict__)
 
     async def get_all_activity_level_paginated(
@@ -47,6 +48,7 @@ class ActivityLevelService:
             total,
             pagination["skip"],
             pagination["take"],
+            PaginationUtils.get_next_cursor(pagination, all_activity_levels),
         )
 
     async def find_one_activity_level(
@@ -1,4 +1,4 @@
-from typing import Optional, Union
+from typing import List, Optional, Union
 from uuid import UUID
 
 from sqlalchemy.orm import Session
@@ -36,3 +36,27 @@ class MealsOptionsInterface:
             ),
             db,
         )
+
+    async def create_meals_options(
+        self, meals_options: List[dict], nutritional_plan_has_meal_id: Optional[UUID], db: Session
+    ) -> Optional[List[MealsOptionsDto]]:
+        """
+        Options of several meals can be created at once, each with its own
+        "nutritional_plan_has_meal_id", by passing None as `nutritional_plan_has_meal_id`.
+        """
+        return await self.meals_options_service.create_meals_options(
+            [
+                CreateMealsOptionsDto(
+                    **{
+                        "amount": meal_option["amount"],
+                        "suggested_by_system": meal_option["suggested_by_system"],
+                        "item": meal_option["item_id"],
+                        "nutritional_plan_has_meal": meal_option.get(
+                            "nutritional_plan_has_meal_id", nutritional_plan_has_meal_id
+                        ),
+                    }
+                )
+                for meal_option in meals_options
+            ],
+            db,
+        )
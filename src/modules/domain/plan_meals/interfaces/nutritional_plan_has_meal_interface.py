@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from sqlalchemy.orm import Session
@@ -26,6 +26,13 @@ class NutritionalPlanHasMealInterface:
             meal_date, nutritional_plan_id, meal_of_plan_id, db
         )
 
+    async def get_nutritional_plan_has_meals_by_date_range(
+        self, start_date: date, end_date: date, nutritional_plan_id: UUID, db: Session
+    ) -> List[NutritionalPlanHasMealDto]:
+        return await self.nphm_service.get_nutritional_plan_has_meals_by_date_range(
+            start_date, end_date, nutritional_plan_id, db
+        )
+
     async def create_nutritional_plan_has_meal(
         self, meal_date: date, nutritional_plan_id: UUID, meal_of_plan_id: UUID, db: Session
     ) -> Optional[NutritionalPlanHasMealDto]:
@@ -39,3 +46,20 @@ class NutritionalPlanHasMealInterface:
             ),
             db,
         )
+
+    async def create_nutritional_plan_has_meals(
+        self, meals: List[dict], nutritional_plan_id: UUID, db: Session
+    ) -> List[NutritionalPlanHasMealDto]:
+        return await self.nphm_service.create_nutritional_plan_has_meals(
+            [
+                CreateNutritionalPlanHasMealDto(
+                    **{
+                        "meal_date": meal["meal_date"],
+                        "nutritional_plan": nutritional_plan_id,
+                        "meals_of_plan": meal["meals_of_plan_id"],
+                    }
+                )
+                for meal in meals
+            ],
+            db,
+        )
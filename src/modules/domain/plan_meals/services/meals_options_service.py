@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
@@ -21,5 +21,14 @@ class MealsOptionsService:
     ) -> Optional[MealsOptionsDto]:
         new_meal_option = await self.meals_options_repository.create(create_meals_options_dto, db)
 
-        new_meal_option = self.meals_options_repository.save(new_meal_option, db)
+        new_meal_option = await self.meals_options_repository.save(new_meal_option, db)
         return MealsOptionsDto(**new_meal_option.__dict__)
+
+    async def create_meals_options(
+        self, create_meals_options_dtos: List[CreateMealsOptionsDto], db: Session
+    ) -> Optional[List[MealsOptionsDto]]:
+        new_meals_options = await self.meals_options_repository.create_many(
+            create_meals_options_dtos, db
+        )
+
+        return [MealsOptionsDto(**meal_option.__dict__) for meal_option in new_meals_options]
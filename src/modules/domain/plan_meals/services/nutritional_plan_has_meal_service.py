@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from sqlalchemy.orm import Session
@@ -28,9 +28,16 @@ class NutritionalPlanHasMealService:
     ) -> Optional[NutritionalPlanHasMealDto]:
         new_nphm = await self.nphm_repository.create(create_nphm_dto, db)
 
-        new_nphm = self.nphm_repository.save(new_nphm, db)
+        new_nphm = await self.nphm_repository.save(new_nphm, db)
         return NutritionalPlanHasMealDto(**new_nphm.__dict__)
 
+    async def create_nutritional_plan_has_meals(
+        self, create_nphm_dtos: List[CreateNutritionalPlanHasMealDto], db: Session
+    ) -> List[NutritionalPlanHasMealDto]:
+        new_nphms = await self.nphm_repository.create_many(create_nphm_dtos, db)
+
+        return [NutritionalPlanHasMealDto(**new_nphm.__dict__) for new_nphm in new_nphms]
+
     # ---------------------- INTERFACE METHODS ----------------------
     async def get_nutritional_plan_has_meal_by_date(
         self, meal_date: date, nutritional_plan_id: UUID, meal_of_plan_id: UUID, db: Session
@@ -47,3 +54,19 @@ class NutritionalPlanHasMealService:
         )
 
         return NutritionalPlanHasMealDto.from_orm(result)
+
+    async def get_nutritional_plan_has_meals_by_date_range(
+        self, start_date: date, end_date: date, nutritional_plan_id: UUID, db: Session
+    ) -> List[NutritionalPlanHasMealDto]:
+        result = await self.nphm_repository.find(
+            {
+                "where": [
+                    NutritionalPlanHasMeal.nutritional_plan_id == nutritional_plan_id,
+                    NutritionalPlanHasMeal.meal_date >= start_date,
+                    NutritionalPlanHasMeal.meal_date <= end_date,
+                ]
+            },
+            db,
+        )
+
+        return [NutritionalPlanHasMealDto(**nphm.__dict__) for nphm in result]
@@ -1,8 +1,11 @@
 from fastapi import APIRouter
 
-from src.modules.domain.recommendation_system.controllers.recommendation_system_controller import (
-    rs_router,
-)
+from .entities.user_food_consumption_entity import UserFoodConsumption
+from .entities.user_food_score_entity import UserFoodScore
+from .entities.user_food_score_version_entity import UserFoodScoreVersion
+from .controllers.recommendation_system_controller import rs_router
 
 rs_routers = APIRouter()
 rs_routers.include_router(rs_router)
+
+rs_entities = [UserFoodConsumption, UserFoodScore, UserFoodScoreVersion]
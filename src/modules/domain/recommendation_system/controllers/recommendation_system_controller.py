@@ -1,11 +1,18 @@
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
+from starlette.status import HTTP_201_CREATED, HTTP_202_ACCEPTED
 
 from src.core.constants.enum.user_role import UserRole
 from src.core.decorators.http_decorator import Auth
+from src.modules.domain.recommendation_system.dto.complete_nutritional_plan_job_dto import (
+    CompleteNutritionalPlanJobDto,
+)
+from src.modules.domain.recommendation_system.dto.nutritional_plan_preview_dto import (
+    NutritionalPlanPreviewDto,
+)
 from src.modules.domain.recommendation_system.dto.user_preferences_table_dto import (
     DetailedUserPreferencesTable,
     SimplifiedUserPreferencesTable,
@@ -14,6 +21,7 @@ from src.modules.domain.recommendation_system.services.recommendation_system_ser
     RecommendationSystemService,
 )
 from src.modules.infrastructure.database import get_db
+from src.modules.infrastructure.jobs.dto.job_dto import JobDto
 
 rs_router = APIRouter(tags=["Recommendation System"], prefix="/recommendation-system")
 
@@ -37,6 +45,60 @@ async def complete_nutritional_plan(
     )
 
 
+@rs_router.post(
+    "/complete-nutritional-plan/preview",
+    response_model=NutritionalPlanPreviewDto,
+    dependencies=[Depends(Auth([UserRole.ADMIN, UserRole.NUTRITIONIST]))],
+)
+async def preview_nutritional_plan(
+    user_id: UUID,
+    nutritional_plan_id: UUID,
+    available: bool = True,
+    force_reload: bool = False,
+    database: Session = Depends(get_db),
+) -> NutritionalPlanPreviewDto:
+    return await rs_service.preview_nutritional_plan(
+        str(user_id), str(nutritional_plan_id), available, force_reload, database
+    )
+
+
+@rs_router.post(
+    "/complete-nutritional-plan/apply",
+    status_code=HTTP_201_CREATED,
+    dependencies=[Depends(Auth([UserRole.ADMIN, UserRole.NUTRITIONIST]))],
+)
+async def apply_nutritional_plan_preview(
+    preview: NutritionalPlanPreviewDto, database: Session = Depends(get_db)
+) -> None:
+    return await rs_service.apply_nutritional_plan_preview(preview, database)
+
+
+@rs_router.post(
+    "/complete-nutritional-plan/job",
+    status_code=HTTP_202_ACCEPTED,
+    response_model=JobDto,
+    dependencies=[Depends(Auth([UserRole.ADMIN, UserRole.NUTRITIONIST]))],
+)
+async def enqueue_complete_nutritional_plan(
+    user_id: UUID,
+    nutritional_plan_id: UUID,
+    available: bool = True,
+    force_reload: bool = False,
+) -> JobDto:
+    return rs_service.enqueue_complete_nutritional_plan(
+        str(user_id), str(nutritional_plan_id), available, force_reload
+    )
+
+
+@rs_router.get(
+    "/complete-nutritional-plan/job/{job_id}",
+    response_model=CompleteNutritionalPlanJobDto,
+    dependencies=[Depends(Auth([UserRole.ADMIN, UserRole.NUTRITIONIST]))],
+)
+async def get_complete_nutritional_plan_job(job_id: UUID) -> CompleteNutritionalPlanJobDto:
+    return rs_service.get_complete_nutritional_plan_job(str(job_id))
+
+
 @rs_router.get(
     "/food-preferences",
     response_model=List[SimplifiedUserPreferencesTable],
@@ -47,8 +109,18 @@ async def user_food_preferences(
     nutritional_plan_id: UUID,
     available: bool = True,
     force_reload: bool = False,
+    limit: Optional[int] = Query(default=None, ge=1),
+    offset: int = Query(default=0, ge=0),
+    min_score: Optional[int] = Query(default=None),
     database: Session = Depends(get_db),
 ) -> Optional[List[DetailedUserPreferencesTable]]:
     return await rs_service.get_user_food_preferences(
-        str(user_id), str(nutritional_plan_id), available, force_reload, database
+        str(user_id),
+        str(nutritional_plan_id),
+        available,
+        force_reload,
+        database,
+        limit,
+        offset,
+        min_score,
     )
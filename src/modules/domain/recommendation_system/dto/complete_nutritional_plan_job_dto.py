@@ -0,0 +1,10 @@
+from typing import List, Optional
+
+from src.modules.domain.recommendation_system.dto.user_preferences_table_dto import (
+    SimplifiedUserPreferencesTable,
+)
+from src.modules.infrastructure.jobs.dto.job_dto import JobDto
+
+
+class CompleteNutritionalPlanJobDto(JobDto):
+    result: Optional[List[SimplifiedUserPreferencesTable]]
@@ -0,0 +1,37 @@
+from datetime import date, datetime
+from typing import List
+from uuid import UUID
+
+from pydantic import BaseModel, confloat, Extra
+
+from src.core.constants.default_values import MAXIMUM_SERVING_AMOUNT, MINIMUM_SERVING_AMOUNT
+
+
+class PreviewMealOptionDto(BaseModel):
+    item_id: UUID
+    amount: confloat(
+        ge=MINIMUM_SERVING_AMOUNT, le=MAXIMUM_SERVING_AMOUNT, multiple_of=MINIMUM_SERVING_AMOUNT
+    )
+
+    class Config:
+        extra = Extra.forbid
+
+
+class PreviewMealDto(BaseModel):
+    meal_date: date
+    meals_of_plan_id: UUID
+    options: List[PreviewMealOptionDto]
+
+    class Config:
+        extra = Extra.forbid
+
+
+class NutritionalPlanPreviewDto(BaseModel):
+    user_id: UUID
+    nutritional_plan_id: UUID
+    meals: List[PreviewMealDto]
+    issued_at: datetime
+    signature: str
+
+    class Config:
+        extra = Extra.forbid
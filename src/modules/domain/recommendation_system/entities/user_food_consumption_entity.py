@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import Column, Date, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.modules.infrastructure.database.base_entity import BaseEntity
+
+
+@dataclass
+class UserFoodConsumption(BaseEntity):
+    """
+    How many times a user consumed a food on a day, rolled up from the diary entries of the meals
+    of their nutritional plans.
+    """
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "consumed_on", "food_id", name="unique_user_food_consumption"),
+    )
+
+    user_id: UUID = Column(
+        UUID(as_uuid=True), ForeignKey("user.id", ondelete="CASCADE"), nullable=False
+    )
+    food_id: UUID = Column(
+        UUID(as_uuid=True), ForeignKey("food.id", ondelete="CASCADE"), nullable=False
+    )
+    consumed_on: Date = Column(Date, nullable=False)
+    amount: Integer = Column(Integer, nullable=False)
+
+    def __init__(
+        self, user_id: UUID, food_id: UUID, consumed_on: date, amount: Integer, *args, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.user_id = user_id
+        self.food_id = food_id
+        self.consumed_on = consumed_on
+        self.amount = amount
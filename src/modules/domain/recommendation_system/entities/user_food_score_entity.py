@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.modules.infrastructure.database.base_entity import BaseEntity
+
+
+@dataclass
+class UserFoodScore(BaseEntity):
+    """
+    The score of every food for a user, kept up to date as the specificities and the diary of the
+    user change. Their UserFoodScoreVersion tells which catalog and day they were computed on.
+    """
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "food_id", name="unique_user_food_score"),
+        Index("user_food_score_ranking", "user_id", "score", "food_id"),
+    )
+
+    user_id: UUID = Column(
+        UUID(as_uuid=True), ForeignKey("user.id", ondelete="CASCADE"), nullable=False
+    )
+    food_id: UUID = Column(
+        UUID(as_uuid=True), ForeignKey("food.id", ondelete="CASCADE"), nullable=False
+    )
+    preference_score: Integer = Column(Integer, nullable=False, default=0)
+    consumption_score: Integer = Column(Integer, nullable=False, default=0)
+    score: Integer = Column(Integer, nullable=False, default=0)
+
+    def __init__(
+        self,
+        user_id: UUID,
+        food_id: UUID,
+        preference_score: Integer,
+        consumption_score: Integer,
+        *args,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.user_id = user_id
+        self.food_id = food_id
+        self.preference_score = preference_score
+        self.consumption_score = consumption_score
+        self.score = preference_score + consumption_score
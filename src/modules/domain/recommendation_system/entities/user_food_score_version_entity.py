@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import Column, Date, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.modules.infrastructure.database.base_entity import BaseEntity
+
+
+@dataclass
+class UserFoodScoreVersion(BaseEntity):
+    """
+    Bumped whenever the food scores of the user change. `catalog_version` is the food catalog the
+    scores were computed on and `refreshed_on` the day of their consumption windows.
+    """
+
+    user_id: UUID = Column(
+        UUID(as_uuid=True),
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    version: Integer = Column(Integer, nullable=False, default=1)
+    catalog_version: String = Column(String(255), nullable=False)
+    refreshed_on: Date = Column(Date, nullable=False)
+
+    def __init__(
+        self, user_id: UUID, catalog_version: String(255), refreshed_on: date, *args, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.user_id = user_id
+        self.catalog_version = catalog_version
+        self.refreshed_on = refreshed_on
@@ -1,20 +1,23 @@
-from concurrent.futures import as_completed, ThreadPoolExecutor
-from datetime import date
+import hashlib
+import hmac
+import json
+from datetime import date, datetime, timedelta
 from math import ceil
 from random import randint
-from typing import Dict, List
+from typing import Callable, Dict, List, Set, Tuple
 from uuid import UUID
 
+import numpy as np
 import pandas as pd
 from sqlalchemy.orm import Session
 
-from src.core.constants.default_values import (
-    DEFAULT_AMOUNT_GRAMS,
-    MAXIMUM_SERVING_AMOUNT,
-    MINIMUM_SERVING_AMOUNT,
-)
-from src.core.types.exceptions_type import BadRequestException, NotFoundException
+from config import PREVIEW_EXPIRATION_MINUTES, TOKEN_SECRET_KEY
+from src.core.constants.default_values import MAXIMUM_SERVING_AMOUNT, MINIMUM_SERVING_AMOUNT
+from src.core.types.exceptions_type import BadRequestException
+from src.modules.domain.food.entities.food_entity import Food
 from src.modules.domain.item.entities.item_entity import Item
+from src.modules.domain.item.entities.item_has_food_entity import ItemHasFood
+from src.modules.domain.meal.entities.item_can_eat_at_entity import ItemCanEatAt
 from src.modules.domain.nutritional_plan.entities.nutritional_plan_entity import NutritionalPlan
 from src.modules.domain.nutritional_plan.interfaces.nutritional_plan_interface import (
     NutritionalPlanInterface,
@@ -27,16 +30,29 @@ from src.modules.domain.recommendation_system.dto.user_preferences_table_dto imp
     DetailedUserPreferencesTable,
 )
 from src.modules.domain.recommendation_system.interfaces.find_user_food_preferences_interface import (
+    all_foods_cache_key,
     FindUserFoodPreferencesInterface,
 )
 from src.modules.domain.recommendation_system.repositories.recommendation_system_repository import (
     RecommendationSystemRepository,
 )
+from src.modules.domain.recommendation_system.utils.item_catalog import (
+    ItemCatalog,
+    MAX_TYPES_OF_MEAL,
+)
 from src.modules.infrastructure.database.control_transaction import keep_nested_transaction
 
+item_catalog_cache = {}
+
+# the previews are signed with a key of their own, derived from the TOKEN_SECRET_KEY
+PREVIEW_KEY_CONTEXT = b"nutritional-plan-preview"
+
 
 class CompleteNutritionalPlanInterface:
-    def __init__(self):
+    def __init__(
+        self, preview_expiration: timedelta = timedelta(minutes=PREVIEW_EXPIRATION_MINUTES)
+    ):
+        self.preview_expiration = preview_expiration
         self.rs_repository = RecommendationSystemRepository()
         self.nutritional_plan_interface = NutritionalPlanInterface()
         self.find_user_food_preferences_interface = FindUserFoodPreferencesInterface()
@@ -51,13 +67,109 @@ class CompleteNutritionalPlanInterface:
         available: bool,
         force_reload: bool,
         db: Session,
+        set_progress: Callable[[float], None] = lambda progress: None,
     ) -> pd.DataFrame:
-        types_of_meal_plan = self.rs_repository.get_types_of_meal_plan(nutritional_plan_id, db)
-        if len(types_of_meal_plan) == 1 and types_of_meal_plan[0]["type_of_meal_id"] is None:
-            raise BadRequestException(
-                "It is necessary that the nutritional plan has marked which type of meals it has."
-            )
+        nutritional_plan, user_items_preference, meals = await self.__propose_meals(
+            user_id, nutritional_plan_id, available, force_reload, db, set_progress
+        )
+
+        await self.__save_meals(nutritional_plan.id, meals, db)
 
+        return user_items_preference.sort_values("score", ascending=False)
+
+    async def preview_nutritional_plan(
+        self,
+        user_id: str,
+        nutritional_plan_id: str,
+        available: bool,
+        force_reload: bool,
+        db: Session,
+    ) -> Tuple[List[dict], datetime, str]:
+        """
+        The meals `complete_nutritional_plan` would create, as {meal_date, meals_of_plan_id,
+        options: [{item_id, amount}]}, without writing them, when they were proposed and the
+        signature that lets them be applied
+        """
+        _, _, meals = await self.__propose_meals(
+            user_id, nutritional_plan_id, available, force_reload, db
+        )
+        issued_at = datetime.now().astimezone()
+        return meals, issued_at, self.__sign_preview(user_id, nutritional_plan_id, meals, issued_at)
+
+    async def apply_nutritional_plan_preview(
+        self,
+        user_id: str,
+        nutritional_plan_id: str,
+        meals: List[dict],
+        issued_at: datetime,
+        signature: str,
+        db: Session,
+    ) -> None:
+        """
+        Saves the meals of a preview exactly as they were proposed, as long as it did not expire
+        and they are still missing from the plan
+        """
+        if not hmac.compare_digest(
+            signature, self.__sign_preview(user_id, nutritional_plan_id, meals, issued_at)
+        ):
+            raise BadRequestException("The preview was changed after it was proposed.")
+        if datetime.now().astimezone() - issued_at > self.preview_expiration:
+            raise BadRequestException("The preview expired, propose the nutritional plan again.")
+
+        types_of_meal_plan = self.__get_types_of_meal_plan(nutritional_plan_id, db)
+        nutritional_plan = await self.nutritional_plan_interface.get_nutritional_plan(
+            nutritional_plan_id, db
+        )
+
+        date_list = self.__get_date_range(nutritional_plan)
+        meals_of_plan_ids = {meal["meals_of_plan_id"] for meal in types_of_meal_plan}
+        existing_meals = await self.__get_existing_meals(nutritional_plan, date_list, db)
+        item_index = self.__get_item_catalog(db).item_index
+
+        preview_meals = set()
+        for meal in meals:
+            key = (meal["meals_of_plan_id"], meal["meal_date"])
+            if meal["meals_of_plan_id"] not in meals_of_plan_ids:
+                raise BadRequestException(
+                    f'The meal "{meal["meals_of_plan_id"]}" is not part of the nutritional plan.'
+                )
+            if not date_list[0] <= meal["meal_date"] <= date_list[-1]:
+                raise BadRequestException(
+                    f'The date "{meal["meal_date"]}" is out of the nutritional plan.'
+                )
+            if key in existing_meals:
+                raise BadRequestException(
+                    f'The meal "{meal["meals_of_plan_id"]}" of "{meal["meal_date"]}" already '
+                    f"exists in the nutritional plan."
+                )
+            if key in preview_meals:
+                raise BadRequestException(
+                    f'The meal "{meal["meals_of_plan_id"]}" of "{meal["meal_date"]}" is repeated '
+                    f"in the preview."
+                )
+            preview_meals.add(key)
+
+            for option in meal["options"]:
+                if option["item_id"] not in item_index:
+                    raise BadRequestException(f'Could not find the item "{option["item_id"]}".')
+
+        await self.__save_meals(nutritional_plan.id, meals, db)
+
+    # ----------------- PRIVATE METHODS ----------------- #
+    async def __propose_meals(
+        self,
+        user_id: str,
+        nutritional_plan_id: str,
+        available: bool,
+        force_reload: bool,
+        db: Session,
+        set_progress: Callable[[float], None] = lambda progress: None,
+    ) -> Tuple[NutritionalPlan, pd.DataFrame, List[dict]]:
+        """
+        Every database read of a plan completion, and the meals missing from the plan with the
+        options suggested for each one, computed in memory
+        """
+        types_of_meal_plan = self.__get_types_of_meal_plan(nutritional_plan_id, db)
         nutritional_plan = await self.nutritional_plan_interface.get_nutritional_plan(
             nutritional_plan_id, db
         )
@@ -67,90 +179,97 @@ class CompleteNutritionalPlanInterface:
                 user_id, nutritional_plan_id, available, force_reload, db
             )
         )
+        set_progress(0.3)
 
-        allowed_food_ids = [food.id for food in user_food_preferences]
-        allowed_items = self.rs_repository.get_allowed_items(allowed_food_ids, db)
-        user_items_preference = self.__generate_item_table(user_food_preferences, allowed_items)
+        type_of_meal_ids = [
+            meal["type_of_meal_id"]
+            for meal in types_of_meal_plan
+            if meal["type_of_meal_id"] is not None
+        ]
+        if len(set(type_of_meal_ids)) > MAX_TYPES_OF_MEAL:
+            raise BadRequestException(
+                f"The nutritional plan can have at most {MAX_TYPES_OF_MEAL} types of meal."
+            )
+        type_of_meal_bits = ItemCatalog.type_of_meal_bits(type_of_meal_ids)
 
-        await self.__complete_nutritional_plan(
-            nutritional_plan, user_items_preference, types_of_meal_plan, db
+        user_items_preference = self.__generate_item_table(
+            user_food_preferences, type_of_meal_bits, db
         )
+        set_progress(0.5)
 
-        return user_items_preference.sort_values("score", ascending=False)
-
-    # ----------------- PRIVATE METHODS ----------------- #
-    @staticmethod
-    def __generate_item_table(
-        user_food_preferences: List[DetailedUserPreferencesTable], allowed_items: List[Item]
-    ) -> pd.DataFrame:
-        items_dataframe = pd.DataFrame.from_records([item.__dict__ for item in allowed_items])
-
-        new_columns = {
-            "score": 0,
-            "proteins": 0,
-            "lipids": 0,
-            "carbohydrates": 0,
-            "energy_value": 0,
-            "can_eat_at": [[] for _ in range(len(items_dataframe))],
-        }
-        items_dataframe = items_dataframe.assign(**new_columns)
-
-        food_preferences_dictionary = {
-            food.id: pd.DataFrame.from_records([food.__dict__]) for food in user_food_preferences
-        }
-
-        with ThreadPoolExecutor() as executor:
-            futures = []
-
-            for current_item in allowed_items:
-                submitted_future = executor.submit(
-                    CompleteNutritionalPlanInterface.__set_item_data,
-                    current_item,
-                    items_dataframe,
-                    food_preferences_dictionary,
-                )
-                futures.append(submitted_future)
-
-            for future in as_completed(futures):
-                # If the __set_item_data method raises an exception, it will be raised here
-                pass
+        meals = await self.__suggest_missing_meals(
+            nutritional_plan, user_items_preference, types_of_meal_plan, type_of_meal_bits, db
+        )
 
-        return items_dataframe
+        return nutritional_plan, user_items_preference, meals
 
-    @staticmethod
-    def __set_item_data(
-        current_item: Item,
-        items_dataframe: pd.DataFrame,
-        food_preferences_dictionary: Dict[UUID, pd.DataFrame],
-    ) -> None:
-        item_dataframe = items_dataframe[items_dataframe.id == current_item.id]
+    def __get_types_of_meal_plan(self, nutritional_plan_id: str, db: Session) -> List[dict]:
+        types_of_meal_plan = self.rs_repository.get_types_of_meal_plan(nutritional_plan_id, db)
+        if len(types_of_meal_plan) == 1 and types_of_meal_plan[0]["type_of_meal_id"] is None:
+            raise BadRequestException(
+                "It is necessary that the nutritional plan has marked which type of meals it has."
+            )
 
-        # Update can_eat_at values
-        can_eat_at_values = [can_eat_at.type_of_meal_id for can_eat_at in current_item.can_eat_at]
-        items_dataframe.at[item_dataframe.index[0], "can_eat_at"] = can_eat_at_values
+        return types_of_meal_plan
 
-        for item_has_food in current_item.foods:
-            food_id = item_has_food.food_id
-            food_preferences = food_preferences_dictionary[food_id]
-            amount_multiplier = item_has_food.amount_grams / DEFAULT_AMOUNT_GRAMS
+    def __generate_item_table(
+        self,
+        user_food_preferences: List[DetailedUserPreferencesTable],
+        type_of_meal_bits: Dict[UUID, int],
+        db: Session,
+    ) -> pd.DataFrame:
+        """
+        The items made only of the given foods, with their score, nutrients and the bitmask of the
+        types of meal they can be eaten at
+        """
+        item_catalog = self.__get_item_catalog(db)
+        food_ids = [food.id for food in user_food_preferences]
+
+        rows = item_catalog.allowed_rows(food_ids)
+        item_ids = [item_catalog.item_ids[row] for row in rows]
+
+        def item_values(field: str, weighted: bool = True) -> np.ndarray:
+            food_vector = item_catalog.item_food_matrix.food_vector(
+                food_ids, [getattr(food, field) for food in user_food_preferences]
+            )
+            return item_catalog.item_food_matrix.multiply(item_ids, food_vector, weighted)
+
+        return pd.DataFrame(
+            {
+                "id": item_ids,
+                "description": item_catalog.descriptions[rows],
+                "score": item_values("score", weighted=False).astype(np.int64),
+                "proteins": item_values("proteins"),
+                "lipids": item_values("lipids"),
+                "carbohydrates": item_values("carbohydrates"),
+                "energy_value": item_values("energy_value"),
+                "can_eat_at": item_catalog.can_eat_at_masks(rows, type_of_meal_bits),
+            }
+        )
 
-            # Add food score to item score
-            items_dataframe.loc[item_dataframe.index, "score"] += food_preferences["score"].values
+    def __get_item_catalog(self, db: Session) -> ItemCatalog:
+        """The catalog is rebuilt only when an item, the meals or the foods of an item change"""
+        version = self.rs_repository.get_catalog_version(db, Item, ItemCanEatAt, ItemHasFood, Food)
 
-            # Add nutrient values to item nutrient values
-            nutrient_columns = ["proteins", "lipids", "carbohydrates", "energy_value"]
-            nutrient_values = (
-                food_preferences[nutrient_columns].astype(float).values * amount_multiplier
+        item_catalog = item_catalog_cache.get(all_foods_cache_key(db))
+        if item_catalog is None or item_catalog.version != version:
+            item_catalog = ItemCatalog(
+                version,
+                self.rs_repository.get_items_can_eat_at(db),
+                self.rs_repository.get_item_has_foods(db),
             )
-            items_dataframe.loc[item_dataframe.index, nutrient_columns] += nutrient_values
+            item_catalog_cache[all_foods_cache_key(db)] = item_catalog
+
+        return item_catalog
 
-    async def __complete_nutritional_plan(
+    async def __suggest_missing_meals(
         self,
         nutritional_plan: NutritionalPlan,
         user_item_preference: pd.DataFrame,
         meal_plan: List[dict],
+        type_of_meal_bits: Dict[UUID, int],
         db: Session,
-    ) -> None:
+    ) -> List[dict]:
         nutrients = ["proteins", "lipids", "carbohydrates", "calories"]
 
         date_list = self.__get_date_range(nutritional_plan)
@@ -159,31 +278,106 @@ class CompleteNutritionalPlanInterface:
             nutritional_plan, adapted_meal_plan, nutrients
         )
 
+        existing_meals = await self.__get_existing_meals(nutritional_plan, date_list, db)
+
+        missing_meals = []
         for meal in adapted_meal_plan:
-            meal_items = self.__get_items_by_type_of_meal(meal, user_item_preference)
+            meal_items = self.__get_items_by_type_of_meal(
+                type_of_meal_bits.get(meal["type_of_meal_id"], 0), user_item_preference
+            )
 
             maximum_calories_in_meal = self.__get_maximum_calories_in_meal(
                 maximum_calories_per_day, meal, nutrients
             )
+            meal_items = meal_items.assign(
+                amount=self.__find_ideal_quantities(meal_items, maximum_calories_in_meal)
+            ).sort_values("score", ascending=False)
+
             for meal_date in date_list:
-                try:
-                    await self.nphm_interface.get_nutritional_plan_has_meal_by_date(
-                        meal_date, nutritional_plan.id, meal["meals_of_plan_id"], db
+                if (meal["meals_of_plan_id"], meal_date) not in existing_meals:
+                    missing_meals.append(
+                        {
+                            "meal_date": meal_date,
+                            "meals_of_plan_id": meal["meals_of_plan_id"],
+                            "options": self.__suggest_meals(meal_items),
+                        }
                     )
-                except NotFoundException:
-                    with keep_nested_transaction(db):
-                        new_nphm = await self.nphm_interface.create_nutritional_plan_has_meal(
-                            meal_date, nutritional_plan.id, meal["meals_of_plan_id"], db
-                        )
-                        await self.__suggest_meals(
-                            new_nphm.id, meal_items, maximum_calories_in_meal, db
-                        )
-                    db.commit()
+
+        return missing_meals
+
+    async def __get_existing_meals(
+        self, nutritional_plan: NutritionalPlan, date_list: List[date], db: Session
+    ) -> Set[Tuple[UUID, date]]:
+        return {
+            (nphm.meals_of_plan, nphm.meal_date)
+            for nphm in await self.nphm_interface.get_nutritional_plan_has_meals_by_date_range(
+                date_list[0], date_list[-1], nutritional_plan.id, db
+            )
+        }
+
+    async def __save_meals(self, nutritional_plan_id: UUID, meals: List[dict], db: Session) -> None:
+        if not meals:
+            return
+
+        # Every missing meal and its options are written with a few multi-row inserts, all of them
+        # committed together
+        with keep_nested_transaction(db):
+            new_nphms = await self.nphm_interface.create_nutritional_plan_has_meals(
+                meals, nutritional_plan_id, db
+            )
+            new_nphm_ids = {(nphm.meals_of_plan, nphm.meal_date): nphm.id for nphm in new_nphms}
+
+            await self.meals_options_interface.create_meals_options(
+                [
+                    {
+                        "amount": option["amount"],
+                        "suggested_by_system": True,
+                        "item_id": option["item_id"],
+                        "nutritional_plan_has_meal_id": new_nphm_ids[
+                            (meal["meals_of_plan_id"], meal["meal_date"])
+                        ],
+                    }
+                    for meal in meals
+                    for option in meal["options"]
+                ],
+                None,
+                db,
+            )
+        db.commit()
+
+    @staticmethod
+    def __sign_preview(
+        user_id: str, nutritional_plan_id: str, meals: List[dict], issued_at: datetime
+    ) -> str:
+        preview = json.dumps(
+            {
+                "user_id": str(user_id),
+                "nutritional_plan_id": str(nutritional_plan_id),
+                "issued_at": issued_at.isoformat(),
+                "meals": [
+                    {
+                        "meal_date": meal["meal_date"].isoformat(),
+                        "meals_of_plan_id": str(meal["meals_of_plan_id"]),
+                        "options": [
+                            {"item_id": str(option["item_id"]), "amount": float(option["amount"])}
+                            for option in meal["options"]
+                        ],
+                    }
+                    for meal in meals
+                ],
+            },
+            sort_keys=True,
+        )
+        key = hmac.new(TOKEN_SECRET_KEY.encode(), PREVIEW_KEY_CONTEXT, hashlib.sha256).digest()
+        return hmac.new(key, preview.encode(), hashlib.sha256).hexdigest()
 
     @staticmethod
     def __get_date_range(nutritional_plan: NutritionalPlan) -> List[date]:
         first_date = min(meal.meal_date for meal in nutritional_plan.nutritional_plan_meals)
-        return pd.date_range(start=first_date, end=nutritional_plan.validate_date).tolist()
+        return [
+            timestamp.date()
+            for timestamp in pd.date_range(start=first_date, end=nutritional_plan.validate_date)
+        ]
 
     @staticmethod
     def __adapt_nutritional_values(types_of_meal_plan: List[dict]) -> List[dict]:
@@ -219,20 +413,14 @@ class CompleteNutritionalPlanInterface:
 
     @staticmethod
     def __get_items_by_type_of_meal(
-        meal_of_plan: dict, user_item_preference: pd.DataFrame
+        type_of_meal_bit: int, user_item_preference: pd.DataFrame
     ) -> pd.DataFrame:
-        return user_item_preference[
-            user_item_preference["can_eat_at"].apply(lambda x: meal_of_plan["type_of_meal_id"] in x)
-        ]
+        can_eat_at = user_item_preference["can_eat_at"].to_numpy(dtype=np.uint64)
+        return user_item_preference[(can_eat_at & np.uint64(type_of_meal_bit)) != 0]
 
-    async def __suggest_meals(
-        self,
-        nphm_id: UUID,
-        meal_items: pd.DataFrame,
-        maximum_calories_in_meal: dict,
-        db: Session,
-    ) -> None:
-        meal_items = meal_items.sort_values("score", ascending=False)
+    @staticmethod
+    def __suggest_meals(meal_items: pd.DataFrame) -> List[dict]:
+        """`meal_items` sorted by score, with the ideal amount of each item"""
         size = len(meal_items)
 
         splitted_meals = [
@@ -241,18 +429,16 @@ class CompleteNutritionalPlanInterface:
             meal_items[ceil(size * 0.3) : ceil(size * 0.6)],
         ]
 
+        meals_options = []
         for splitted_item in splitted_meals:
             if not len(splitted_item):
                 continue
 
             index = randint(0, len(splitted_item) - 1)
             item = splitted_item.iloc[index]
-            amount = CompleteNutritionalPlanInterface.__find_ideal_quantity(
-                item, maximum_calories_in_meal
-            )
-            await self.meals_options_interface.create_meal_option(
-                amount, True, item["id"], nphm_id, db
-            )
+            meals_options.append({"item_id": item["id"], "amount": float(item["amount"])})
+
+        return meals_options
 
     @staticmethod
     def __get_maximum_calories_in_meal(
@@ -274,37 +460,31 @@ class CompleteNutritionalPlanInterface:
         return maximum_calories_in_meal
 
     @staticmethod
-    def __find_ideal_quantity(item: pd.Series, meal: dict) -> float:
-        # Set initial value and adjustment factor
-        quantity, step = MAXIMUM_SERVING_AMOUNT, MINIMUM_SERVING_AMOUNT
-
-        while True:
-            # Calculates the amount of nutrients for the current quantity
-            proteins, lipids, carbohydrates, energy = (
-                item["proteins"] * quantity,
-                item["lipids"] * quantity,
-                item["carbohydrates"] * quantity,
-                item["energy_value"] * quantity,
-            )
+    def __find_ideal_quantities(meal_items: pd.DataFrame, meal: dict) -> np.ndarray:
+        """
+        The largest multiple of MINIMUM_SERVING_AMOUNT, up to MAXIMUM_SERVING_AMOUNT, whose nutrients
+        are within the limits of the meal, for every item at once. Items that fit in no quantity get
+        MINIMUM_SERVING_AMOUNT.
+        """
+        nutrients = meal_items[["proteins", "lipids", "carbohydrates", "energy_value"]].to_numpy(
+            dtype=np.float64
+        )
+        limits = np.array(
+            [
+                meal["proteins_limit"],
+                meal["lipids_limit"],
+                meal["carbohydrates_limit"],
+                meal["calories_limit"],
+            ],
+            dtype=np.float64,
+        )
 
-            # Checks that the nutrients are within the allowed limits
-            if (
-                proteins <= meal["proteins_limit"]
-                and lipids <= meal["lipids_limit"]
-                and carbohydrates <= meal["carbohydrates_limit"]
-                and energy <= meal["calories_limit"]
-            ):
-                return quantity
-
-            # If they aren't, adjust the quantity to approach the limit
-            if (
-                proteins > meal["proteins_limit"]
-                or lipids > meal["lipids_limit"]
-                or carbohydrates > meal["carbohydrates_limit"]
-                or energy > meal["calories_limit"]
-            ):
-                quantity -= step
-
-            # Checks that the quantity is within limits
-            if quantity < MINIMUM_SERVING_AMOUNT:
-                return MINIMUM_SERVING_AMOUNT
+        # the quantity each nutrient allows, a nutrient the item does not have allows any quantity
+        allowed_quantities = np.divide(
+            limits, nutrients, out=np.full_like(nutrients, np.inf), where=nutrients > 0
+        ).min(axis=1)
+        return np.clip(
+            np.floor(allowed_quantities / MINIMUM_SERVING_AMOUNT) * MINIMUM_SERVING_AMOUNT,
+            MINIMUM_SERVING_AMOUNT,
+            MAXIMUM_SERVING_AMOUNT,
+        )
@@ -1,29 +1,36 @@
-from math import floor
-from typing import List, Tuple
+import os
+from typing import Any, Hashable, List, Tuple
 from uuid import UUID
 
-import pandas as pd
-from cachetools import TTLCache
+import numpy as np
+from cachetools import LRUCache
 from sqlalchemy.orm import Session
 
-from src.core.constants.enum.specificity_type import SpecificityTypes
-from src.modules.domain.food.dto.food.food_dto import FoodDto
-from src.modules.domain.food.entities.food_category_entity import FoodCategory
-from src.modules.domain.food.entities.food_entity import Food
-from src.modules.domain.food.interfaces.food_category_interface import FoodCategoryInterface
-from src.modules.domain.food.interfaces.food_interface import FoodInterface
+from config import FOOD_CATALOG_SNAPSHOT_DIR
 from src.modules.domain.nutritional_plan.interfaces.nutritional_plan_interface import (
     NutritionalPlanInterface,
 )
 from src.modules.domain.recommendation_system.dto.user_preferences_table_dto import (
     DetailedUserPreferencesTable,
 )
+from src.modules.domain.recommendation_system.interfaces.user_food_score_interface import (
+    UserFoodScoreInterface,
+)
 from src.modules.domain.recommendation_system.repositories.recommendation_system_repository import (
     RecommendationSystemRepository,
 )
+from src.modules.domain.recommendation_system.utils.food_catalog_snapshot import (
+    FoodCatalogSnapshot,
+    FoodCatalogSnapshotStore,
+)
+from src.modules.domain.recommendation_system.utils.food_preference_ranking import (
+    FoodPreferenceRanking,
+)
+from src.modules.domain.recommendation_system.utils.food_scoring_engine import FoodScoringEngine
 
-all_food_cache = TTLCache(maxsize=1, ttl=60 * 60)
-user_food_preference_cache = TTLCache(maxsize=100, ttl=60 * 60)
+food_catalog_snapshot_stores = {}
+user_food_preference_cache = LRUCache(maxsize=100)
+user_cant_consume_food_cache = LRUCache(maxsize=100)
 
 
 def all_foods_cache_key(db: Session):
@@ -33,15 +40,8 @@ def all_foods_cache_key(db: Session):
 class FindUserFoodPreferencesInterface:
     def __init__(self):
         self.rs_repository = RecommendationSystemRepository()
-        self.food_interface = FoodInterface()
         self.nutritional_plan_interface = NutritionalPlanInterface()
-        self.food_category_interface = FoodCategoryInterface()
-
-        self.PERIOD_TO_FATIGUE_DAYS = 30
-        self.PERIOD_TO_ANALYZE_DAYS = 100
-        self.AMOUNT_TO_FATIGUE = 45
-        self.PERCENTAGE_NEAR_FATIGUE = 0.9
-        self.PERCENTAGE_FOR_IDENTIFICATION = 0.15
+        self.user_food_score_interface = UserFoodScoreInterface()
 
     # ----------------- PUBLIC METHODS ----------------- #
     async def get_user_food_preferences(
@@ -51,175 +51,94 @@ class FindUserFoodPreferencesInterface:
         available: bool,
         force_reload: bool,
         db: Session,
+        limit: int = None,
+        offset: int = 0,
+        min_score: int = None,
     ) -> List[DetailedUserPreferencesTable]:
-        all_foods = await self.__get_all_foods(db, force_reload)
+        """
+        The foods from the highest score to the lowest, only the ones scored `min_score` or more
+        and, with `limit`, only a page of them starting at `offset`.
+        """
+        engine = self.user_food_score_interface.get_scoring_engine(db)
+        user_version = self.user_food_score_interface.get_user_food_score_version(
+            user_id, db, engine
+        )
 
-        user_food_preference = await self.__generate_food_preference_ranking(user_id, all_foods, db)
+        ranking = self.__get_food_preference_ranking(
+            user_id, engine, (str(user_id), engine.version, user_version), force_reload, db
+        )
 
+        cant_consume = None
         if available:
-            cant_consume_foods = self.rs_repository.get_user_cant_consume_food_ids(
-                user_id, nutritional_plan_id, db
+            cant_consume_food_ids = self.__get_user_cant_consume_food_ids(
+                user_id, nutritional_plan_id, user_version, db
             )
+            cant_consume = ranking.food_catalog.mask(cant_consume_food_ids)
 
-            for food in cant_consume_foods:
-                user_food_preference = [
-                    item for item in user_food_preference if item.id != food["food_id"]
-                ]
-
-        return user_food_preference
+        positions = ranking.select(cant_consume, min_score, offset, limit)
+        # the whole ranking is built once and kept for the next unpaginated requests
+        return ranking.foods(positions, build_all=limit is None)
 
     # ----------------- PRIVATE METHODS ----------------- #
-    async def __get_all_foods(self, db: Session, force_reload: bool = False):
-        if force_reload or all_foods_cache_key(db) not in all_food_cache:
-            all_foods = await self.food_interface.get_all_food(db)
-            all_food_cache[all_foods_cache_key(db)] = all_foods
-            return all_foods
-        else:
-            return all_food_cache[all_foods_cache_key(db)]
-
-    async def __generate_food_preference_ranking(
-        self, user_id: str, all_foods: List[FoodDto], db_session: Session
-    ) -> List[DetailedUserPreferencesTable]:
-        all_food_categories = pd.DataFrame.from_records(
-            [
-                food_category.__dict__
-                for food_category in (
-                    await self.food_category_interface.get_all_food_categories(db_session)
-                )
-            ]
-        )
-        user_preferences = self.rs_repository.get_user_food_preferences(user_id, db_session)
+    def __get_food_catalog(
+        self, db: Session, catalog_version: Hashable, force_reload: bool = False
+    ) -> FoodCatalogSnapshot:
+        """The catalog mapped from the snapshot shared by the processes of the host"""
+        store = food_catalog_snapshot_stores.get(all_foods_cache_key(db))
+        if store is None:
+            store = FoodCatalogSnapshotStore(
+                os.path.join(FOOD_CATALOG_SNAPSHOT_DIR, all_foods_cache_key(db))
+            )
+            food_catalog_snapshot_stores[all_foods_cache_key(db)] = store
 
-        fatigued_food = self.rs_repository.get_fatigued_food_from_user(
-            db_session, user_id, self.PERIOD_TO_FATIGUE_DAYS, self.AMOUNT_TO_FATIGUE
-        )
-        user_consumption = self.rs_repository.get_user_consumption_last_days(
-            db_session, user_id, fatigued_food, self.PERIOD_TO_ANALYZE_DAYS
+        return store.get(
+            catalog_version, lambda: self.rs_repository.get_food_catalog(db), force_reload
         )
 
-        hashable_key = (
-            tuple(all_foods),
-            tuple(all_food_categories),
-            tuple(user_preferences),
-            tuple(fatigued_food),
-            tuple(user_consumption),
+    def __get_user_cant_consume_food_ids(
+        self, user_id: str, nutritional_plan_id: str, user_version: int, db: Session
+    ) -> Tuple[UUID, ...]:
+        """
+        Cached by (user id, plan id, user version, forbidden foods version): the specificities of
+        the user bump the user version and every forbidden food write bumps their table version.
+        """
+        cache_key = (
+            str(user_id),
+            str(nutritional_plan_id),
+            user_version,
+            self.rs_repository.get_forbidden_foods_version(db),
         )
-        if user_food_preference_cache.get(hashable_key):
-            return user_food_preference_cache[hashable_key]
-
-        food_data = pd.DataFrame.from_records([food.dict() for food in all_foods])
-        food_data["score"] = 0
-
-        for index, food_preference in user_preferences.iterrows():
-            current_food = food_data.loc[food_data["id"] == food_preference["food_id"]]
-            current_category = all_food_categories.loc[
-                all_food_categories["id"] == current_food["food_category"].iloc[0]
-            ]
-
-            root_category = self.__get_root_category(current_category)
-            foods_to_grade = FoodCategoryInterface.get_all_foods_from_category(root_category)
-            self.__award_score_by_preference(
-                food_preference, food_data, current_food, current_category, foods_to_grade
+        if cache_key not in user_cant_consume_food_cache:
+            user_cant_consume_food_cache[cache_key] = tuple(
+                self.rs_repository.get_user_cant_consume_food_ids(user_id, nutritional_plan_id, db)
             )
 
-        self.__award_score_by_consumption(food_data, fatigued_food, user_consumption)
-
-        food_data.sort_values("score", ascending=False, inplace=True)
-        result = [DetailedUserPreferencesTable(**food) for food in food_data.to_dict("records")]
-
-        user_food_preference_cache[hashable_key] = result
-        return result
+        return user_cant_consume_food_cache[cache_key]
 
-    @staticmethod
-    def __get_root_category(food_category: pd.DataFrame) -> FoodCategory:
-        root_category = food_category["parent"].iloc[0]
-        while root_category is not None:
-            root_category = root_category.parent
-            if root_category.parent is None:
-                break
-
-        return root_category
-
-    def __award_score_by_preference(
+    def __get_food_preference_ranking(
         self,
-        food_preference: pd.Series,
-        foods_data_df: pd.DataFrame,
-        food: pd.DataFrame,
-        food_category: pd.DataFrame,
-        foods_to_grade: List[Food],
-    ) -> None:
-        specificity_likes = (
-            food_preference["specificity_type_description"]
-            in SpecificityTypes.specificity_likes_consume()
-        )
-        specificity_doesnt_like = (
-            food_preference["specificity_type_description"]
-            in SpecificityTypes.specificity_doesnt_like_consume()
+        user_id: str,
+        engine: FoodScoringEngine,
+        cache_key: Any,
+        force_reload: bool,
+        db_session: Session,
+    ) -> FoodPreferenceRanking:
+        """
+        Cached by (user id, catalog version, user version), both versions bumped on every change
+        the ranking depends on, so a cached ranking is never stale.
+        """
+        if not force_reload and cache_key in user_food_preference_cache:
+            return user_food_preference_cache[cache_key]
+
+        food_catalog = self.__get_food_catalog(db_session, engine.version, force_reload)
+        food_scores = self.user_food_score_interface.get_user_food_scores(
+            user_id, db_session, engine, force_reload
         )
 
-        if specificity_likes:
-            self.__define_score_by_preference_type(
-                foods_data_df, food, food_category, foods_to_grade
-            )
-        elif specificity_doesnt_like:
-            self.__define_score_by_preference_type(
-                foods_data_df, food, food_category, foods_to_grade, False
-            )
-
-    @staticmethod
-    def __define_score_by_preference_type(
-        foods_dt: pd.DataFrame,
-        food: pd.DataFrame,
-        food_category: pd.DataFrame,
-        foods_to_grade: List[Food],
-        positive: bool = True,
-    ) -> None:
-        for food_to_grade in foods_to_grade:
-            if food_to_grade.id == food["id"].iloc[0]:
-                score = 50
-            elif food_to_grade.food_category_id == food_category["id"].iloc[0]:
-                score = 25
-            elif food_to_grade.food_category.parent.id == food_category["parent"].iloc[0].id:
-                score = 12
-            else:
-                score = 7
-
-            if not positive:
-                score *= -1
-
-            foods_dt = FindUserFoodPreferencesInterface.__award_score(
-                foods_dt, food_to_grade.id, score
-            )
-
-    def __award_score_by_consumption(
-        self,
-        foods_dt: pd.DataFrame,
-        fatigued_food: List[UUID],
-        user_consumption: List[Tuple[UUID, int]],
-    ) -> None:
-        for food_id in fatigued_food:
-            foods_dt = FindUserFoodPreferencesInterface.__award_score(foods_dt, food_id, -100)
-
-        for food_id, food_amount in user_consumption:
-            """It sets the score based on the amount consumed, if it's close to the amount of fatigue it receives
-            fewer points to discourage its recommendation.
-                If it's a little above the defined minimum amount it's understood that the user has some degree of
-            identification with that food.
-                And finally if it's below the minimum amount it's not possible to assume whether the user likes it
-            or not, so a lower score is assigned. Lower than the balance point but higher than that of the foods
-            close to fatigue, the intention is that this food is recommended to find out in the future whether the
-            user likes it or not."""
-            score = (
-                10
-                if food_amount >= floor(self.AMOUNT_TO_FATIGUE * self.PERCENTAGE_NEAR_FATIGUE)
-                else 30
-                if food_amount >= floor(self.AMOUNT_TO_FATIGUE * self.PERCENTAGE_FOR_IDENTIFICATION)
-                else 20
-            )
-
-            foods_dt = FindUserFoodPreferencesInterface.__award_score(foods_dt, food_id, score)
+        rows = food_catalog.rows(food_id for food_id, _ in food_scores)
+        scores = np.array([score for _, score in food_scores], dtype=np.int64)
+        in_catalog = rows >= 0
 
-    @staticmethod
-    def __award_score(foods_dt: pd.DataFrame, food_id: UUID, score: int) -> pd.DataFrame:
-        foods_dt.loc[foods_dt["id"] == food_id, "score"] += score
-        return foods_dt
+        ranking = FoodPreferenceRanking(food_catalog, rows[in_catalog], scores[in_catalog])
+        user_food_preference_cache[cache_key] = ranking
+        return ranking
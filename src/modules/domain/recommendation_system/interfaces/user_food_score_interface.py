@@ -0,0 +1,465 @@
+from datetime import date, timedelta
+from math import floor
+from typing import Any, Hashable, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from cachetools import LRUCache
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from src.core.constants.enum.specificity_type import SpecificityTypes
+from src.modules.domain.diary.entities.diary_entity import Diary
+from src.modules.domain.food.entities.food_category_entity import FoodCategory
+from src.modules.domain.food.entities.food_entity import Food
+from src.modules.domain.recommendation_system.repositories.recommendation_system_repository import (
+    RecommendationSystemRepository,
+)
+from src.modules.domain.recommendation_system.repositories.user_food_consumption_repository import (
+    UserFoodConsumptionRepository,
+)
+from src.modules.domain.recommendation_system.repositories.user_food_score_repository import (
+    UserFoodScoreRepository,
+)
+from src.modules.domain.recommendation_system.utils.food_category_index import (
+    FoodCategoryIndex,
+)
+from src.modules.domain.recommendation_system.utils.food_scoring_engine import FoodScoringEngine
+from src.modules.domain.specificity.entities.specificity_entity import Specificity
+from src.modules.infrastructure.database.repository_methods.soft_delete_cascade import (
+    SoftDeleteCascade,
+)
+
+food_scoring_engine_cache = LRUCache(maxsize=10)
+
+
+def scoring_engine_cache_key(db: Session) -> str:
+    return f"food_scoring_engine_{db.get_bind().url.database}_{db.get_bind().dialect.name}"
+
+
+class UserFoodScoreInterface:
+    """
+    The food scores of every user, stored in the user_food_score table with their version in
+    user_food_score_version. Creating or deleting a specificity adds its score to the foods around
+    it and a diary entry rolls up the consumption of its day again, in the user_food_consumption
+    table, and recomputes the consumption score of the foods of its item, both in the transaction
+    of the change. Only these deltas are applied there, with the cached scoring engine the scores
+    were computed on: when the scores are missing or stale, or that engine is not cached, the
+    change only marks them stale. The scores of a user are computed again from scratch by the
+    refresh script, once a day as the consumption windows move and after the food catalog changes.
+    Every change bumps the version of the user, which keys the rankings cached from the scores.
+
+    Reading the scores never writes them: the stored scores are a single indexed read, and the
+    missing or stale ones are computed in memory until they are refreshed.
+
+    The specificities and diary entries soft deleted by a cascade are reported by the cascade
+    itself. Only the ones written with raw SQL are left for the next refresh from the diary, by
+    the refresh script.
+    """
+
+    def __init__(self):
+        self.rs_repository = RecommendationSystemRepository()
+        self.user_food_score_repository = UserFoodScoreRepository()
+        self.user_food_consumption_repository = UserFoodConsumptionRepository()
+
+        self.PERIOD_TO_FATIGUE_DAYS = 30
+        self.PERIOD_TO_ANALYZE_DAYS = 100
+        self.AMOUNT_TO_FATIGUE = 45
+        self.PERCENTAGE_NEAR_FATIGUE = 0.9
+        self.PERCENTAGE_FOR_IDENTIFICATION = 0.15
+
+    # ----------------- PUBLIC METHODS ----------------- #
+    def get_user_food_score_version(
+        self, user_id: str, db: Session, engine: FoodScoringEngine = None
+    ) -> Hashable:
+        """
+        The version of the scores of the user, bumped on every change of the stored scores, so it
+        can key anything built from them together with the catalog version. The scores computed in
+        memory, while the stored ones are missing or stale, are keyed by the day as well.
+        """
+        engine = engine or self.get_scoring_engine(db)
+
+        version = self.user_food_score_repository.get_user_food_score_version(user_id, db)
+        if self.__is_current(version, engine):
+            return version.version
+
+        return version.version if version else 0, date.today()
+
+    def get_user_food_scores(
+        self,
+        user_id: str,
+        db: Session,
+        engine: FoodScoringEngine = None,
+        force_refresh: bool = False,
+    ) -> List[Tuple[UUID, int]]:
+        """
+        The (food id, score) pairs of the user, from the highest score to the lowest. The stored
+        ones unless they are missing or stale, or with `force_refresh`: then they are computed from
+        the specificities and the diary of the user, without being stored.
+        """
+        engine = engine or self.get_scoring_engine(db)
+
+        version = self.user_food_score_repository.get_user_food_score_version(user_id, db)
+        if not force_refresh and self.__is_current(version, engine):
+            scores = self.user_food_score_repository.get_user_food_scores(user_id, db)
+            return [(score.food_id, score.score) for score in scores]
+
+        preference_scores, consumption_scores = self.__compute_user_food_scores(
+            user_id, db, engine, from_diary=True
+        )
+        # the order of the (user_id, score, food_id) index of the stored scores
+        return sorted(
+            zip(engine.food_ids, (preference_scores + consumption_scores).tolist()),
+            key=lambda food_score: (food_score[1], food_score[0]),
+            reverse=True,
+        )
+
+    def refresh_user_food_scores(
+        self,
+        user_id: str,
+        db: Session,
+        engine: FoodScoringEngine = None,
+        rollup_consumption: bool = False,
+    ) -> int:
+        """
+        Compute every score of the user again, store them and return their new version. With
+        `rollup_consumption` the daily consumption of the user is counted again from the diary
+        first, picking up the diary changes made outside the ORM.
+        """
+        version = self.__save_user_food_scores(user_id, db, engine, rollup_consumption)
+        if not db.transaction.nested:
+            db.commit()
+
+        return version
+
+    def refresh_stale_user_food_scores(self, db: Session) -> int:
+        """
+        Refresh the users not scored yet, or scored on an older catalog or on a previous day, from
+        their diary
+        """
+        engine = self.get_scoring_engine(db)
+        user_ids = self.user_food_score_repository.get_stale_user_ids(
+            self.__catalog_version(engine.version), date.today(), db
+        )
+
+        for user_id in user_ids:
+            self.refresh_user_food_scores(user_id, db, engine, rollup_consumption=True)
+
+        return len(user_ids)
+
+    def get_scoring_engine(self, db: Session) -> FoodScoringEngine:
+        """The engine is rebuilt only when a food or a food category changes"""
+        version = self.rs_repository.get_catalog_version(db, FoodCategory, Food)
+
+        engine = food_scoring_engine_cache.get(scoring_engine_cache_key(db))
+        if engine is None or engine.version != version:
+            categories, foods = self.rs_repository.get_food_category_tree(db)
+            engine = FoodScoringEngine(foods, FoodCategoryIndex(version, categories, foods))
+            food_scoring_engine_cache[scoring_engine_cache_key(db)] = engine
+
+        return engine
+
+    def apply_specificity_changes(
+        self, specificities: List[Tuple[UUID, UUID, UUID, int]], db: Session
+    ) -> None:
+        """
+        `specificities` are (user id, food id, specificity type id, sign) tuples, with sign 1 for a
+        new specificity and -1 for a deleted one.
+        """
+        descriptions = None
+
+        for user_id in {user_id for user_id, _, _, _ in specificities}:
+            engine = self.__get_updatable_scoring_engine(user_id, db)
+            if engine is None:
+                continue
+
+            if descriptions is None:
+                descriptions = self.rs_repository.get_specificity_type_descriptions(
+                    list({specificity_type_id for _, _, specificity_type_id, _ in specificities}),
+                    db,
+                )
+
+            user_specificities = [
+                (food_id, sign * self.get_preference_sign(descriptions.get(specificity_type_id)))
+                for specificity_user_id, food_id, specificity_type_id, sign in specificities
+                if specificity_user_id == user_id
+            ]
+
+            added_scores = engine.new_scores()
+            engine.award_preferences(added_scores, *zip(*user_specificities))
+
+            rows = np.flatnonzero(added_scores)
+            self.user_food_score_repository.add_preference_scores(
+                user_id,
+                [(engine.food_ids[row], added_scores[row]) for row in rows],
+                db,
+            )
+
+    def apply_diary_changes(self, diary_meals: List[Tuple[UUID, UUID]], db: Session) -> None:
+        """`diary_meals` are the (nutritional plan has meal id, item id) of the changed entries"""
+        consumed_foods = self.rs_repository.get_diary_consumed_foods(diary_meals, db)
+        since = self.__days_ago(self.PERIOD_TO_ANALYZE_DAYS)
+
+        for user_id in {user_id for user_id, _, _ in consumed_foods}:
+            days = list(
+                {
+                    meal_date
+                    for food_user_id, meal_date, _ in consumed_foods
+                    if food_user_id == user_id and meal_date >= since
+                }
+            )
+            if not days:
+                continue
+
+            self.user_food_consumption_repository.rollup_user_consumption(user_id, since, db, days)
+            engine = self.__get_updatable_scoring_engine(user_id, db)
+            if engine is None:
+                continue
+
+            food_ids = list(
+                {food_id for food_user_id, _, food_id in consumed_foods if food_user_id == user_id}
+            )
+            consumption_scores = self.__get_consumption_scores(engine, user_id, db, food_ids)
+
+            self.user_food_score_repository.set_consumption_scores(
+                user_id,
+                [
+                    (food_id, consumption_scores[engine.food_index[food_id]])
+                    for food_id in food_ids
+                    if food_id in engine.food_index
+                ],
+                db,
+            )
+
+    @staticmethod
+    def get_preference_sign(specificity_type_description: str) -> int:
+        if specificity_type_description in SpecificityTypes.specificity_likes_consume():
+            return 1
+        elif specificity_type_description in SpecificityTypes.specificity_doesnt_like_consume():
+            return -1
+
+        return 0
+
+    # ----------------- PRIVATE METHODS ----------------- #
+    def __save_user_food_scores(
+        self,
+        user_id: str,
+        db: Session,
+        engine: FoodScoringEngine = None,
+        rollup_consumption: bool = False,
+    ) -> int:
+        engine = engine or self.get_scoring_engine(db)
+        version = self.user_food_score_repository.bump_user_food_score_version(
+            user_id, db, self.__catalog_version(engine.version), date.today()
+        )
+
+        if rollup_consumption:
+            self.user_food_consumption_repository.rollup_user_consumption(
+                user_id, self.__days_ago(self.PERIOD_TO_ANALYZE_DAYS), db
+            )
+
+        preference_scores, consumption_scores = self.__compute_user_food_scores(user_id, db, engine)
+        self.user_food_score_repository.save_user_food_scores(
+            user_id, engine.food_ids, preference_scores, consumption_scores, db
+        )
+
+        return version.version
+
+    def __compute_user_food_scores(
+        self, user_id: str, db: Session, engine: FoodScoringEngine, from_diary: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """The preference and the consumption scores of every food, for the user"""
+        preference_scores = engine.new_scores()
+        user_preferences = self.rs_repository.get_user_food_preferences(user_id, db)
+        if not user_preferences.empty:
+            engine.award_preferences(
+                preference_scores,
+                user_preferences["food_id"],
+                user_preferences["specificity_type_description"].map(self.get_preference_sign),
+            )
+
+        consumption_scores = self.__get_consumption_scores(
+            engine, user_id, db, from_diary=from_diary
+        )
+
+        return preference_scores, consumption_scores
+
+    def __get_consumption_scores(
+        self,
+        engine: FoodScoringEngine,
+        user_id: str,
+        db: Session,
+        food_ids: List[UUID] = None,
+        from_diary: bool = False,
+    ) -> np.ndarray:
+        """With `from_diary`, counted from the diary instead of the daily consumption"""
+        scores = engine.new_scores()
+
+        windows_since = (
+            self.__days_ago(self.PERIOD_TO_FATIGUE_DAYS),
+            self.__days_ago(self.PERIOD_TO_ANALYZE_DAYS),
+        )
+        if from_diary:
+            user_consumption = (
+                self.user_food_consumption_repository.get_user_food_consumption_from_diary(
+                    user_id, windows_since, db
+                )
+            )
+        else:
+            user_consumption = self.user_food_consumption_repository.get_user_food_consumption(
+                user_id, windows_since, db, food_ids
+            )
+        if not user_consumption:
+            return scores
+
+        """It sets the score based on the amount consumed, if it's close to the amount of fatigue it receives
+        fewer points to discourage its recommendation.
+            If it's a little above the defined minimum amount it's understood that the user has some degree of
+        identification with that food.
+            And finally if it's below the minimum amount it's not possible to assume whether the user likes it
+        or not, so a lower score is assigned. Lower than the balance point but higher than that of the foods
+        close to fatigue, the intention is that this food is recommended to find out in the future whether the
+        user likes it or not."""
+        consumed_food_ids, fatigue_amounts, food_amounts = zip(*user_consumption)
+        fatigue_amounts, food_amounts = np.array(fatigue_amounts), np.array(food_amounts)
+        engine.award(
+            scores,
+            consumed_food_ids,
+            np.where(
+                fatigue_amounts >= self.AMOUNT_TO_FATIGUE,
+                -100,
+                np.select(
+                    [
+                        food_amounts
+                        >= floor(self.AMOUNT_TO_FATIGUE * self.PERCENTAGE_NEAR_FATIGUE),
+                        food_amounts
+                        >= floor(self.AMOUNT_TO_FATIGUE * self.PERCENTAGE_FOR_IDENTIFICATION),
+                    ],
+                    [10, 30],
+                    20,
+                ),
+            ),
+        )
+
+        return scores
+
+    def __get_updatable_scoring_engine(
+        self, user_id: UUID, db: Session
+    ) -> Optional[FoodScoringEngine]:
+        """
+        Bump the version of the user and return the engine to update their stored scores in place
+        with: the cached one they were computed on, if they are current. Without it, the scores are
+        marked stale instead, to be computed again by the refresh script, so a change never reads
+        the catalog nor computes every score in the transaction of the writer.
+        """
+        version = self.user_food_score_repository.bump_user_food_score_version(user_id, db)
+        if version is None:
+            # no scores yet, the version is created stale so it still keys the change
+            self.user_food_score_repository.bump_user_food_score_version(user_id, db, "", date.min)
+            return None
+
+        engine = food_scoring_engine_cache.get(scoring_engine_cache_key(db))
+        if engine is not None and self.__is_current(version, engine):
+            return engine
+
+        self.user_food_score_repository.expire_user_food_score_version(user_id, db)
+        return None
+
+    def __is_current(self, version: Optional[Row], engine: FoodScoringEngine) -> bool:
+        """Whether the scores of the version were computed today, on the current catalog"""
+        return (
+            version is not None
+            and version.catalog_version == self.__catalog_version(engine.version)
+            and version.refreshed_on >= date.today()
+        )
+
+    @staticmethod
+    def __days_ago(days: int) -> date:
+        return date.today() - timedelta(days=days)
+
+    @staticmethod
+    def __catalog_version(version: Hashable) -> str:
+        return ";".join(str(value) for value in version)
+
+
+TRACKED_ATTRIBUTES = {
+    Specificity: ["user_id", "food_id", "specificity_type_id"],
+    Diary: ["nutritional_plan_has_meal_id", "item_id"],
+}
+
+
+def get_active_values(target: Any, keys: List[str], before: bool) -> Optional[Tuple[Any, ...]]:
+    """
+    The ids in `keys` of a persisted specificity or diary entry before or after the flush, None if
+    it was (or is) soft deleted.
+    """
+    state = inspect(target)
+
+    def value(key: str) -> Any:
+        history = state.attrs[key].history
+        if before and history.added:
+            # a change without the replaced value is of a column never set, inserted as NULL
+            return history.deleted[0] if history.deleted else None
+
+        return state.attrs[key].value
+
+    if value("deleted_at") is not None:
+        return None
+
+    # ids may have been set as strings
+    return tuple(UUID(str(value(key))) for key in keys)
+
+
+def keep_replaced_value(target: Any, value: Any, oldvalue: Any, initiator: Any) -> None:
+    """Only registered for its active history, that loads the value replaced in an expired row"""
+
+
+for tracked_entity, tracked_keys in TRACKED_ATTRIBUTES.items():
+    for tracked_key in [*tracked_keys, "deleted_at"]:
+        event.listen(
+            getattr(tracked_entity, tracked_key), "set", keep_replaced_value, active_history=True
+        )
+
+
+@event.listens_for(Session, "after_flush")
+def update_user_food_scores(session: Session, flush_context: Any) -> None:
+    new, deleted = session.new, session.deleted
+    specificities, diary_meals = [], set()
+
+    for target in (*new, *session.dirty, *deleted):
+        keys = TRACKED_ATTRIBUTES.get(type(target))
+        if keys is None:
+            continue
+
+        before = None if target in new else get_active_values(target, keys, before=True)
+        after = None if target in deleted else get_active_values(target, keys, before=False)
+        if before == after:
+            continue
+
+        if isinstance(target, Specificity):
+            specificities += [(*before, -1)] if before else []
+            specificities += [(*after, 1)] if after else []
+        else:
+            diary_meals.update(meal for meal in (before, after) if meal)
+
+    if specificities:
+        UserFoodScoreInterface().apply_specificity_changes(specificities, session)
+    if diary_meals:
+        UserFoodScoreInterface().apply_diary_changes(list(diary_meals), session)
+
+
+@SoftDeleteCascade.listens_for(Specificity, TRACKED_ATTRIBUTES[Specificity])
+def update_user_food_scores_on_deleted_specificities(
+    session: Session, specificities: List[Tuple[UUID, UUID, UUID]]
+) -> None:
+    UserFoodScoreInterface().apply_specificity_changes(
+        [(*specificity, -1) for specificity in specificities], session
+    )
+
+
+@SoftDeleteCascade.listens_for(Diary, TRACKED_ATTRIBUTES[Diary])
+def update_user_food_scores_on_deleted_diary(
+    session: Session, diary_meals: List[Tuple[UUID, UUID]]
+) -> None:
+    UserFoodScoreInterface().apply_diary_changes(list(set(diary_meals)), session)
@@ -1,17 +1,19 @@
-from datetime import date, timedelta
-from typing import List, Optional, Tuple
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 import pandas as pd
-from sqlalchemy import and_, func, null, or_
+from sqlalchemy import and_, column, func, null, select, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Session
 
 from src.core.constants.enum.specificity_type import SpecificityTypes
-from src.modules.domain.diary.entities.diary_entity import Diary
+from src.modules.domain.food.entities.food_category_entity import FoodCategory
 from src.modules.domain.food.entities.food_entity import Food
 from src.modules.domain.forbidden_foods.entities.forbidden_foods_entity import ForbiddenFoods
 from src.modules.domain.item.entities.item_entity import Item
 from src.modules.domain.item.entities.item_has_food_entity import ItemHasFood
+from src.modules.domain.meal.entities.item_can_eat_at_entity import ItemCanEatAt
 from src.modules.domain.meal.entities.type_of_meal_entity import TypeOfMeal
 from src.modules.domain.nutritional_plan.entities.nutritional_plan_entity import NutritionalPlan
 from src.modules.domain.plan_meals.entities.meals_of_plan_entity import MealsOfPlan
@@ -20,7 +22,9 @@ from src.modules.domain.plan_meals.entities.nutritional_plan_has_meal_entity imp
 )
 from src.modules.domain.specificity.entities.specificity_entity import Specificity
 from src.modules.domain.specificity.entities.specificity_type_entity import SpecificityType
-from src.modules.infrastructure.user.entities.user_entity import User
+from src.modules.infrastructure.database.repository_methods.table_versions import (
+    get_table_versions,
+)
 
 
 class RecommendationSystemRepository:
@@ -30,36 +34,32 @@ class RecommendationSystemRepository:
     @staticmethod
     def get_user_cant_consume_food_ids(
         user_id: str, nutritional_plan_id: str, db: Session
-    ) -> Optional[List[dict]]:
-        query = (
-            db.query(
-                Food.id.label("food_id"),
-                Food.description.label("food_description"),
-                SpecificityType.description.label("specificity_type_description"),
-            )
-            .outerjoin(Specificity, Food.id == Specificity.food_id)
-            .outerjoin(SpecificityType, Specificity.specificity_type_id == SpecificityType.id)
-            .outerjoin(ForbiddenFoods, Food.id == ForbiddenFoods.food_id)
+    ) -> List[UUID]:
+        """The foods the user can't consume, by a specificity or as forbidden in the plan"""
+        specificities = (
+            select(Specificity.food_id)
+            .join(SpecificityType, SpecificityType.id == Specificity.specificity_type_id)
             .where(
-                and_(
-                    Food.deleted_at == null(),
-                    Specificity.deleted_at == null(),
-                    SpecificityType.deleted_at == null(),
-                    ForbiddenFoods.deleted_at == null(),
-                    or_(
-                        and_(
-                            Specificity.user_id == user_id,
-                            SpecificityType.description.in_(
-                                SpecificityTypes.specificity_forbidden_consume()
-                            ),
-                        ),
-                        ForbiddenFoods.nutritional_plan_id == nutritional_plan_id,
-                    ),
-                )
+                Specificity.user_id == user_id,
+                SpecificityType.description.in_(SpecificityTypes.specificity_forbidden_consume()),
+                Specificity.deleted_at == null(),
+                SpecificityType.deleted_at == null(),
             )
         )
+        forbidden_foods = select(ForbiddenFoods.food_id).where(
+            ForbiddenFoods.nutritional_plan_id == nutritional_plan_id,
+            ForbiddenFoods.deleted_at == null(),
+        )
 
-        return [dict(row) for row in query.all()]
+        return db.execute(specificities.union(forbidden_foods)).scalars().all()
+
+    @staticmethod
+    def get_forbidden_foods_version(db: Session) -> Tuple[Any, ...]:
+        """
+        Bumped after every write to the forbidden foods of any plan (see table_versions.py), read
+        with a single query
+        """
+        return get_table_versions(db, [ForbiddenFoods])
 
     @staticmethod
     def get_user_food_preferences(user_id: str, db: Session) -> Optional[pd.DataFrame]:
@@ -86,93 +86,6 @@ class RecommendationSystemRepository:
 
         return pd.DataFrame.from_records([dict(row) for row in query.all()])
 
-    @staticmethod
-    def get_user_consumption_last_days(
-        db: Session, user_id: str, fatigued_food: List[UUID], days: int = 100
-    ) -> Optional[List[Tuple[UUID, int]]]:
-        days_before = (date.today() - timedelta(days=days)).strftime("%Y-%m-%d")
-
-        query = (
-            db.query(
-                User.id.label("user_id"),
-                Food.id.label("food_id"),
-                func.count(Food.id).label("count"),
-            )
-            .outerjoin(NutritionalPlan, NutritionalPlan.user_id == User.id)
-            .outerjoin(
-                NutritionalPlanHasMeal,
-                NutritionalPlanHasMeal.nutritional_plan_id == NutritionalPlan.id,
-            )
-            .outerjoin(Diary, Diary.nutritional_plan_has_meal_id == NutritionalPlanHasMeal.id)
-            .outerjoin(Item, Item.id == Diary.item_id)
-            .outerjoin(ItemHasFood, ItemHasFood.item_id == Item.id)
-            .outerjoin(Food, Food.id == ItemHasFood.food_id)
-            .where(
-                and_(
-                    NutritionalPlan.user_id == user_id,
-                    NutritionalPlanHasMeal.meal_date >= days_before,
-                    NutritionalPlan.deleted_at == null(),
-                    NutritionalPlanHasMeal.deleted_at == null(),
-                    Diary.deleted_at == null(),
-                    Item.deleted_at == null(),
-                    ItemHasFood.deleted_at == null(),
-                    Food.deleted_at == null(),
-                    Food.id.notin_(fatigued_food),
-                )
-            )
-            .group_by(User.id, Food.id)
-        )
-
-        result = []
-        for row in query.all():
-            row_dict = dict(row)
-            result.append((row_dict["food_id"], row_dict["count"]))
-
-        return result
-
-    @staticmethod
-    def get_fatigued_food_from_user(
-        db: Session, user_id: str, days: int = 30, amount_fatigue: int = 15
-    ) -> Optional[List[UUID]]:
-        days_before = (date.today() - timedelta(days=days)).strftime("%Y-%m-%d")
-
-        query = (
-            db.query(
-                User.id.label("user_id"),
-                Food.id.label("food_id"),
-            )
-            .outerjoin(NutritionalPlan, NutritionalPlan.user_id == User.id)
-            .outerjoin(
-                NutritionalPlanHasMeal,
-                NutritionalPlanHasMeal.nutritional_plan_id == NutritionalPlan.id,
-            )
-            .outerjoin(Diary, Diary.nutritional_plan_has_meal_id == NutritionalPlanHasMeal.id)
-            .outerjoin(Item, Item.id == Diary.item_id)
-            .outerjoin(ItemHasFood, ItemHasFood.item_id == Item.id)
-            .outerjoin(Food, Food.id == ItemHasFood.food_id)
-            .where(
-                and_(
-                    NutritionalPlan.user_id == user_id,
-                    NutritionalPlanHasMeal.meal_date >= days_before,
-                    NutritionalPlan.deleted_at == null(),
-                    NutritionalPlanHasMeal.deleted_at == null(),
-                    Diary.deleted_at == null(),
-                    Item.deleted_at == null(),
-                    ItemHasFood.deleted_at == null(),
-                    Food.deleted_at == null(),
-                )
-            )
-            .group_by(User.id, Food.id)
-            .having(func.count(Food.id) >= amount_fatigue)
-        )
-
-        result = []
-        for row in query.all():
-            row_dict = dict(row)
-            result.append(row_dict["food_id"])
-
-        return result
-
     @staticmethod
     def get_types_of_meal_plan(nutritional_plan_id: str, db: Session) -> List[dict]:
         query = (
@@ -208,21 +121,104 @@ class RecommendationSystemRepository:
         return [dict(row) for row in query.all()]
 
     @staticmethod
-    def get_allowed_items(allowed_food_ids: List[UUID], db: Session) -> List[Item]:
-        disallowed_foods_subquery = (
-            db.query(ItemHasFood.item_id)
-            .outerjoin(Food, Food.id == ItemHasFood.food_id)
-            .where(
-                and_(
-                    ItemHasFood.deleted_at == null(),
-                    Food.deleted_at == null(),
-                    Food.id.notin_(allowed_food_ids),
-                )
+    def get_items_can_eat_at(db: Session) -> List[Tuple[UUID, str, List[UUID]]]:
+        """Every item as (id, description, ids of the types of meal it can be eaten at)"""
+        query = (
+            db.query(
+                Item.id,
+                Item.description,
+                func.array_remove(func.array_agg(ItemCanEatAt.type_of_meal_id), None),
+            )
+            .outerjoin(
+                ItemCanEatAt,
+                and_(ItemCanEatAt.item_id == Item.id, ItemCanEatAt.deleted_at == null()),
             )
-        ).correlate(Item)
+            .where(Item.deleted_at == null())
+            .group_by(Item.id)
+        )
+
+        return [tuple(row) for row in query.all()]
 
-        query = db.query(Item).where(
-            and_(Item.deleted_at == null(), ~Item.id.in_(disallowed_foods_subquery))
+    @staticmethod
+    def get_catalog_version(db: Session, *entities: Any) -> Tuple[Any, ...]:
+        """
+        The version of the table of each entity, bumped after every write to it (see
+        table_versions.py), read with a single query
+        """
+        return get_table_versions(db, entities)
+
+    @staticmethod
+    def get_food_category_tree(db: Session) -> Tuple[List[Tuple], List[Tuple]]:
+        categories = db.query(FoodCategory.id, FoodCategory.food_category_id).where(
+            FoodCategory.deleted_at == null()
+        )
+        foods = db.query(Food.id, Food.food_category_id).where(Food.deleted_at == null())
+
+        return [tuple(row) for row in categories.all()], [tuple(row) for row in foods.all()]
+
+    @staticmethod
+    def get_food_catalog(db: Session) -> List[Tuple]:
+        """Every food as a row of FOOD_FIELDS, the columns of the food catalog snapshot"""
+        query = db.query(
+            Food.id,
+            Food.description,
+            Food.proteins,
+            Food.lipids,
+            Food.carbohydrates,
+            Food.energy_value,
+            Food.potassium,
+            Food.phosphorus,
+            Food.sodium,
+            Food.created_at,
+            Food.updated_at,
+            Food.food_category_id,
+        ).where(Food.deleted_at == null())
+
+        return [tuple(row) for row in query.all()]
+
+    @staticmethod
+    def get_item_has_foods(db: Session) -> List[Tuple[UUID, UUID, float]]:
+        query = (
+            db.query(ItemHasFood.item_id, ItemHasFood.food_id, ItemHasFood.amount_grams)
+            .join(Food, Food.id == ItemHasFood.food_id)
+            .where(ItemHasFood.deleted_at == null(), Food.deleted_at == null())
+        )
+
+        return [tuple(row) for row in query.all()]
+
+    @staticmethod
+    def get_specificity_type_descriptions(
+        specificity_type_ids: List[UUID], db: Session
+    ) -> Dict[UUID, str]:
+        query = db.query(SpecificityType.id, SpecificityType.description).where(
+            SpecificityType.id.in_(specificity_type_ids)
+        )
+
+        return {row.id: row.description for row in query.all()}
+
+    @staticmethod
+    def get_diary_consumed_foods(
+        diary_meals: List[Tuple[UUID, UUID]], db: Session
+    ) -> List[Tuple[UUID, date, UUID]]:
+        """
+        The (user id, meal date, food id) consumed by (nutritional plan has meal id, item id) pairs
+        """
+        meals = values(
+            column("nutritional_plan_has_meal_id", PG_UUID(as_uuid=True)),
+            column("item_id", PG_UUID(as_uuid=True)),
+            name="diary_meals",
+        ).data(diary_meals)
+
+        query = (
+            db.query(NutritionalPlan.user_id, NutritionalPlanHasMeal.meal_date, ItemHasFood.food_id)
+            .select_from(meals)
+            .join(
+                NutritionalPlanHasMeal,
+                NutritionalPlanHasMeal.id == meals.c.nutritional_plan_has_meal_id,
+            )
+            .join(NutritionalPlan, NutritionalPlan.id == NutritionalPlanHasMeal.nutritional_plan_id)
+            .join(ItemHasFood, ItemHasFood.item_id == meals.c.item_id)
+            .distinct()
         )
 
-        return query.all()
+        return [tuple(row) for row in query.all()]
@@ -0,0 +1,155 @@
+import uuid
+from datetime import date, datetime
+from typing import Any, List, Tuple
+
+from sqlalchemy import func, null, or_, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Query, Session
+
+from src.modules.domain.diary.entities.diary_entity import Diary
+from src.modules.domain.food.entities.food_entity import Food
+from src.modules.domain.item.entities.item_entity import Item
+from src.modules.domain.item.entities.item_has_food_entity import ItemHasFood
+from src.modules.domain.nutritional_plan.entities.nutritional_plan_entity import NutritionalPlan
+from src.modules.domain.plan_meals.entities.nutritional_plan_has_meal_entity import (
+    NutritionalPlanHasMeal,
+)
+from src.modules.domain.recommendation_system.entities.user_food_consumption_entity import (
+    UserFoodConsumption,
+)
+from src.modules.infrastructure.database.base_repository import BaseRepository, BULK_INSERT_SIZE
+
+
+class UserFoodConsumptionRepository(BaseRepository[UserFoodConsumption]):
+    def __init__(self):
+        super().__init__(UserFoodConsumption)
+
+    @staticmethod
+    def rollup_user_consumption(
+        user_id: str, since: date, db: Session, days: List[date] = None
+    ) -> None:
+        """
+        Count again, from the diary, the foods consumed by the user on every day since `since`, or
+        only on `days`. The days before `since` are dropped.
+        """
+        query = UserFoodConsumptionRepository.__get_daily_consumption_query(
+            user_id, since, db, days
+        )
+
+        now = datetime.now()
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "created_at": now,
+                "updated_at": now,
+                "user_id": user_id,
+                "food_id": row.food_id,
+                "consumed_on": row.meal_date,
+                "amount": row.amount,
+            }
+            for row in query.all()
+        ]
+
+        db.query(UserFoodConsumption).where(
+            UserFoodConsumption.user_id == user_id,
+            or_(
+                UserFoodConsumption.consumed_on < since,
+                UserFoodConsumption.consumed_on.in_(days)
+                if days is not None
+                else UserFoodConsumption.consumed_on >= since,
+            ),
+        ).delete(synchronize_session=False)
+
+        for index in range(0, len(rows), BULK_INSERT_SIZE):
+            db.execute(insert(UserFoodConsumption).values(rows[index : index + BULK_INSERT_SIZE]))
+
+    @staticmethod
+    def get_user_food_consumption(
+        user_id: str,
+        windows_since: Tuple[date, date],
+        db: Session,
+        food_ids: List[Any] = None,
+    ) -> List[Tuple[Any, int, int]]:
+        """
+        How many times the user consumed each food in two windows, from each date of `windows_since`
+        on, as (food id, amount in the first window, amount in the second window). A single pass
+        over the daily consumption, foods not consumed in any window left out.
+        """
+
+        def amount_since(since: date) -> Any:
+            return func.coalesce(
+                func.sum(UserFoodConsumption.amount).filter(
+                    UserFoodConsumption.consumed_on >= since
+                ),
+                0,
+            )
+
+        query = (
+            db.query(UserFoodConsumption.food_id, *(amount_since(since) for since in windows_since))
+            .where(
+                UserFoodConsumption.user_id == user_id,
+                UserFoodConsumption.consumed_on >= min(windows_since),
+                UserFoodConsumption.food_id.in_(food_ids) if food_ids is not None else true(),
+            )
+            .group_by(UserFoodConsumption.food_id)
+        )
+
+        return [tuple(row) for row in query.all()]
+
+    @staticmethod
+    def get_user_food_consumption_from_diary(
+        user_id: str, windows_since: Tuple[date, date], db: Session
+    ) -> List[Tuple[Any, int, int]]:
+        """
+        The same as `get_user_food_consumption`, counted from the diary without writing the daily
+        consumption of the user
+        """
+        daily_consumption = UserFoodConsumptionRepository.__get_daily_consumption_query(
+            user_id, min(windows_since), db
+        ).subquery()
+
+        def amount_since(since: date) -> Any:
+            return func.coalesce(
+                func.sum(daily_consumption.c.amount).filter(daily_consumption.c.meal_date >= since),
+                0,
+            )
+
+        query = db.query(
+            daily_consumption.c.food_id, *(amount_since(since) for since in windows_since)
+        ).group_by(daily_consumption.c.food_id)
+
+        return [tuple(row) for row in query.all()]
+
+    @staticmethod
+    def __get_daily_consumption_query(
+        user_id: str, since: date, db: Session, days: List[date] = None
+    ) -> Query:
+        """How many times the user consumed each food on every day since `since`, or on `days`"""
+        return (
+            db.query(
+                ItemHasFood.food_id,
+                NutritionalPlanHasMeal.meal_date,
+                func.count(ItemHasFood.food_id).label("amount"),
+            )
+            .select_from(NutritionalPlan)
+            .join(
+                NutritionalPlanHasMeal,
+                NutritionalPlanHasMeal.nutritional_plan_id == NutritionalPlan.id,
+            )
+            .join(Diary, Diary.nutritional_plan_has_meal_id == NutritionalPlanHasMeal.id)
+            .join(Item, Item.id == Diary.item_id)
+            .join(ItemHasFood, ItemHasFood.item_id == Item.id)
+            .join(Food, Food.id == ItemHasFood.food_id)
+            .where(
+                NutritionalPlan.user_id == user_id,
+                NutritionalPlanHasMeal.meal_date >= since,
+                NutritionalPlanHasMeal.meal_date.in_(days) if days is not None else true(),
+                NutritionalPlan.deleted_at == null(),
+                NutritionalPlanHasMeal.deleted_at == null(),
+                Diary.deleted_at == null(),
+                Item.deleted_at == null(),
+                ItemHasFood.deleted_at == null(),
+                Food.deleted_at == null(),
+            )
+            .group_by(ItemHasFood.food_id, NutritionalPlanHasMeal.meal_date)
+        )
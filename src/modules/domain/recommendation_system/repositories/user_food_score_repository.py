@@ -0,0 +1,209 @@
+import uuid
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import column, desc, Integer, null, or_, update, values
+from sqlalchemy.dialects.postgresql import insert, UUID
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from src.modules.domain.recommendation_system.entities.user_food_score_entity import (
+    UserFoodScore,
+)
+from src.modules.domain.recommendation_system.entities.user_food_score_version_entity import (
+    UserFoodScoreVersion,
+)
+from src.modules.infrastructure.database.base_repository import BaseRepository, BULK_INSERT_SIZE
+from src.modules.infrastructure.user.entities.user_entity import User
+
+
+class UserFoodScoreRepository(BaseRepository[UserFoodScore]):
+    def __init__(self):
+        super().__init__(UserFoodScore)
+
+    @staticmethod
+    def get_user_food_scores(user_id: str, db: Session) -> List[Row]:
+        """The ranking of the user, read from the (user_id, score, food_id) index"""
+        query = (
+            db.query(UserFoodScore.food_id, UserFoodScore.score)
+            .where(UserFoodScore.user_id == user_id)
+            .order_by(desc(UserFoodScore.score), desc(UserFoodScore.food_id))
+        )
+
+        return query.all()
+
+    @staticmethod
+    def save_user_food_scores(
+        user_id: str,
+        food_ids: Sequence[Any],
+        preference_scores: Sequence[int],
+        consumption_scores: Sequence[int],
+        db: Session,
+    ) -> None:
+        """Replace every score of the user, the foods no longer in the catalog included"""
+        now = datetime.now()
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "created_at": now,
+                "updated_at": now,
+                "user_id": user_id,
+                "food_id": food_id,
+                "preference_score": int(preference_score),
+                "consumption_score": int(consumption_score),
+                "score": int(preference_score + consumption_score),
+            }
+            for food_id, preference_score, consumption_score in zip(
+                food_ids, preference_scores, consumption_scores
+            )
+        ]
+
+        db.query(UserFoodScore).where(UserFoodScore.user_id == user_id).delete(
+            synchronize_session=False
+        )
+
+        for index in range(0, len(rows), BULK_INSERT_SIZE):
+            db.execute(insert(UserFoodScore).values(rows[index : index + BULK_INSERT_SIZE]))
+
+    @staticmethod
+    def add_preference_scores(
+        user_id: str,
+        food_scores: List[Tuple[Any, int]],
+        db: Session,
+    ) -> None:
+        """Add (food id, score) to the preference score of the foods"""
+        if not food_scores:
+            return
+
+        added = values(
+            column("food_id", UUID(as_uuid=True)), column("score", Integer), name="added"
+        ).data([(food_id, int(score)) for food_id, score in food_scores])
+
+        db.execute(
+            update(UserFoodScore)
+            .where(
+                UserFoodScore.user_id == user_id,
+                UserFoodScore.food_id == added.c.food_id,
+            )
+            .values(
+                preference_score=UserFoodScore.preference_score + added.c.score,
+                score=UserFoodScore.score + added.c.score,
+                updated_at=datetime.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def set_consumption_scores(
+        user_id: str,
+        food_scores: List[Tuple[Any, int]],
+        db: Session,
+    ) -> None:
+        """Set (food id, score) as the consumption score of the foods"""
+        if not food_scores:
+            return
+
+        consumed = values(
+            column("food_id", UUID(as_uuid=True)), column("score", Integer), name="consumed"
+        ).data([(food_id, int(score)) for food_id, score in food_scores])
+
+        db.execute(
+            update(UserFoodScore)
+            .where(
+                UserFoodScore.user_id == user_id,
+                UserFoodScore.food_id == consumed.c.food_id,
+            )
+            .values(
+                consumption_score=consumed.c.score,
+                score=UserFoodScore.preference_score + consumed.c.score,
+                updated_at=datetime.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def get_user_food_score_version(user_id: str, db: Session) -> Optional[Row]:
+        query = db.query(
+            UserFoodScoreVersion.version,
+            UserFoodScoreVersion.catalog_version,
+            UserFoodScoreVersion.refreshed_on,
+        ).where(UserFoodScoreVersion.user_id == user_id)
+
+        return query.first()
+
+    @staticmethod
+    def bump_user_food_score_version(
+        user_id: str,
+        db: Session,
+        catalog_version: str = None,
+        refreshed_on: date = None,
+    ) -> Optional[Row]:
+        """
+        Bump the version of the scores of the user, locking it until the end of the transaction.
+        With a catalog version and a day the scores are being computed again, and the version is
+        created if missing; otherwise None is returned when the user has no scores yet.
+        """
+        returning = (
+            UserFoodScoreVersion.version,
+            UserFoodScoreVersion.catalog_version,
+            UserFoodScoreVersion.refreshed_on,
+        )
+        now = datetime.now()
+
+        if catalog_version is None:
+            statement = (
+                update(UserFoodScoreVersion)
+                .where(UserFoodScoreVersion.user_id == user_id)
+                .values(version=UserFoodScoreVersion.version + 1, updated_at=now)
+                .returning(*returning)
+                .execution_options(synchronize_session=False)
+            )
+            return db.execute(statement).first()
+
+        statement = insert(UserFoodScoreVersion).values(
+            id=uuid.uuid4(),
+            created_at=now,
+            updated_at=now,
+            user_id=user_id,
+            version=1,
+            catalog_version=catalog_version,
+            refreshed_on=refreshed_on,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={
+                "version": UserFoodScoreVersion.version + 1,
+                "updated_at": statement.excluded.updated_at,
+                "catalog_version": statement.excluded.catalog_version,
+                "refreshed_on": statement.excluded.refreshed_on,
+            },
+        ).returning(*returning)
+
+        return db.execute(statement).first()
+
+    @staticmethod
+    def expire_user_food_score_version(user_id: str, db: Session) -> None:
+        """Mark the scores of the user as stale, until they are computed again"""
+        db.execute(
+            update(UserFoodScoreVersion)
+            .where(UserFoodScoreVersion.user_id == user_id)
+            .values(refreshed_on=date.min, updated_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def get_stale_user_ids(catalog_version: str, refreshed_on: date, db: Session) -> List[Any]:
+        """The users whose scores are missing, or were computed on another catalog or day"""
+        query = (
+            db.query(User.id)
+            .outerjoin(UserFoodScoreVersion, UserFoodScoreVersion.user_id == User.id)
+            .where(
+                or_(
+                    UserFoodScoreVersion.id == null(),
+                    UserFoodScoreVersion.catalog_version != catalog_version,
+                    UserFoodScoreVersion.refreshed_on < refreshed_on,
+                )
+            )
+        )
+
+        return [row.id for row in query.all()]
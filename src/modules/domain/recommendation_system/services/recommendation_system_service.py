@@ -1,8 +1,14 @@
-from typing import List, Optional
+from typing import Callable, List, Optional
 
-from cachetools import TTLCache
 from sqlalchemy.orm import Session
 
+from src.core.types.exceptions_type import NotFoundException
+from src.modules.domain.recommendation_system.dto.complete_nutritional_plan_job_dto import (
+    CompleteNutritionalPlanJobDto,
+)
+from src.modules.domain.recommendation_system.dto.nutritional_plan_preview_dto import (
+    NutritionalPlanPreviewDto,
+)
 from src.modules.domain.recommendation_system.dto.user_preferences_table_dto import (
     DetailedUserPreferencesTable,
     SimplifiedUserPreferencesTable,
@@ -13,13 +19,11 @@ from src.modules.domain.recommendation_system.interfaces.complete_nutritional_pl
 from src.modules.domain.recommendation_system.interfaces.find_user_food_preferences_interface import (
     FindUserFoodPreferencesInterface,
 )
+from src.modules.infrastructure.database import SessionLocal
+from src.modules.infrastructure.jobs import job_queue
+from src.modules.infrastructure.jobs.dto.job_dto import JobDto
 
-all_food_cache = TTLCache(maxsize=1, ttl=60 * 60)
-user_food_preference_cache = TTLCache(maxsize=100, ttl=60 * 60)
-
-
-def all_foods_cache_key(db: Session):
-    return f"all_foods_{db.get_bind().url.database}_{db.get_bind().dialect.name}"
+COMPLETE_NUTRITIONAL_PLAN_JOB = "complete_nutritional_plan"
 
 
 class RecommendationSystemService:
@@ -35,15 +39,78 @@ class RecommendationSystemService:
         available: bool,
         force_reload: bool,
         db: Session,
+        set_progress: Callable[[float], None] = lambda progress: None,
     ) -> Optional[List[SimplifiedUserPreferencesTable]]:
         user_items_preference = (
             await self.complete_nutritional_plan_interface.complete_nutritional_plan(
-                user_id, nutritional_plan_id, available, force_reload, db
+                user_id, nutritional_plan_id, available, force_reload, db, set_progress
             )
         ).to_dict("records")
 
         return [SimplifiedUserPreferencesTable(**item) for item in user_items_preference]
 
+    async def preview_nutritional_plan(
+        self,
+        user_id: str,
+        nutritional_plan_id: str,
+        available: bool,
+        force_reload: bool,
+        db: Session,
+    ) -> NutritionalPlanPreviewDto:
+        (
+            meals,
+            issued_at,
+            signature,
+        ) = await self.complete_nutritional_plan_interface.preview_nutritional_plan(
+            user_id, nutritional_plan_id, available, force_reload, db
+        )
+
+        return NutritionalPlanPreviewDto(
+            user_id=user_id,
+            nutritional_plan_id=nutritional_plan_id,
+            meals=meals,
+            issued_at=issued_at,
+            signature=signature,
+        )
+
+    async def apply_nutritional_plan_preview(
+        self, preview: NutritionalPlanPreviewDto, db: Session
+    ) -> None:
+        await self.complete_nutritional_plan_interface.apply_nutritional_plan_preview(
+            str(preview.user_id),
+            str(preview.nutritional_plan_id),
+            [meal.dict() for meal in preview.meals],
+            preview.issued_at,
+            preview.signature,
+            db,
+        )
+
+    @staticmethod
+    def enqueue_complete_nutritional_plan(
+        user_id: str, nutritional_plan_id: str, available: bool, force_reload: bool
+    ) -> JobDto:
+        return job_queue.enqueue(
+            COMPLETE_NUTRITIONAL_PLAN_JOB,
+            {
+                "user_id": user_id,
+                "nutritional_plan_id": nutritional_plan_id,
+                "available": available,
+                "force_reload": force_reload,
+            },
+            # a plan is completed by one job at a time
+            dedupe_key=f"{COMPLETE_NUTRITIONAL_PLAN_JOB}_{nutritional_plan_id}",
+        )
+
+    @staticmethod
+    def get_complete_nutritional_plan_job(job_id: str) -> CompleteNutritionalPlanJobDto:
+        job = job_queue.get(job_id)
+        if job.name != COMPLETE_NUTRITIONAL_PLAN_JOB:
+            raise NotFoundException(
+                f'Could not find any job with the id "{job_id}"', [JobDto.__name__]
+            )
+
+        return CompleteNutritionalPlanJobDto(**job.dict())
+
     async def get_user_food_preferences(
         self,
         user_id: str,
@@ -51,7 +118,27 @@ class RecommendationSystemService:
         available: bool,
         force_reload: bool,
         db: Session,
+        limit: int = None,
+        offset: int = 0,
+        min_score: int = None,
     ) -> Optional[List[DetailedUserPreferencesTable]]:
         return await self.find_user_food_preferences_interface.get_user_food_preferences(
-            user_id, nutritional_plan_id, available, force_reload, db
+            user_id, nutritional_plan_id, available, force_reload, db, limit, offset, min_score
+        )
+
+
+@job_queue.register(COMPLETE_NUTRITIONAL_PLAN_JOB)
+async def complete_nutritional_plan_job(
+    set_progress: Callable[[float], None],
+    user_id: str,
+    nutritional_plan_id: str,
+    available: bool,
+    force_reload: bool,
+) -> Optional[List[SimplifiedUserPreferencesTable]]:
+    db = SessionLocal()
+    try:
+        return await RecommendationSystemService().complete_nutritional_plan(
+            user_id, nutritional_plan_id, available, force_reload, db, set_progress
         )
+    finally:
+        db.close()
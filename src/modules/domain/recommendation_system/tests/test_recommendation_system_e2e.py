@@ -1,19 +1,54 @@
-from typing import Optional
+import asyncio
+from copy import deepcopy
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+from uuid import UUID
 
 import pytest
 from httpx import AsyncClient
 from starlette.status import (
     HTTP_200_OK,
+    HTTP_201_CREATED,
+    HTTP_202_ACCEPTED,
     HTTP_400_BAD_REQUEST,
     HTTP_403_FORBIDDEN,
+    HTTP_404_NOT_FOUND,
     HTTP_422_UNPROCESSABLE_ENTITY,
 )
 
+from src.core.constants.enum.job_status import JobStatus
+from src.core.types.exceptions_type import BadRequestException
 from src.main import app
+from src.modules.domain.forbidden_foods.entities.forbidden_foods_entity import ForbiddenFoods
+from src.modules.domain.item.entities.item_entity import Item
+from src.modules.domain.plan_meals.entities.meals_options_entity import MealsOptions
+from src.modules.domain.plan_meals.entities.nutritional_plan_has_meal_entity import (
+    NutritionalPlanHasMeal,
+)
+from src.modules.domain.recommendation_system.entities.user_food_score_entity import (
+    UserFoodScore,
+)
+from src.modules.domain.recommendation_system.entities.user_food_score_version_entity import (
+    UserFoodScoreVersion,
+)
+from src.modules.domain.recommendation_system.interfaces.complete_nutritional_plan_interface import (
+    CompleteNutritionalPlanInterface,
+)
+from src.modules.domain.recommendation_system.interfaces.user_food_score_interface import (
+    UserFoodScoreInterface,
+)
 from src.modules.domain.recommendation_system.services.recommendation_system_service import (
+    COMPLETE_NUTRITIONAL_PLAN_JOB,
     RecommendationSystemService,
 )
+from src.modules.domain.specificity.entities.specificity_entity import Specificity
+from src.modules.domain.specificity.entities.specificity_type_entity import SpecificityType
+from src.modules.domain.specificity.repositories.specificity_repository import (
+    SpecificityRepository,
+)
 from src.modules.infrastructure.auth.dto.login_payload_dto import LoginPayloadDto
+from src.modules.infrastructure.jobs.job_stores import SqliteJobStore
+from src.modules.infrastructure.user.entities.user_entity import User
 from test.test_base_e2e import TestBaseE2E
 
 CONTROLLER = "recommendation-system"
@@ -95,6 +130,287 @@ class TestCompleteUserNutritionalPlan(TestBaseE2E):
             ).status_code == HTTP_403_FORBIDDEN
 
 
+@pytest.mark.describe(f"POST Route: /{CONTROLLER}/complete-nutritional-plan/preview")
+class TestPreviewNutritionalPlan(TestBaseE2E):
+    route = f"/{CONTROLLER}/complete-nutritional-plan"
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: Preview a Nutritional Plan and apply the unchanged preview")
+    async def test_preview_and_apply_nutritional_plan(
+        self, user_admin: Optional[LoginPayloadDto]
+    ) -> None:
+        nutritional_plan_id = "9d64aec5-3ddb-4d5f-a824-341f0a4928f1"
+        db = self.db_test_utils.db
+
+        def get_plan_meals() -> List[tuple]:
+            return sorted(
+                (str(meal.meals_of_plan_id), meal.meal_date.isoformat(), str(option.item_id))
+                for meal, option in db.query(NutritionalPlanHasMeal, MealsOptions)
+                .join(
+                    MealsOptions,
+                    MealsOptions.nutritional_plan_has_meal_id == NutritionalPlanHasMeal.id,
+                )
+                .filter(NutritionalPlanHasMeal.nutritional_plan_id == nutritional_plan_id)
+                .all()
+            )
+
+        # only the meal of the first day comes from the fixtures, the others are left to complete
+        db.query(NutritionalPlanHasMeal).filter(
+            NutritionalPlanHasMeal.nutritional_plan_id == nutritional_plan_id,
+            NutritionalPlanHasMeal.meal_date > date(2023, 2, 8),
+        ).update({"deleted_at": datetime.now()}, synchronize_session=False)
+        db.commit()
+
+        plan_meals = get_plan_meals()
+
+        async with AsyncClient(app=app, base_url=self.base_url) as ac:
+            response = await ac.post(
+                f"{self.route}/preview",
+                params={
+                    "user_id": "3e535e14-d26c-4dc8-ae28-096ff05453fb",
+                    "nutritional_plan_id": nutritional_plan_id,
+                },
+                headers={"Authorization": f"Bearer {user_admin.access_token}"},
+            )
+
+        preview = response.json()
+
+        assert response.status_code == HTTP_200_OK
+        assert preview["user_id"] == "3e535e14-d26c-4dc8-ae28-096ff05453fb"
+        assert preview["nutritional_plan_id"] == nutritional_plan_id
+        assert len(preview["meals"]) >= 1
+        assert all(len(meal["options"]) >= 1 for meal in preview["meals"])
+        assert get_plan_meals() == plan_meals
+
+        changed_amount = deepcopy(preview)
+        option = changed_amount["meals"][0]["options"][0]
+        option["amount"] = 1.0 if option["amount"] != 1.0 else 1.5
+        changed_item = deepcopy(preview)
+        changed_item["meals"][0]["options"][0]["item_id"] = next(
+            item["id"]
+            for item in self.db_test_utils.get_entity_objects(Item)
+            if item["id"] != preview["meals"][0]["options"][0]["item_id"]
+        )
+        changed_user = {**preview, "user_id": self.db_test_utils.get_entity_objects(User)[1]["id"]}
+        changed_issued_at = {
+            **preview,
+            "issued_at": (
+                datetime.fromisoformat(preview["issued_at"]) + timedelta(hours=1)
+            ).isoformat(),
+        }
+
+        async with AsyncClient(app=app, base_url=self.base_url) as ac:
+            for changed_preview in [changed_amount, changed_item, changed_user, changed_issued_at]:
+                response = await ac.post(
+                    f"{self.route}/apply",
+                    json=changed_preview,
+                    headers={"Authorization": f"Bearer {user_admin.access_token}"},
+                )
+
+                assert response.status_code == HTTP_400_BAD_REQUEST
+
+        assert get_plan_meals() == plan_meals
+
+        async with AsyncClient(app=app, base_url=self.base_url) as ac:
+            response = await ac.post(
+                f"{self.route}/apply",
+                json=preview,
+                headers={"Authorization": f"Bearer {user_admin.access_token}"},
+            )
+
+        assert response.status_code == HTTP_201_CREATED
+        db.expire_all()
+        assert get_plan_meals() == sorted(
+            plan_meals
+            + [
+                (meal["meals_of_plan_id"], meal["meal_date"], option["item_id"])
+                for meal in preview["meals"]
+                for option in meal["options"]
+            ]
+        )
+
+        async with AsyncClient(app=app, base_url=self.base_url) as ac:
+            response = await ac.post(
+                f"{self.route}/apply",
+                json=preview,
+                headers={"Authorization": f"Bearer {user_admin.access_token}"},
+            )
+
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: Preview a Nutritional Plan without storing the user's food scores")
+    async def test_preview_nutritional_plan_read_only(
+        self, user_admin: Optional[LoginPayloadDto]
+    ) -> None:
+        user_id = self.db_test_utils.get_entity_objects(User)[0]["id"]
+        db = self.db_test_utils.db
+
+        async with AsyncClient(app=app, base_url=self.base_url) as ac:
+            response = await ac.post(
+                f"{self.route}/preview",
+                params={
+                    "user_id": user_id,
+                    "nutritional_plan_id": "9d64aec5-3ddb-4d5f-a824-341f0a4928f1",
+                    "force_reload": True,
+                },
+                headers={"Authorization": f"Bearer {user_admin.access_token}"},
+            )
+
+        assert response.status_code == HTTP_200_OK
+        assert db.query(UserFoodScore).where(UserFoodScore.user_id == user_id).count() == 0
+        assert (
+            db.query(UserFoodScoreVersion).where(UserFoodScoreVersion.user_id == user_id).count()
+            == 0
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Failure: Apply an expired preview")
+    async def test_apply_expired_preview(self) -> None:
+        user_id = "3e535e14-d26c-4dc8-ae28-096ff05453fb"
+        nutritional_plan_id = "9d64aec5-3ddb-4d5f-a824-341f0a4928f1"
+        db = self.db_test_utils.db
+        interface = CompleteNutritionalPlanInterface(preview_expiration=timedelta(0))
+
+        meals, issued_at, signature = await interface.preview_nutritional_plan(
+            user_id, nutritional_plan_id, True, False, db
+        )
+
+        with pytest.raises(BadRequestException, match="expired"):
+            await interface.apply_nutritional_plan_preview(
+                user_id, nutritional_plan_id, meals, issued_at, signature, db
+            )
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Failure: Apply a preview with an invalid amount")
+    async def test_apply_preview_with_invalid_amount(
+        self, user_admin: Optional[LoginPayloadDto]
+    ) -> None:
+        async with AsyncClient(app=app, base_url=self.base_url) as ac:
+            response = await ac.post(
+                f"{self.route}/apply",
+                json={
+                    "user_id": "3e535e14-d26c-4dc8-ae28-096ff05453fb",
+                    "nutritional_plan_id": "9d64aec5-3ddb-4d5f-a824-341f0a4928f1",
+                    "meals": [
+                        {
+                            "meal_date": "2022-10-20",
+                            "meals_of_plan_id": "09c4a1d8-9f7f-4e0f-9c4a-4c2f5a6a1e2b",
+                            "options": [
+                                {"item_id": "4b4a8f80-3b0f-4d3a-8d6b-8d2a6f1e0e1a", "amount": 5}
+                            ],
+                        }
+                    ],
+                    "issued_at": "2022-10-20T12:00:00+00:00",
+                    "signature": "",
+                },
+                headers={"Authorization": f"Bearer {user_admin.access_token}"},
+            )
+
+        assert response.status_code == HTTP_422_UNPROCESSABLE_ENTITY
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Failure: Preview a Nutritional Plan without required authorization")
+    async def test_preview_nutritional_plan_without_required_authorization(
+        self, user_common: Optional[LoginPayloadDto]
+    ) -> None:
+        async with AsyncClient(app=app, base_url=self.base_url) as ac:
+            assert (
+                await ac.post(
+                    f"{self.route}/preview",
+                    params={
+                        "user_id": "3e535e14-d26c-4dc8-ae28-096ff05453fb",
+                        "nutritional_plan_id": "9d64aec5-3ddb-4d5f-a824-341f0a4928f1",
+                    },
+                    headers={"Authorization": f"Bearer {user_common.access_token}"},
+                )
+            ).status_code == HTTP_403_FORBIDDEN
+
+
+@pytest.mark.describe(f"POST Route: /{CONTROLLER}/complete-nutritional-plan/job")
+class TestCompleteUserNutritionalPlanJob(TestBaseE2E):
+    route = f"/{CONTROLLER}/complete-nutritional-plan/job"
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: Complete User's Nutritional Plan in a background job")
+    async def test_complete_nutritional_plan_job(
+        self, user_admin: Optional[LoginPayloadDto]
+    ) -> None:
+        headers = {"Authorization": f"Bearer {user_admin.access_token}"}
+        params = {
+            "user_id": "3e535e14-d26c-4dc8-ae28-096ff05453fb",
+            "nutritional_plan_id": "9d64aec5-3ddb-4d5f-a824-341f0a4928f1",
+        }
+
+        async with AsyncClient(app=app, base_url=self.base_url) as ac:
+            response = await ac.post(self.route, params=params, headers=headers)
+            duplicated_response = await ac.post(self.route, params=params, headers=headers)
+
+            job = response.json()
+            assert response.status_code == HTTP_202_ACCEPTED
+            assert job["name"] == "complete_nutritional_plan"
+            assert duplicated_response.json()["id"] == job["id"]
+
+            for _ in range(100):
+                job = (await ac.get(f"{self.route}/{job['id']}", headers=headers)).json()
+                if job["status"] not in ["PENDING", "RUNNING"]:
+                    break
+                await asyncio.sleep(0.1)
+
+        assert job["status"] == "SUCCEEDED"
+        assert job["progress"] == 1
+        assert len(job["result"]) >= 2
+        assert all(key in job["result"][0] for key in ["id", "description", "score"])
+        assert job["result"][0]["score"] >= job["result"][-1]["score"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Failure: Get a job that does not exist")
+    async def test_get_nonexistent_job(self, user_admin: Optional[LoginPayloadDto]) -> None:
+        async with AsyncClient(app=app, base_url=self.base_url) as ac:
+            response = await ac.get(
+                f"{self.route}/c9f6d4a2-1b3e-4f5a-8d7c-0e2b4a6c8d10",
+                headers={"Authorization": f"Bearer {user_admin.access_token}"},
+            )
+
+        assert response.status_code == HTTP_404_NOT_FOUND
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: A job left active by a stopped process does not block new ones")
+    async def test_stale_job_does_not_block_new_ones(self, tmp_path) -> None:
+        store = SqliteJobStore(str(tmp_path / "jobs.sqlite3"), stale_timeout=60)
+        stale_job, _ = store.create(COMPLETE_NUTRITIONAL_PLAN_JOB, {}, "plan")
+        store.update(stale_job["id"], status=JobStatus.RUNNING.value)
+
+        job, created = store.create(COMPLETE_NUTRITIONAL_PLAN_JOB, {}, "plan")
+
+        assert not created
+        assert job["id"] == stale_job["id"]
+
+        store.stale_timeout = 0
+        job, created = store.create(COMPLETE_NUTRITIONAL_PLAN_JOB, {}, "plan")
+
+        assert created
+        assert job["id"] != stale_job["id"]
+        assert store.get(stale_job["id"])["status"] == JobStatus.FAILED.value
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Failure: Complete Nutritional Plan job without required authorization")
+    async def test_complete_nutritional_plan_job_without_required_authorization(
+        self, user_common: Optional[LoginPayloadDto]
+    ) -> None:
+        async with AsyncClient(app=app, base_url=self.base_url) as ac:
+            assert (
+                await ac.post(
+                    self.route,
+                    params={
+                        "user_id": "3e535e14-d26c-4dc8-ae28-096ff05453fb",
+                        "nutritional_plan_id": "9d64aec5-3ddb-4d5f-a824-341f0a4928f1",
+                    },
+                    headers={"Authorization": f"Bearer {user_common.access_token}"},
+                )
+            ).status_code == HTTP_403_FORBIDDEN
+
+
 @pytest.mark.describe(f"GET Route: /{CONTROLLER}/food-preferences")
 class TestGetUserFoodPreferences(TestBaseE2E):
     route = f"/{CONTROLLER}/food-preferences"
@@ -125,6 +441,273 @@ class TestGetUserFoodPreferences(TestBaseE2E):
             if food["id"] == "e3ff57d6-eb77-48de-bb49-ff9201d95926":
                 assert food["score"] == -25
 
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: Get the food preferences of a user without storing their scores")
+    async def test_get_user_food_preferences_read_only(
+        self, user_admin: Optional[LoginPayloadDto]
+    ) -> None:
+        user_id = self.db_test_utils.get_entity_objects(User)[0]["id"]
+        db = self.db_test_utils.db
+
+        async with AsyncClient(app=app, base_url=self.base_url) as ac:
+            response = await ac.get(
+                self.route,
+                headers={"Authorization": f"Bearer {user_admin.access_token}"},
+                params={
+                    "user_id": user_id,
+                    "nutritional_plan_id": "9d64aec5-3ddb-4d5f-a824-341f0a4928f1",
+                    "force_reload": True,
+                },
+            )
+
+        assert response.status_code == HTTP_200_OK
+        assert len(response.json()) >= 2
+        assert db.query(UserFoodScore).where(UserFoodScore.user_id == user_id).count() == 0
+        assert (
+            db.query(UserFoodScoreVersion).where(UserFoodScoreVersion.user_id == user_id).count()
+            == 0
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: Get a page of the user's food preferences")
+    async def test_get_user_food_preferences_page(
+        self, user_admin: Optional[LoginPayloadDto]
+    ) -> None:
+        async def get_food_preferences(**params) -> list:
+            async with AsyncClient(app=app, base_url=self.base_url) as ac:
+                response = await ac.get(
+                    self.route,
+                    headers={"Authorization": f"Bearer {user_admin.access_token}"},
+                    params={
+                        "user_id": "3e535e14-d26c-4dc8-ae28-096ff05453fb",
+                        "nutritional_plan_id": "9d64aec5-3ddb-4d5f-a824-341f0a4928f1",
+                        **params,
+                    },
+                )
+
+            assert response.status_code == HTTP_200_OK
+            return response.json()
+
+        all_foods = await get_food_preferences()
+
+        assert await get_food_preferences(limit=5) == all_foods[:5]
+        assert await get_food_preferences(limit=5, offset=3) == all_foods[3:8]
+        assert await get_food_preferences(min_score=0) == [
+            food for food in all_foods if food["score"] >= 0
+        ]
+        assert await get_food_preferences(min_score=25, limit=1) == all_foods[:1]
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Failure: Get a page of the user's food preferences with an invalid limit")
+    async def test_get_user_food_preferences_invalid_limit(
+        self, user_admin: Optional[LoginPayloadDto]
+    ) -> None:
+        async with AsyncClient(app=app, base_url=self.base_url) as ac:
+            response = await ac.get(
+                self.route,
+                headers={"Authorization": f"Bearer {user_admin.access_token}"},
+                params={
+                    "user_id": "3e535e14-d26c-4dc8-ae28-096ff05453fb",
+                    "nutritional_plan_id": "9d64aec5-3ddb-4d5f-a824-341f0a4928f1",
+                    "limit": 0,
+                },
+            )
+
+        assert response.status_code == HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"][0]["loc"] == ["query", "limit"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: The food preferences follow the specificities of the user")
+    async def test_get_user_food_preferences_after_specificity_changes(
+        self, user_admin: Optional[LoginPayloadDto]
+    ) -> None:
+        user_id = "3e535e14-d26c-4dc8-ae28-096ff05453fb"
+        food_id = "e3ff57d6-eb77-48de-bb49-ff9201d95926"
+        db = self.db_test_utils.db
+
+        async def get_food_score() -> int:
+            async with AsyncClient(app=app, base_url=self.base_url) as ac:
+                response = await ac.get(
+                    self.route,
+                    headers={"Authorization": f"Bearer {user_admin.access_token}"},
+                    params={
+                        "user_id": user_id,
+                        "nutritional_plan_id": "9d64aec5-3ddb-4d5f-a824-341f0a4928f1",
+                    },
+                )
+
+            assert response.status_code == HTTP_200_OK
+            return next(food["score"] for food in response.json() if food["id"] == food_id)
+
+        def get_stored_score() -> int:
+            return (
+                db.query(UserFoodScore.score)
+                .where(UserFoodScore.user_id == user_id, UserFoodScore.food_id == food_id)
+                .scalar()
+            )
+
+        assert await get_food_score() == -25
+
+        # the changes update the stored scores in place once the refresh script computed them
+        UserFoodScoreInterface().refresh_user_food_scores(user_id, db)
+
+        assert get_stored_score() == -25
+
+        like = db.query(SpecificityType).where(SpecificityType.description == "LIKE").first()
+        specificity = Specificity(None, None, user_id, food_id=food_id, specificity_type_id=like.id)
+        db.add(specificity)
+        db.commit()
+
+        assert get_stored_score() == 25
+        assert await get_food_score() == 25
+
+        specificity.deleted_at = datetime.now()
+        db.commit()
+
+        assert get_stored_score() == -25
+        assert await get_food_score() == -25
+
+        specificity = Specificity(None, None, user_id, food_id=food_id, specificity_type_id=like.id)
+        db.add(specificity)
+        db.commit()
+
+        assert get_stored_score() == 25
+
+        await SpecificityRepository().soft_delete(str(specificity.id), db)
+
+        assert get_stored_score() == -25
+        assert await get_food_score() == -25
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: The stored scores follow the specificities created in bulk")
+    async def test_user_food_scores_after_specificities_created_in_bulk(self) -> None:
+        user_id = "3e535e14-d26c-4dc8-ae28-096ff05453fb"
+        food_id = "6f5d502c-2301-4afe-aca7-1c86486153ff"
+        db = self.db_test_utils.db
+        like = db.query(SpecificityType).where(SpecificityType.description == "LIKE").first()
+
+        def get_stored_score() -> int:
+            return (
+                db.query(UserFoodScore.score)
+                .where(UserFoodScore.user_id == user_id, UserFoodScore.food_id == food_id)
+                .scalar()
+            )
+
+        UserFoodScoreInterface().refresh_user_food_scores(user_id, db)
+        score = get_stored_score()
+
+        specificities = [
+            Specificity(None, None, user_id, food_id=food_id, specificity_type_id=like.id)
+            for _ in range(2)
+        ]
+        await SpecificityRepository().create_many(specificities, db)
+        computed_scores = dict(
+            UserFoodScoreInterface().get_user_food_scores(user_id, db, force_refresh=True)
+        )
+
+        assert get_stored_score() > score
+        assert get_stored_score() == computed_scores[UUID(food_id)]
+        with pytest.raises(ValueError):
+            await SpecificityRepository().upsert_many(specificities, db)
+
+    @pytest.mark.asyncio
+    @pytest.mark.it("Success: A change leaves the stale scores of the user to the refresh script")
+    async def test_get_user_food_preferences_after_changes_on_stale_scores(
+        self, user_admin: Optional[LoginPayloadDto]
+    ) -> None:
+        user_id = self.db_test_utils.get_entity_objects(User)[1]["id"]
+        food_id = "950d760f-ba5c-44ca-b4ec-313510e59beb"
+        db = self.db_test_utils.db
+        like = db.query(SpecificityType).where(SpecificityType.description == "LIKE").first()
+
+        async def get_food_score() -> int:
+            async with AsyncClient(app=app, base_url=self.base_url) as ac:
+                response = await ac.get(
+                    self.route,
+                    headers={"Authorization": f"Bearer {user_admin.access_token}"},
+                    params={
+                        "user_id": user_id,
+                        "nutritional_plan_id": "9d64aec5-3ddb-4d5f-a824-341f0a4928f1",
+                    },
+                )
+
+            assert response.status_code == HTTP_200_OK
+            return next(food["score"] for food in response.json() if food["id"] == food_id)
+
+        def get_stored_scores() -> dict:
+            return dict(
+                db.query(UserFoodScore.food_id, UserFoodScore.score)
+                .where(UserFoodScore.user_id == user_id)
+                .all()
+            )
+
+        score = await get_food_score()
+
+        db.add(Specificity(None, None, user_id, food_id=food_id, specificity_type_id=like.id))
+        db.commit()
+
+        assert get_stored_scores() == {}
+        assert (
+            db.query(UserFoodScoreVersion.refreshed_on)
+            .where(UserFoodScoreVersion.user_id == user_id)
+            .scalar()
+            == date.min
+        )
+        added_score = await get_food_score() - score
+        assert added_score > 0
+
+        UserFoodScoreInterface().refresh_user_food_scores(user_id, db)
+        db.query(UserFoodScoreVersion).where(UserFoodScoreVersion.user_id == user_id).update(
+            {"refreshed_on": date.today() - timedelta(days=1)}, synchronize_session=False
+        )
+        db.commit()
+        stored_scores = get_stored_scores()
+
+        db.add(Specificity(None, None, user_id, food_id=food_id, specificity_type_id=like.id))
+        db.commit()
+
+        assert get_stored_scores() == stored_scores
+        assert await get_food_score() == score + 2 * added_score
+
+    @pytest.mark.asyncio
+    @pytest.mark.it(
+        "Success: The available food preferences follow the forbidden foods of the plan"
+    )
+    async def test_get_available_user_food_preferences_after_forbidden_foods_changes(
+        self, user_admin: Optional[LoginPayloadDto]
+    ) -> None:
+        nutritional_plan_id = "9d64aec5-3ddb-4d5f-a824-341f0a4928f1"
+        food_id = "950d760f-ba5c-44ca-b4ec-313510e59beb"
+        db = self.db_test_utils.db
+
+        async def get_food_ids() -> List[str]:
+            async with AsyncClient(app=app, base_url=self.base_url) as ac:
+                response = await ac.get(
+                    self.route,
+                    headers={"Authorization": f"Bearer {user_admin.access_token}"},
+                    params={
+                        "user_id": "3e535e14-d26c-4dc8-ae28-096ff05453fb",
+                        "nutritional_plan_id": nutritional_plan_id,
+                    },
+                )
+
+            assert response.status_code == HTTP_200_OK
+            return [food["id"] for food in response.json()]
+
+        assert food_id in await get_food_ids()
+        assert "6f5d502c-2301-4afe-aca7-1c86486153ff" not in await get_food_ids()
+
+        forbidden_food = ForbiddenFoods(food_id, nutritional_plan_id)
+        db.add(forbidden_food)
+        db.commit()
+
+        assert food_id not in await get_food_ids()
+
+        forbidden_food.deleted_at = datetime.now()
+        db.commit()
+
+        assert food_id in await get_food_ids()
+
     @pytest.mark.asyncio
     @pytest.mark.it("Failure: Get a list of all user's food preferences without authentication")
     async def test_no_authentication(self) -> None:
@@ -0,0 +1,250 @@
+import fcntl
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from config import APP_TZ
+
+NUTRIENT_COLUMNS = (
+    "proteins",
+    "lipids",
+    "carbohydrates",
+    "energy_value",
+    "potassium",
+    "phosphorus",
+    "sodium",
+)
+TIMESTAMP_COLUMNS = ("created_at", "updated_at")
+
+# Every field of a food, in the order of the (id, ..., food_category_id) rows of the catalog
+FOOD_FIELDS = ("id", "description", *NUTRIENT_COLUMNS, *TIMESTAMP_COLUMNS, "food_category_id")
+
+# Every .npy file of a snapshot
+SNAPSHOT_COLUMNS = (
+    "ids",
+    "descriptions",
+    "description_offsets",
+    "category_ids",
+    "category",
+    *NUTRIENT_COLUMNS,
+    *TIMESTAMP_COLUMNS,
+)
+
+
+def to_uuid(value: bytes) -> UUID:
+    # NumPy drops the trailing null bytes of the S16 values
+    return UUID(bytes=bytes(value).ljust(16, b"\0"))
+
+
+class FoodCatalogSnapshot:
+    """
+    The food catalog in columns, one row per food sorted by id, saved as .npy files and mapped
+    read-only, so the processes of a host share a single copy of it in the page cache.
+
+    The ids are 16 byte strings, searched with a binary search instead of a dictionary per process,
+    the descriptions a single UTF-8 buffer with the offset of each one, the nutrients float64
+    columns and the timestamps microseconds since the epoch. The category of each food is a
+    position in `category_ids`.
+    """
+
+    def __init__(self, path: str, generation: int, version: str):
+        self.generation = generation
+        self.version = version
+
+        self.__columns = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in SNAPSHOT_COLUMNS
+        }
+        self.ids = self.__columns["ids"]
+        self.category_ids = self.__columns["category_ids"]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ----------- PUBLIC METHODS -----------
+    @staticmethod
+    def write(path: str, foods: List[Tuple]) -> None:
+        """`foods` are rows with every one of FOOD_FIELDS"""
+        foods = sorted(foods, key=lambda food: food[0].bytes)
+        fields = dict(zip(FOOD_FIELDS, zip(*foods))) if foods else {}
+
+        def field(name: str) -> tuple:
+            return fields.get(name, ())
+
+        descriptions = [description.encode() for description in field("description")]
+        category_ids = sorted(set(field("food_category_id")), key=lambda category: category.bytes)
+        category_positions = {category_id: row for row, category_id in enumerate(category_ids)}
+
+        columns = {
+            "ids": np.array([food_id.bytes for food_id in field("id")], dtype="S16"),
+            "descriptions": np.frombuffer(b"".join(descriptions), dtype=np.uint8),
+            "description_offsets": np.cumsum(
+                [0, *(len(description) for description in descriptions)], dtype=np.int64
+            ),
+            "category_ids": np.array([category.bytes for category in category_ids], dtype="S16"),
+            "category": np.array(
+                [category_positions[category] for category in field("food_category_id")],
+                dtype=np.int64,
+            ),
+            **{
+                name: np.array(
+                    [np.nan if value is None else value for value in field(name)],
+                    dtype=np.float64,
+                )
+                for name in NUTRIENT_COLUMNS
+            },
+            **{
+                name: np.array(
+                    [round(value.timestamp() * 1_000_000) for value in field(name)],
+                    dtype=np.int64,
+                )
+                for name in TIMESTAMP_COLUMNS
+            },
+        }
+
+        # written aside and renamed, never seen half written
+        shutil.rmtree(f"{path}.tmp", ignore_errors=True)
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(f"{path}.tmp")
+        for name, column in columns.items():
+            np.save(os.path.join(f"{path}.tmp", f"{name}.npy"), column)
+        os.rename(f"{path}.tmp", path)
+
+    def rows(self, food_ids: Iterable[Any]) -> np.ndarray:
+        """The row of each food, -1 for the foods out of the catalog"""
+        keys = np.array([UUID(str(food_id)).bytes for food_id in food_ids], dtype="S16")
+        if not len(self) or not len(keys):
+            return np.full(len(keys), -1, dtype=np.int64)
+
+        rows = np.searchsorted(self.ids, keys)
+        found = rows < len(self)
+        found[found] = self.ids[rows[found]] == keys[found]
+        return np.where(found, rows, -1)
+
+    def mask(self, food_ids: Iterable[Any]) -> np.ndarray:
+        """A mask over the rows of the catalog, set for the given foods"""
+        rows = self.rows(food_ids)
+
+        mask = np.zeros(len(self), dtype=bool)
+        mask[rows[rows >= 0]] = True
+        return mask
+
+    def column(self, name: str) -> np.ndarray:
+        return self.__columns[name]
+
+    def foods(self, rows: np.ndarray) -> List[Dict[str, Any]]:
+        """The fields of the foods in `rows`, as the keyword arguments of a FoodDto"""
+        rows = np.asarray(rows, dtype=np.int64)
+        offsets = self.__columns["description_offsets"]
+        descriptions = self.__columns["descriptions"]
+        ids = self.ids[rows]
+        categories = self.category_ids[self.__columns["category"][rows]]
+        nutrients = {name: self.__columns[name][rows].tolist() for name in NUTRIENT_COLUMNS}
+        timestamps = {name: self.__columns[name][rows].tolist() for name in TIMESTAMP_COLUMNS}
+        # in the time zone the database sessions return them
+        time_zone = ZoneInfo(APP_TZ)
+
+        return [
+            {
+                "id": to_uuid(ids[index]),
+                "description": bytes(descriptions[offsets[row] : offsets[row + 1]]).decode(),
+                **{
+                    name: None if np.isnan(values[index]) else values[index]
+                    for name, values in nutrients.items()
+                },
+                **{
+                    name: datetime.fromtimestamp(values[index] / 1_000_000, time_zone)
+                    for name, values in timestamps.items()
+                },
+                "deleted_at": None,
+                "food_category": to_uuid(categories[index]),
+            }
+            for index, row in enumerate(rows.tolist())
+        ]
+
+
+class FoodCatalogSnapshotStore:
+    """
+    The snapshots of a catalog in `directory`, one sub directory per generation. The generation
+    and the catalog version it holds are in the CURRENT file: the first process to see a newer
+    catalog version writes the next generation under a file lock, and the others map it when they
+    see the new generation. Only the last two generations are kept, as a process may be mapping the
+    previous one.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.snapshot: Optional[FoodCatalogSnapshot] = None
+
+    # ----------- PUBLIC METHODS -----------
+    def get(
+        self, version: Hashable, load_foods: Callable[[], List[Tuple]], force: bool = False
+    ) -> FoodCatalogSnapshot:
+        """The snapshot of the catalog `version`, written from `load_foods` if not there yet"""
+        version = str(version)
+        if not force and self.snapshot is not None and self.snapshot.version == version:
+            return self.snapshot
+
+        while True:
+            generation, current_version = self.__read_current()
+            if force or current_version != version:
+                os.makedirs(self.directory, exist_ok=True)
+                with self.__lock():
+                    generation, current_version = self.__read_current()
+                    if force or current_version != version:
+                        generation += 1
+                        FoodCatalogSnapshot.write(self.__path(generation), load_foods())
+                        self.__write_current(generation, version)
+                        self.__remove_generations_before(generation - 1)
+                force = False
+
+            if self.snapshot is not None and self.snapshot.generation == generation:
+                return self.snapshot
+
+            try:
+                self.snapshot = FoodCatalogSnapshot(self.__path(generation), generation, version)
+                return self.snapshot
+            except FileNotFoundError:
+                # other processes wrote two generations since CURRENT was read, and removed this
+                # one before it was mapped: the next read of CURRENT points to a newer one
+                continue
+
+    # ----------- PRIVATE METHODS -----------
+    def __path(self, generation: int) -> str:
+        return os.path.join(self.directory, str(generation))
+
+    def __read_current(self) -> Tuple[int, Optional[str]]:
+        try:
+            with open(os.path.join(self.directory, "CURRENT")) as file:
+                current = json.load(file)
+        except FileNotFoundError:
+            return 0, None
+
+        return current["generation"], current["version"]
+
+    def __write_current(self, generation: int, version: str) -> None:
+        path = os.path.join(self.directory, "CURRENT")
+        with open(f"{path}.tmp", "w") as file:
+            json.dump({"generation": generation, "version": version}, file)
+        os.replace(f"{path}.tmp", path)
+
+    def __remove_generations_before(self, generation: int) -> None:
+        for name in os.listdir(self.directory):
+            if name.isdigit() and int(name) < generation:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    @contextmanager
+    def __lock(self) -> Iterator[None]:
+        with open(os.path.join(self.directory, "LOCK"), "w") as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
@@ -0,0 +1,93 @@
+from typing import Any, Dict, Hashable, List, Tuple
+
+import numpy as np
+
+NO_CATEGORY = -1
+
+
+class FoodCategoryIndex:
+    """
+    The food category tree in arrays. Categories are numbered in depth-first order and foods are
+    laid out in the order of their categories, so the foods under a category, at any depth, are the
+    contiguous range `food_start[category]:food_end[category]` and every lookup is O(1).
+    """
+
+    def __init__(
+        self,
+        version: Hashable,
+        categories: List[Tuple[Any, Any]],
+        foods: List[Tuple[Any, Any]],
+    ):
+        """
+        `categories` are (id, parent id) pairs and `foods` (id, category id) pairs. `version`
+        identifies the catalog the index was built from.
+        """
+        self.version = version
+
+        children: Dict[Any, List[Any]] = {}
+        for category_id, parent_id in categories:
+            children.setdefault(parent_id, []).append(category_id)
+        category_foods: Dict[Any, List[Any]] = {}
+        for food_id, category_id in foods:
+            category_foods.setdefault(category_id, []).append(food_id)
+
+        known_categories = {category_id for category_id, _ in categories}
+        roots = [
+            category_id
+            for category_id, parent_id in categories
+            if parent_id is None or parent_id not in known_categories
+        ]
+
+        self.category_ids: List[Any] = []
+        self.category_positions: Dict[Any, int] = {}
+        self.food_ids: List[Any] = []
+        self.food_positions: Dict[Any, int] = {}
+        parent, root, depth, food_start, food_end, food_category = [], [], [], [], [], []
+
+        for root_id in roots:
+            # (category id, parent position, leaving) - a category is left after its subtree
+            stack = [(root_id, NO_CATEGORY, False)]
+            while stack:
+                category_id, parent_position, leaving = stack.pop()
+                if leaving:
+                    food_end[self.category_positions[category_id]] = len(self.food_ids)
+                    continue
+
+                position = len(self.category_ids)
+                self.category_ids.append(category_id)
+                self.category_positions[category_id] = position
+                parent.append(parent_position)
+                root.append(position if parent_position == NO_CATEGORY else root[parent_position])
+                depth.append(0 if parent_position == NO_CATEGORY else depth[parent_position] + 1)
+
+                food_start.append(len(self.food_ids))
+                food_end.append(len(self.food_ids))
+                for food_id in category_foods.get(category_id, []):
+                    self.food_positions[food_id] = len(self.food_ids)
+                    self.food_ids.append(food_id)
+                    food_category.append(position)
+
+                stack.append((category_id, position, True))
+                stack.extend(
+                    (child_id, position, False)
+                    for child_id in reversed(children.get(category_id, []))
+                    if child_id not in self.category_positions
+                )
+
+        self.parent = np.array(parent, dtype=np.int64)
+        self.root = np.array(root, dtype=np.int64)
+        self.depth = np.array(depth, dtype=np.int64)
+        self.food_start = np.array(food_start, dtype=np.int64)
+        self.food_end = np.array(food_end, dtype=np.int64)
+        self.food_category = np.array(food_category, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.category_ids)
+
+    # ----------- PUBLIC METHODS -----------
+    def get_root_id(self, category_id: Any) -> Any:
+        return self.category_ids[self.root[self.category_positions[category_id]]]
+
+    def get_descendant_food_ids(self, category_id: Any) -> List[Any]:
+        position = self.category_positions[category_id]
+        return self.food_ids[self.food_start[position] : self.food_end[position]]
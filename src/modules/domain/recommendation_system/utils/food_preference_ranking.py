@@ -0,0 +1,78 @@
+from typing import List, Optional
+
+import numpy as np
+
+from src.modules.domain.recommendation_system.dto.user_preferences_table_dto import (
+    DetailedUserPreferencesTable,
+)
+from src.modules.domain.recommendation_system.utils.food_catalog_snapshot import (
+    FoodCatalogSnapshot,
+)
+
+
+class FoodPreferenceRanking:
+    """
+    The foods of a user from the highest score to the lowest, as their rows in the food catalog and
+    their scores, in the order of the (user_id, score, food_id) index they are read from. A page of
+    it is selected on the arrays, and only the foods of the page are turned into DTOs; the DTOs of
+    the whole ranking are built once, when asked for, and kept.
+    """
+
+    def __init__(self, food_catalog: FoodCatalogSnapshot, rows: np.ndarray, scores: np.ndarray):
+        self.food_catalog = food_catalog
+        self.rows = rows
+        self.scores = scores
+
+        self.__foods: Optional[List[DetailedUserPreferencesTable]] = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    # ----------- PUBLIC METHODS -----------
+    def select(
+        self,
+        excluded: np.ndarray = None,
+        min_score: int = None,
+        offset: int = 0,
+        limit: int = None,
+    ) -> np.ndarray:
+        """
+        The positions in the ranking of a page of its foods, leaving out the catalog rows set in
+        `excluded` and, as the scores are sorted, cutting the ranking at the first score under
+        `min_score`.
+        """
+        end = len(self)
+        if min_score is not None:
+            end = int(np.searchsorted(-self.scores, -min_score, side="right"))
+
+        positions = np.arange(end)
+        if excluded is not None:
+            positions = positions[~excluded[self.rows[:end]]]
+
+        return positions[offset : None if limit is None else offset + limit]
+
+    def foods(
+        self, positions: np.ndarray = None, build_all: bool = False
+    ) -> List[DetailedUserPreferencesTable]:
+        """
+        The foods at `positions`, every food of the ranking by default. Only the DTOs of the given
+        foods are built, unless `build_all` or the DTOs of the whole ranking were built already.
+        """
+        if self.__foods is None and (positions is None or build_all):
+            self.__foods = self.__build_foods(np.arange(len(self)))
+
+        if self.__foods is None:
+            return self.__build_foods(positions)
+        if positions is None or len(positions) == len(self):
+            return self.__foods
+
+        return [self.__foods[position] for position in positions.tolist()]
+
+    # ----------- PRIVATE METHODS -----------
+    def __build_foods(self, positions: np.ndarray) -> List[DetailedUserPreferencesTable]:
+        return [
+            DetailedUserPreferencesTable(**food, score=score)
+            for food, score in zip(
+                self.food_catalog.foods(self.rows[positions]), self.scores[positions].tolist()
+            )
+        ]
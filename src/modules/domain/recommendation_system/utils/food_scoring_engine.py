@@ -0,0 +1,101 @@
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from src.modules.domain.recommendation_system.utils.food_category_index import (
+    NO_CATEGORY,
+    FoodCategoryIndex,
+)
+
+# Score of a food liked (or disliked, negated) by the user and of the foods around it, by how close
+# they are in the category tree of the liked one
+SAME_FOOD_SCORE = 50
+SAME_CATEGORY_SCORE = 25
+SAME_PARENT_CATEGORY_SCORE = 12
+SAME_ROOT_CATEGORY_SCORE = 7
+
+
+class FoodScoringEngine:
+    """
+    The food catalog as NumPy arrays, one row per food, with the category, parent category and
+    root category of each row. The scores of every preference are computed with a scatter-add per
+    level of the category tree, instead of a scan of the catalog per graded food. `version` is the
+    catalog version of the category index the engine was built with.
+
+    A food in the same category as a liked one is also under the same parent and root categories,
+    so each level only adds the difference to the level above: the root category of a preference
+    gives 7 to its foods, the parent 12 - 7 more, the category 25 - 12 more and the food itself
+    50 - 25 more.
+    """
+
+    def __init__(self, foods: List[Tuple[Any, Any]], category_index: FoodCategoryIndex):
+        """`foods` are (id, category id) pairs, as given to the FoodCategoryIndex"""
+        self.version = category_index.version
+        self.food_ids = [food_id for food_id, _ in foods]
+        self.food_index: Dict[Any, int] = {
+            food_id: row for row, food_id in enumerate(self.food_ids)
+        }
+
+        # categories not in the index (and no category) point to an extra slot, never awarded
+        self.categories_size = len(category_index) + 1
+        missing = self.categories_size - 1
+
+        self.category = np.array(
+            [
+                category_index.category_positions.get(category_id, missing)
+                for _, category_id in foods
+            ],
+            dtype=np.int64,
+        )
+        parents = np.append(
+            np.where(category_index.parent == NO_CATEGORY, missing, category_index.parent), missing
+        )
+        self.parent_category = parents[self.category]
+        self.root_category = np.append(category_index.root, missing)[self.category]
+
+    def __len__(self) -> int:
+        return len(self.food_ids)
+
+    # ----------- PUBLIC METHODS -----------
+    def new_scores(self) -> np.ndarray:
+        return np.zeros(len(self), dtype=np.int64)
+
+    def award(self, scores: np.ndarray, food_ids: Iterable[Any], score: Any) -> None:
+        """
+        Add a score, or one score per food, to the given foods. Foods given more than once are
+        awarded every time and foods out of the catalog are ignored.
+        """
+        rows, scores_to_award = self.__get_rows(food_ids, score)
+        np.add.at(scores, rows, scores_to_award)
+
+    def award_preferences(
+        self, scores: np.ndarray, food_ids: Iterable[Any], signs: Iterable[int]
+    ) -> None:
+        """
+        Score every food around the preferred ones, `signs` being 1 for the liked foods and -1 for
+        the disliked ones.
+        """
+        rows, signs = self.__get_rows(food_ids, signs)
+        missing = self.categories_size - 1
+
+        for level, increment in (
+            (self.root_category, SAME_ROOT_CATEGORY_SCORE),
+            (self.parent_category, SAME_PARENT_CATEGORY_SCORE - SAME_ROOT_CATEGORY_SCORE),
+            (self.category, SAME_CATEGORY_SCORE - SAME_PARENT_CATEGORY_SCORE),
+        ):
+            totals = np.zeros(self.categories_size, dtype=np.int64)
+            awarded = level[rows] != missing
+            np.add.at(totals, level[rows][awarded], signs[awarded])
+            scores += totals[level] * increment
+
+        np.add.at(scores, rows, signs * (SAME_FOOD_SCORE - SAME_CATEGORY_SCORE))
+
+    # ----------- PRIVATE METHODS -----------
+    def __get_rows(self, food_ids: Iterable[Any], values: Any) -> Tuple[np.ndarray, np.ndarray]:
+        food_ids = list(food_ids)
+        values = np.broadcast_to(np.asarray(values, dtype=np.int64), (len(food_ids),))
+
+        in_catalog = [index for index, food_id in enumerate(food_ids) if food_id in self.food_index]
+        rows = np.array([self.food_index[food_ids[index]] for index in in_catalog], dtype=np.int64)
+
+        return rows, values[in_catalog]
@@ -0,0 +1,100 @@
+from typing import Any, Dict, Hashable, Iterable, List, Tuple
+
+import numpy as np
+
+from src.modules.domain.recommendation_system.utils.item_food_matrix import ItemFoodMatrix
+
+# Bits of the can eat at masks, one per type of meal
+MAX_TYPES_OF_MEAL = 64
+
+
+class ItemCatalog:
+    """
+    Every item with the types of meal it can be eaten at and, in an ItemFoodMatrix, its foods. Built
+    from two set-based queries once per catalog version, instead of loading the items and their
+    relationships one by one on every plan completion.
+
+    The types of meal of the items are kept as (item row, type of meal position) pairs, turned into
+    a bitmask per item for the types of meal of a plan, so the items of a meal are selected with a
+    single bitwise AND over the items.
+    """
+
+    def __init__(
+        self,
+        version: Hashable,
+        items: List[Tuple[Any, str, List[Any]]],
+        item_has_foods: List[Tuple[Any, Any, float]],
+    ):
+        """
+        `items` are (item id, description, type of meal ids) triples and `item_has_foods` (item id,
+        food id, amount in grams) ones
+        """
+        self.version = version
+
+        self.item_ids: List[Any] = [item_id for item_id, _, _ in items]
+        self.item_index: Dict[Any, int] = {
+            item_id: row for row, item_id in enumerate(self.item_ids)
+        }
+        self.descriptions = np.array([description for _, description, _ in items], dtype=object)
+
+        self.type_of_meal_ids: List[Any] = list(
+            dict.fromkeys(
+                type_of_meal_id for _, _, can_eat_at in items for type_of_meal_id in can_eat_at
+            )
+        )
+        type_of_meal_index = {
+            type_of_meal_id: position
+            for position, type_of_meal_id in enumerate(self.type_of_meal_ids)
+        }
+        self.can_eat_at_rows = np.array(
+            [row for row, (_, _, can_eat_at) in enumerate(items) for _ in can_eat_at],
+            dtype=np.int64,
+        )
+        self.can_eat_at_types = np.array(
+            [
+                type_of_meal_index[type_of_meal_id]
+                for _, _, can_eat_at in items
+                for type_of_meal_id in can_eat_at
+            ],
+            dtype=np.int64,
+        )
+
+        self.item_food_matrix = ItemFoodMatrix(version, item_has_foods)
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    # ----------- PUBLIC METHODS -----------
+    def allowed_rows(self, allowed_food_ids: Iterable[Any]) -> np.ndarray:
+        """The rows of the items whose foods are all allowed, items without foods included"""
+        allowed_food_ids = list(allowed_food_ids)
+        allowed = self.item_food_matrix.food_vector(allowed_food_ids, [1] * len(allowed_food_ids))
+
+        disallowed_foods = self.item_food_matrix.multiply(self.item_ids, 1 - allowed, False)
+        return np.flatnonzero(disallowed_foods == 0)
+
+    def can_eat_at_masks(self, rows: np.ndarray, type_of_meal_bits: Dict[Any, int]) -> np.ndarray:
+        """
+        The bitmask of the types of meal each item in `rows` can be eaten at, with the bit of each
+        type of meal given in `type_of_meal_bits` (up to MAX_TYPES_OF_MEAL bits); the other types
+        of meal are left out.
+        """
+        bits = np.array(
+            [
+                type_of_meal_bits.get(type_of_meal_id, 0)
+                for type_of_meal_id in self.type_of_meal_ids
+            ],
+            dtype=np.uint64,
+        )
+
+        masks = np.zeros(len(self), dtype=np.uint64)
+        np.bitwise_or.at(masks, self.can_eat_at_rows, bits[self.can_eat_at_types])
+        return masks[rows]
+
+    @staticmethod
+    def type_of_meal_bits(type_of_meal_ids: Iterable[Any]) -> Dict[Any, int]:
+        """A bit per type of meal, for the can eat at masks of at most MAX_TYPES_OF_MEAL of them"""
+        return {
+            type_of_meal_id: 1 << bit
+            for bit, type_of_meal_id in enumerate(dict.fromkeys(type_of_meal_ids))
+        }
@@ -0,0 +1,68 @@
+from typing import Any, Dict, Hashable, Iterable, List, Tuple
+
+import numpy as np
+
+from src.core.constants.default_values import DEFAULT_AMOUNT_GRAMS
+
+
+class ItemFoodMatrix:
+    """
+    The foods of every item as a sparse item x food matrix, in coordinate form: one entry per
+    item_has_food row with the amount of the food in the item, in servings of DEFAULT_AMOUNT_GRAMS.
+
+    Multiplying it by a dense vector of food values gives the value of each item in one step, the
+    nutrients of an item being the sum of the nutrients of its foods weighted by their amounts.
+    """
+
+    def __init__(self, version: Hashable, item_has_foods: List[Tuple[Any, Any, float]]):
+        """`item_has_foods` are (item id, food id, amount in grams) triples"""
+        self.version = version
+
+        self.item_ids: List[Any] = list(dict.fromkeys(item_id for item_id, _, _ in item_has_foods))
+        self.item_index: Dict[Any, int] = {
+            item_id: row for row, item_id in enumerate(self.item_ids)
+        }
+        self.food_ids: List[Any] = list(dict.fromkeys(food_id for _, food_id, _ in item_has_foods))
+        self.food_index: Dict[Any, int] = {
+            food_id: column for column, food_id in enumerate(self.food_ids)
+        }
+
+        self.rows = np.array(
+            [self.item_index[item_id] for item_id, _, _ in item_has_foods], dtype=np.int64
+        )
+        self.columns = np.array(
+            [self.food_index[food_id] for _, food_id, _ in item_has_foods], dtype=np.int64
+        )
+        self.amounts = np.array(
+            [amount_grams / DEFAULT_AMOUNT_GRAMS for _, _, amount_grams in item_has_foods],
+            dtype=np.float64,
+        )
+
+    # ----------- PUBLIC METHODS -----------
+    def food_vector(self, food_ids: Iterable[Any], values: Iterable[Any]) -> np.ndarray:
+        """
+        Values given per food as a dense vector over the food columns, 0 for the foods not given and
+        NaN for the ones given without a value.
+        """
+        vector = np.zeros(len(self.food_ids), dtype=np.float64)
+        for food_id, value in zip(food_ids, values):
+            column = self.food_index.get(food_id)
+            if column is not None:
+                vector[column] = np.nan if value is None else value
+
+        return vector
+
+    def multiply(
+        self, item_ids: Iterable[Any], food_vector: np.ndarray, weighted: bool = True
+    ) -> np.ndarray:
+        """
+        The matrix times `food_vector`, for the given items (0 for items without foods). Without
+        `weighted` every food counts once, whatever its amount in the item.
+        """
+        weights = food_vector[self.columns]
+        if weighted:
+            weights = weights * self.amounts
+
+        totals = np.append(np.bincount(self.rows, weights, minlength=len(self.item_ids)), 0)
+        missing = len(self.item_ids)
+        return totals[[self.item_index.get(item_id, missing) for item_id in item_ids]]
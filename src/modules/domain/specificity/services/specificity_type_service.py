@@ -44,5 +44,5 @@ class SpecificityTypeService:
             specificity_type_dto, db
         )
 
-        new_specificity_type = self.specificity_type_repository.save(new_specificity_type, db)
+        new_specificity_type = await self.specificity_type_repository.save(new_specificity_type, db)
         return SpecificityTypeDto(**new_specificity_type.__dict__)
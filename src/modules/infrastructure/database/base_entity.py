@@ -16,7 +16,9 @@ class BaseEntity(Base):
 
     id: UUID = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     created_at: DateTime = Column(DateTime(timezone=True), nullable=False)
-    updated_at: DateTime = Column(DateTime(timezone=True), nullable=False)
+    updated_at: DateTime = Column(
+        DateTime(timezone=True), nullable=False, info={"update_column": True}
+    )
     deleted_at: DateTime = Column(
         DateTime(timezone=True), nullable=True, info={"delete_column": True}
     )
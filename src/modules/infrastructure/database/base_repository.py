@@ -1,12 +1,23 @@
-import asyncio
-from datetime import datetime
-from typing import Any, Generic, List, Optional, Tuple, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-import cachetools as cachetools
 from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.inspection import inspect
-from sqlalchemy.orm import Session
-from sqlalchemy_utils import get_class_by_table, get_columns
+from sqlalchemy.orm import Mapper, Query, Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from src.core.types.delete_result_type import DeleteResult
 from src.core.types.exceptions_type import NotFoundException
@@ -15,16 +26,21 @@ from src.core.types.find_one_options_type import FindOneOptions
 from src.core.types.update_result_type import UpdateResult
 from src.core.utils.database_utils import DatabaseUtils
 from . import get_db
-from .base import Base
+from .entity_registry import entity_registry
+from .identity_cache import get_identity_cache
+from .repository_methods.count_estimate import estimate_count
 from .repository_methods.query_constructor import QueryConstructor
+from .repository_methods.soft_delete_cascade import SoftDeleteCascade
 from .repository_methods.soft_delete_filter import pause_listener
+from .repository_methods.table_versions import mark_written_tables
 
 T = TypeVar("T")
+R = TypeVar("R")
+DbSession = Union[Session, AsyncSession]
 
-
-CACHE_SIZE = 1000  # 1000 items
-CACHE_TTL = 60 * 60  # 1 hour
-cache = cachetools.TTLCache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+BULK_INSERT_SIZE = 1000  # rows per INSERT statement
+# find options that only shape the page, left out when counting the rows
+PAGE_OPTIONS = ("select", "relations", "order_by", "skip", "take", "seek")
 
 
 class BaseRepository(Generic[T]):
@@ -33,52 +49,153 @@ class BaseRepository(Generic[T]):
     def __init__(self, entity: T):
         self.entity = entity
         self.query_constructor = QueryConstructor(entity)
+        self.soft_delete_cascade = SoftDeleteCascade(entity)
 
     # ----------- PUBLIC METHODS -----------
     async def find(
-        self, options_dict: FindManyOptions = None, db: Session = next(get_db())
+        self, options_dict: FindManyOptions = None, db: DbSession = next(get_db())
     ) -> Optional[List[T]]:
-        with pause_listener.pause(options_dict if options_dict else False):
-            query = self.query_constructor.build_query(db, options_dict)
+        return await BaseRepository.__run(db, self.__find, options_dict)
+
+    async def find_and_count(
+        self, options_dict: FindManyOptions = None, db: DbSession = next(get_db())
+    ) -> Optional[Tuple[List[T], Optional[int]]]:
+        return await BaseRepository.__run(db, self.__find_and_count, options_dict)
+
+    async def find_one(
+        self, criteria: Union[str, int, FindOneOptions], db: DbSession
+    ) -> Optional[T]:
+        return await BaseRepository.__run(db, self.__find_one, criteria)
+
+    async def find_one_or_fail(
+        self, criteria: Union[str, int, FindOneOptions], db: DbSession
+    ) -> Optional[T]:
+        return await BaseRepository.__run(db, self.__find_one_or_fail, criteria)
+
+    async def create(self, _entity: Union[T, BaseModel], db: DbSession) -> T:
+        return await BaseRepository.__run(db, self.__create, _entity)
+
+    async def create_many(self, _entities: List[Union[T, BaseModel]], db: DbSession) -> List[T]:
+        return await BaseRepository.__run(db, self.__create_many, _entities)
+
+    async def upsert_many(
+        self,
+        _entities: List[Union[T, BaseModel]],
+        db: DbSession,
+        index_elements: List[str] = None,
+    ) -> List[T]:
+        return await BaseRepository.__run(db, self.__upsert_many, _entities, index_elements)
+
+    @staticmethod
+    async def save(
+        _entity: Union[T, List[T]] = None, db: DbSession = next(get_db())
+    ) -> Optional[T]:
+        return await BaseRepository.__run(db, BaseRepository.__save, _entity)
+
+    async def delete(
+        self, criteria: Union[str, int, FindOneOptions], db: DbSession
+    ) -> Optional[DeleteResult]:
+        return await BaseRepository.__run(db, self.__delete, criteria)
+
+    async def soft_delete(
+        self, criteria: Union[str, int, FindOneOptions], db: DbSession
+    ) -> Optional[UpdateResult]:
+        return await BaseRepository.__run(db, self.__soft_delete, criteria)
+
+    async def update(
+        self,
+        criteria: Union[str, int, FindOneOptions],
+        partial_entity: Union[BaseModel, dict],
+        db: DbSession,
+    ) -> Optional[UpdateResult]:
+        return await BaseRepository.__run(db, self.__update, criteria, partial_entity)
+
+    @staticmethod
+    async def refresh_entity(entity: Union[T, List[T]], db: DbSession) -> Union[T, List[T]]:
+        return await BaseRepository.__run(db, BaseRepository.__refresh_entity, entity)
+
+    # ----------- PRIVATE METHODS -----------
+    @staticmethod
+    async def __run(db: DbSession, fn: Callable[..., R], *args) -> R:
+        """
+        Every repository operation is written against a sync Session. With an AsyncSession it is run
+        through run_sync, so the QueryConstructor, the soft-delete filter and the nested transactions
+        keep working unchanged while the driver I/O is awaited on the event loop.
+        """
+        if isinstance(db, AsyncSession):
+            return await db.run_sync(fn, *args)
+
+        return fn(db, *args)
+
+    def __find(self, db: Session, options_dict: FindManyOptions = None) -> Optional[List[T]]:
+        with_deleted = DatabaseUtils.is_with_deleted_data(options_dict)
+
+        with pause_listener.pause(with_deleted):
+            query = self.query_constructor.build_query(db, options_dict, with_deleted=with_deleted)
             result = query.all()
 
-            if (
-                result
-                and not DatabaseUtils.is_with_deleted_data(options_dict)
-                and DatabaseUtils.should_apply_filter(
-                    query, DatabaseUtils.get_column_represent_deleted(get_columns(self.entity))
-                )
-            ):
-                tasks = [
-                    self.__remove_deleted_relations(db, element, options_dict) for element in result
-                ]
-                result = await asyncio.gather(*tasks)
+            if result and not with_deleted and self.__should_apply_filter(query):
+                BaseRepository.__remove_deleted_foreign_keys(db, result, options_dict)
 
             return result
 
-    async def find_and_count(
-        self, options_dict: FindManyOptions = None, db: Session = next(get_db())
-    ) -> Optional[Tuple[List[T], int]]:
-        with pause_listener.pause(options_dict if options_dict else False):
-            query = self.query_constructor.build_query(db, options_dict)
-            count = query.offset(None).limit(None).count()
-            result = query.all()
+    def __find_and_count(
+        self, db: Session, options_dict: FindManyOptions = None
+    ) -> Optional[Tuple[List[T], Optional[int]]]:
+        with_deleted = DatabaseUtils.is_with_deleted_data(options_dict)
+        estimate = DatabaseUtils.is_estimated_count(options_dict)
+        skip = options_dict.get("skip") or 0 if options_dict else 0
+        after_cursor = bool(options_dict and options_dict.get("seek", {}).get("where"))
 
-            if (
-                result
-                and not DatabaseUtils.is_with_deleted_data(options_dict)
-                and DatabaseUtils.should_apply_filter(
-                    query, DatabaseUtils.get_column_represent_deleted(get_columns(self.entity))
-                )
-            ):
-                tasks = [
-                    self.__remove_deleted_relations(db, element, options_dict) for element in result
-                ]
-                result = await asyncio.gather(*tasks)
+        with pause_listener.pause(with_deleted):
+            query = self.query_constructor.build_query(db, options_dict, with_deleted=with_deleted)
+
+            if estimate:
+                result = query.all()
+                count = self.__count(db, options_dict, with_deleted, estimate)
+
+            elif after_cursor:
+                # The first page of a cursor already had the total, the next ones are not counted
+                result = query.all()
+                count = None
+
+            elif options_dict and "take" in options_dict:
+                # The total comes with the page in the same statement. The window is computed
+                # before the LIMIT, in the subquery the joined collections are loaded around
+                rows = query.add_columns(func.count().over()).all()
+                result = [row[0] for row in rows]
+                count = rows[0][1] if rows else None
+
+            else:
+                result = query.all()
+                count = skip + len(result) if result else None
+
+            if count is None and not after_cursor:
+                # Only a page past the last row needs its own count
+                count = self.__count(db, options_dict, with_deleted) if skip else 0
+
+            if result and not with_deleted and self.__should_apply_filter(query):
+                BaseRepository.__remove_deleted_foreign_keys(db, result, options_dict)
 
             return result, count
 
-    async def find_one(self, criteria: Union[str, int, FindOneOptions], db: Session) -> Optional[T]:
+    def __count(
+        self,
+        db: Session,
+        options_dict: FindManyOptions,
+        with_deleted: bool,
+        estimate: bool = False,
+    ) -> int:
+        # Every row matching the criteria, not only the page or the rows after the cursor
+        query = self.query_constructor.build_query(
+            db,
+            {key: value for key, value in (options_dict or {}).items() if key not in PAGE_OPTIONS},
+            with_deleted=with_deleted,
+        )
+
+        return estimate_count(db, query) if estimate else query.count()
+
+    def __find_one(self, db: Session, criteria: Union[str, int, FindOneOptions]) -> Optional[T]:
         with_deleted = (
             DatabaseUtils.is_with_deleted_data(criteria)
             if not isinstance(criteria, (str, int))
@@ -86,24 +203,18 @@ class BaseRepository(Generic[T]):
         )
 
         with pause_listener.pause(with_deleted):
-            query = self.query_constructor.build_query(db, criteria)
+            query = self.query_constructor.build_query(db, criteria, with_deleted=with_deleted)
             result = query.first()
 
-            if (
-                result
-                and not with_deleted
-                and DatabaseUtils.should_apply_filter(
-                    query, DatabaseUtils.get_column_represent_deleted(get_columns(self.entity))
-                )
-            ):
-                result = await self.__remove_deleted_relations(db, result, criteria)
+            if result and not with_deleted and self.__should_apply_filter(query):
+                BaseRepository.__remove_deleted_foreign_keys(db, [result], criteria)
 
             return result
 
-    async def find_one_or_fail(
-        self, criteria: Union[str, int, FindOneOptions], db: Session
+    def __find_one_or_fail(
+        self, db: Session, criteria: Union[str, int, FindOneOptions]
     ) -> Optional[T]:
-        result = await self.find_one(criteria, db)
+        result = self.__find_one(db, criteria)
 
         if not result:
             message = f'Could not find any entity of type "{self.entity.__name__}" that matches the criteria'
@@ -111,40 +222,176 @@ class BaseRepository(Generic[T]):
 
         return result
 
-    async def create(self, _entity: Union[T, BaseModel], db: Session) -> T:
+    def __create(self, db: Session, _entity: Union[T, BaseModel]) -> T:
+        _entity = self.__to_entity(_entity)
+        self.__validate_relations(db, _entity.__dict__)
+
+        db.add(_entity)
+        db.flush()
+        BaseRepository.__invalidate_identity(db, _entity)
+        return _entity
+
+    def __create_many(self, db: Session, _entities: List[Union[T, BaseModel]]) -> List[T]:
+        if entity_registry.get(self.entity).flush_only:
+            return self.__add_many(db, _entities)
+
+        return self.__insert_many(db, _entities)
+
+    def __upsert_many(
+        self, db: Session, _entities: List[Union[T, BaseModel]], index_elements: List[str] = None
+    ) -> List[T]:
+        if entity_registry.get(self.entity).flush_only:
+            raise ValueError(
+                f"{self.entity.__name__} can not be upserted in bulk: its writes have to go through "
+                f"the flush"
+            )
+
+        return self.__insert_many(
+            db, _entities, index_elements or [entity_registry.get(self.entity).primary_key.key]
+        )
+
+    def __insert_many(
+        self,
+        db: Session,
+        _entities: List[Union[T, BaseModel]],
+        conflict_elements: List[str] = None,
+    ) -> List[T]:
+        """
+        Insert the entities with multi-row "INSERT ... RETURNING" statements and commit once (unless
+        inside a nested transaction). With conflict_elements it becomes an upsert, updating the
+        columns set by the caller on the conflicting rows. The rows never go through the flush, so
+        the entities followed by after_flush listeners (flush_only) are added by __add_many instead.
+        """
+        if not _entities:
+            return []
+
+        _entities = [self.__to_entity(_entity) for _entity in _entities]
+        for _entity in _entities:
+            if _entity in db:
+                # Added by a backref cascade: it is inserted below, not by the next flush
+                db.expunge(_entity)
+
+        self.__validate_relations(db, [_entity.__dict__ for _entity in _entities])
+
+        mapper = inspect(self.entity)
+        metadata = entity_registry.get(self.entity)
+        # A conflicting row keeps its identity, creation time and deletion state
+        kept_columns = {metadata.primary_key.key, "created_at", *(conflict_elements or [])}
+        if metadata.delete_column is not None:
+            kept_columns.add(metadata.delete_column.key)
+
+        updated_columns = {
+            key for _entity in _entities for key in mapper.columns.keys() if key in _entity.__dict__
+        } - kept_columns
+
+        rows = [BaseRepository.__get_insert_values(db, mapper, _entity) for _entity in _entities]
+
+        new_entities = []
+        for index in range(0, len(rows), BULK_INSERT_SIZE):
+            statement = insert(self.entity).values(rows[index : index + BULK_INSERT_SIZE])
+            if conflict_elements:
+                statement = statement.on_conflict_do_update(
+                    index_elements=conflict_elements,
+                    set_={key: statement.excluded[key] for key in updated_columns},
+                )
+
+            new_entities += (
+                db.execute(
+                    select(self.entity)
+                    .from_statement(statement.returning(*mapper.local_table.columns))
+                    .execution_options(populate_existing=True)
+                )
+                .scalars()
+                .all()
+            )
+
+        for _entity in new_entities:
+            BaseRepository.__invalidate_identity(db, _entity)
+        # written without the ORM, so the flush never sees them
+        mark_written_tables(db, [self.entity])
+
+        if not db.transaction.nested:
+            BaseRepository.__commit_keeping_state(db, new_entities)
+
+        return new_entities
+
+    def __add_many(self, db: Session, _entities: List[Union[T, BaseModel]]) -> List[T]:
+        """Add the entities with a single flush, and commit once like __insert_many"""
+        _entities = [self.__to_entity(_entity) for _entity in _entities]
+        self.__validate_relations(db, [_entity.__dict__ for _entity in _entities])
+
+        db.add_all(_entities)
+        db.flush()
+        for _entity in _entities:
+            BaseRepository.__invalidate_identity(db, _entity)
+
+        if not db.transaction.nested:
+            db.commit()
+
+        return _entities
+
+    @staticmethod
+    def __get_insert_values(db: Session, mapper: Mapper, _entity: T) -> dict:
+        # Core inserts skip the ORM flush, so the insert events (timestamps, hashes) are run here
+        mapper.dispatch.before_insert(mapper, db.connection(), inspect(_entity))
+
+        values = {}
+        for key, column in mapper.columns.items():
+            value = _entity.__dict__.get(key)
+            if value is None and column.default is not None:
+                value = (
+                    column.default.arg(None) if column.default.is_callable else column.default.arg
+                )
+
+            values[column.key] = value
+
+        return values
+
+    @staticmethod
+    def __commit_keeping_state(db: Session, _entities: List[T]) -> None:
+        # The values were just returned by the database: there is no need to expire them and load
+        # every row again on the next attribute access
+        values = [
+            {key: _entity.__dict__[key] for key in inspect(_entity).mapper.columns.keys()}
+            for _entity in _entities
+        ]
+        db.commit()
+
+        for _entity, entity_values in zip(_entities, values):
+            for key, value in entity_values.items():
+                set_committed_value(_entity, key, value)
+
+    def __to_entity(self, _entity: Union[T, BaseModel]) -> T:
         if isinstance(_entity, BaseModel):
             partial_data_entity = _entity.dict(exclude_unset=True)
             _entity = self.entity(**partial_data_entity)
 
-        await self.__is_relations_valid(db, _entity.__dict__)
-
-        db.add(_entity)
-        db.flush()
         return _entity
 
     @staticmethod
-    def save(_entity: Union[T, List[T]] = None, db: Session = next(get_db())) -> Optional[T]:
+    def __save(db: Session, _entity: Union[T, List[T]] = None) -> Optional[T]:
         db.commit()
 
         if _entity:
-            BaseRepository.refresh_entity(_entity, db)
+            BaseRepository.__refresh_entity(db, _entity)
         return _entity
 
-    async def delete(
-        self, criteria: Union[str, int, FindOneOptions], db: Session
+    def __delete(
+        self, db: Session, criteria: Union[str, int, FindOneOptions]
     ) -> Optional[DeleteResult]:
-        entity = await self.find_one_or_fail(criteria, db)
+        entity = self.__find_one_or_fail(db, criteria)
 
         db.delete(entity)
+        BaseRepository.__invalidate_identity(db, entity)
         db.flush() if db.transaction.nested else db.commit()
 
         return DeleteResult(raw=[], affected=1)
 
-    async def soft_delete(
-        self, criteria: Union[str, int, FindOneOptions], db: Session
+    def __soft_delete(
+        self, db: Session, criteria: Union[str, int, FindOneOptions]
     ) -> Optional[UpdateResult]:
         try:
-            response = await self.__soft_delete_cascade(criteria, db)
+            response = self.__soft_delete_cascade(criteria, db)
             db.flush() if db.transaction.nested else db.commit()
             return response
 
@@ -152,164 +399,193 @@ class BaseRepository(Generic[T]):
             db.rollback()
             raise e
 
-    async def update(
+    def __update(
         self,
+        db: Session,
         criteria: Union[str, int, FindOneOptions],
         partial_entity: Union[BaseModel, dict],
-        db: Session,
     ) -> Optional[UpdateResult]:
-        entity = await self.find_one_or_fail(criteria, db)
+        entity = self.__find_one_or_fail(db, criteria)
 
         if isinstance(partial_entity, BaseModel):
             partial_entity = partial_entity.dict(exclude_unset=True)
 
-        await self.__is_relations_valid(db, partial_entity)
+        self.__validate_relations(db, partial_entity)
 
         for key, value in partial_entity.items():
             setattr(entity, key, value)
 
+        BaseRepository.__invalidate_identity(db, entity)
         db.flush() if db.transaction.nested else db.commit()
         return UpdateResult(raw=[], affected=1, generatedMaps=[])
 
     @staticmethod
-    def refresh_entity(entity: Union[T, List[T]], db: Session) -> Union[T, List[T]]:
+    def __refresh_entity(db: Session, entity: Union[T, List[T]]) -> Union[T, List[T]]:
         db.refresh(entity) if not isinstance(entity, List) else (db.refresh(_en) for _en in entity)
         return entity
 
-    # ----------- PRIVATE METHODS -----------
-    async def __remove_deleted_relations(
-        self, db: Session, result: T, options_dict: FindManyOptions = None
-    ) -> T:
-        result_relationships = inspect(type(result)).relationships
-        fk_repositories = self.__get_repository_from_foreign_keys(result.__dict__)
-
-        for key, relation_property in result_relationships.items():
-            if BaseRepository.__should_remove_relation(key, options_dict):
-                for fk_repository, f_key, value in fk_repositories:
-                    if value:
-                        cache_key = (fk_repository, str(value), db)
-                        if cache_key in cache:
-                            _entity = cache[cache_key]
-                        else:
-                            _entity = await fk_repository.find_one(str(value), db)
-                            cache[cache_key] = _entity
-
-                        if _entity is None:
-                            setattr(result, f_key, None)
+    def __should_apply_filter(self, query: Query) -> bool:
+        return DatabaseUtils.should_apply_filter(
+            query, entity_registry.get(self.entity).delete_column
+        )
 
-            else:
-                if getattr(result, key):
-                    await self.__remove_deleted_relations_from_attribute(
-                        db, result, key, options_dict
-                    )
+    @staticmethod
+    def __remove_deleted_foreign_keys(
+        db: Session, results: List[T], criteria: Union[str, int, FindManyOptions] = None
+    ) -> None:
+        """
+        Clear the foreign keys that point to soft-deleted rows. The references are resolved level by
+        level (results, then the rows they refer to, and so on), with one query per foreign key
+        column of each level instead of one lookup per row. Relations loaded through the
+        "relations" option already come without deleted rows (see QueryConstructor).
+        """
+        relations = []
+        if isinstance(criteria, dict) and "relations" in criteria:
+            strategies = QueryConstructor.get_relation_strategies(
+                type(results[0]), criteria["relations"]
+            )
+            relations = [key for key, strategy in strategies.items() if strategy != "raise"]
 
-        return result
+        visited = set()
 
-    @staticmethod
-    def __should_remove_relation(relation_key: str, options_dict: FindManyOptions) -> bool:
-        if not options_dict or "relations" not in options_dict:
-            return True
+        while results:
+            visited.update(id(result) for result in results)
+            referred_entities = []
 
-        return relation_key not in options_dict["relations"]
+            for entity in {type(result) for result in results}:
+                entity_results = [result for result in results if type(result) is entity]
+                referred_entities += BaseRepository.__remove_deleted_foreign_keys_from_entity(
+                    db, entity, entity_results, relations
+                )
 
-    async def __remove_deleted_relations_from_attribute(
-        self, db: Session, result: T, attribute_key: str, options_dict: FindManyOptions
-    ) -> None:
-        attribute_value = getattr(result, attribute_key)
-        if not isinstance(attribute_value, list):
-            await self.__remove_deleted_relations_from_single_value(
-                db, result, attribute_key, options_dict
+            relations = []
+            results = list(
+                {id(_en): _en for _en in referred_entities if id(_en) not in visited}.values()
             )
-        else:
-            await self.__remove_deleted_relations_from_list(db, result, attribute_key, options_dict)
 
-    async def __remove_deleted_relations_from_single_value(
-        self, db: Session, result: T, attribute_key: str, options_dict: FindManyOptions
-    ) -> None:
-        single_value = getattr(result, attribute_key)
-        if DatabaseUtils.is_deleted(single_value):
-            setattr(result, attribute_key, None)
-        else:
-            new_result_key = await self.__remove_deleted_relations(db, single_value, options_dict)
-            setattr(result, attribute_key, new_result_key)
-
-    async def __remove_deleted_relations_from_list(
-        self, db: Session, result: T, attribute_key: str, options_dict: FindManyOptions
-    ) -> None:
-        attribute_list = getattr(result, attribute_key)
-        # new_list = [
-        #     await self.__remove_deleted_relations(db, element, options_dict)
-        #     for element in attribute_list
-        #     if not DatabaseUtils.is_deleted(element)
-        # ]
-        new_list = [element for element in attribute_list if not DatabaseUtils.is_deleted(element)]
-
-        setattr(result, attribute_key, new_list)
-
-    def __get_repository_from_foreign_keys(
-        self, entity_data: Union[BaseModel, dict]
-    ) -> List[Tuple["BaseRepository", str, Any]]:
-        foreign_keys = {
-            column.key: next(iter(column.foreign_keys)).constraint.referred_table
-            for column in get_columns(self.entity)
-            if column.foreign_keys
-        }
-
-        return [
-            (BaseRepository(get_class_by_table(Base, foreign_keys[key])), key, value)
-            for key, value in entity_data.items()
-            if key in foreign_keys
-        ]
+    @staticmethod
+    def __remove_deleted_foreign_keys_from_entity(
+        db: Session, entity: T, results: List[T], relations: List[str]
+    ) -> List[Any]:
+        referred_entities = []
+        relationships = inspect(entity).relationships
+
+        for key in relations:
+            if key in relationships and not relationships[key].uselist:
+                referred_entities += [
+                    result.__dict__[key] for result in results if result.__dict__.get(key)
+                ]
 
-    async def __is_relations_valid(
-        self, db: Session, partial_entity: Union[BaseModel, dict]
-    ) -> bool:
-        foreign_keys = {
-            column.key: column for column in get_columns(self.entity) if column.foreign_keys
-        }
+        if all(key in relations for key in relationships.keys()):
+            return referred_entities
 
-        fk_repositories = self.__get_repository_from_foreign_keys(partial_entity)
-        for fk_repository, key, value in fk_repositories:
-            if not value and foreign_keys[key].nullable:
+        metadata = entity_registry.get(entity)
+        for key, column in metadata.foreign_keys.items():
+            values = {result.__dict__.get(column.key) for result in results} - {None}
+            if not values:
                 continue
-            await fk_repository.find_one_or_fail(str(value), db)
 
-        return True
-
-    async def __soft_delete_cascade(
-        self, criteria: Union[str, int, FindOneOptions], db: Session
-    ) -> Optional[UpdateResult]:
-        entity = await self.find_one_or_fail(criteria, db)
+            existing_entities = BaseRepository.__get_existing_entities(
+                db, metadata.foreign_key_entities[key], values
+            )
+            referred_entities += existing_entities.values()
 
-        rowcount = await BaseRepository.__soft_delete_cascade_relations(entity, db)
-        rowcount += self.__soft_delete_entity(entity, db)
+            for result in results:
+                if result.__dict__.get(column.key) not in existing_entities:
+                    # Only the loaded state changes, it must never be flushed back to the database
+                    set_committed_value(result, column.key, None)
 
-        return UpdateResult(raw=[], affected=rowcount, generatedMaps=[])
+        return referred_entities
 
     @staticmethod
-    async def __soft_delete_cascade_relations(entity: T, db: Session) -> int:
-        rowcount = 0
-
-        cascade_entities = DatabaseUtils.get_cascade_relations(entity)
-        for cascade_entity in cascade_entities:
-            result = await BaseRepository(type(cascade_entity)).__soft_delete_cascade(
-                str(cascade_entity.id), db
+    def __get_existing_entities(db: Session, entity: Any, ids: Set[Any]) -> Dict[Any, Any]:
+        """
+        Not deleted entities with the given primary keys, keyed by the given ids. They are looked up
+        in the session identity cache first and the ones not cached yet are loaded in one query.
+        """
+        identity_cache = get_identity_cache(db)
+        existing_entities, missing_ids = identity_cache.get_many(entity, ids)
+
+        if missing_ids:
+            primary_key = entity_registry.get(entity).primary_key
+            loaded_entities = {
+                str(getattr(_en, primary_key.key)): _en
+                for _en in db.query(entity).filter(primary_key.in_(missing_ids)).all()
+            }
+            loaded_entities = {_id: loaded_entities.get(str(_id)) for _id in missing_ids}
+
+            identity_cache.set_many(entity, loaded_entities)
+            existing_entities.update(
+                (_id, _en) for _id, _en in loaded_entities.items() if _en is not None
             )
-            rowcount += result["affected"]
 
-        return rowcount
+        return existing_entities
 
     @staticmethod
-    def __soft_delete_entity(entity: T, db: Session) -> int:
-        entity_class = inspect(entity).class_
-        delete_column = DatabaseUtils.get_column_represent_deleted(get_columns(entity_class))
-        if delete_column is None:
-            raise ValueError(f'Entity "{entity_class.__name__}" has no "deleted" column')
+    def __invalidate_identity(db: Session, entity: T) -> None:
+        primary_key = entity_registry.get(type(entity)).primary_key
+        get_identity_cache(db).invalidate(type(entity), getattr(entity, primary_key.key))
+
+    def __validate_relations(self, db: Session, partial_entities: Union[dict, List[dict]]) -> None:
+        """
+        Check every foreign key of one or more entities with one query per referred table, and
+        report all the missing references together.
+        """
+        if not isinstance(partial_entities, List):
+            partial_entities = [partial_entities]
+
+        metadata = entity_registry.get(self.entity)
+        referenced_ids: Dict[Any, Set[Any]] = {}
+        for partial_entity in partial_entities:
+            for key, value in partial_entity.items():
+                if key not in metadata.foreign_keys:
+                    continue
+                if not value and metadata.foreign_keys[key].nullable:
+                    continue
+
+                referenced_ids.setdefault(metadata.foreign_key_entities[key], set()).add(value)
+
+        missing_references = {}
+        for entity, ids in referenced_ids.items():
+            existing_ids = BaseRepository.__get_existing_ids(db, entity, ids)
+            missing_ids = [_id for _id in ids if str(_id) not in existing_ids]
+            if missing_ids:
+                missing_references[entity.__name__] = missing_ids
+
+        if missing_references:
+            message = "; ".join(
+                f'Could not find any entity of type "{entity_name}" with id '
+                + ", ".join(f'"{_id}"' for _id in ids)
+                for entity_name, ids in missing_references.items()
+            )
+            raise NotFoundException(message, list(missing_references.keys()))
+
+    @staticmethod
+    def __get_existing_ids(db: Session, entity: Any, ids: Set[Any]) -> Set[str]:
+        identity_cache = get_identity_cache(db)
+        existing_entities, missing_ids = identity_cache.get_many(entity, ids - {None})
+        existing_ids = {str(_id) for _id in existing_entities}
+
+        if missing_ids:
+            metadata = entity_registry.get(entity)
+            query = select(metadata.primary_key).where(metadata.primary_key.in_(missing_ids))
+            if metadata.not_deleted_criteria is not None:
+                query = query.where(metadata.not_deleted_criteria)
+
+            loaded_ids = {str(_id) for _id in db.execute(query).scalars()}
+            identity_cache.set_many(
+                entity, {_id: None for _id in missing_ids if str(_id) not in loaded_ids}
+            )
+            existing_ids |= loaded_ids
 
-        if not getattr(entity, delete_column.name):
-            setattr(entity, delete_column.name, datetime.now())
-            db.flush()
+        return existing_ids
 
-            return 1
+    def __soft_delete_cascade(
+        self, criteria: Union[str, int, FindOneOptions], db: Session
+    ) -> Optional[UpdateResult]:
+        entity = self.__find_one_or_fail(db, criteria)
+        primary_key = entity_registry.get(self.entity).primary_key
 
-        return 0
+        rowcount = self.soft_delete_cascade.execute(db, [getattr(entity, primary_key.key)])
+
+        return UpdateResult(raw=[], affected=rowcount, generatedMaps=[])
@@ -1,6 +1,7 @@
 import contextlib
 
 from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, SessionTransaction
 
 
@@ -27,3 +28,30 @@ def keep_nested_transaction(session: Session, commit_on_complete: bool = True) -
     # This seems like it would be error-prone.
     if commit_on_complete and d["nested"].is_active:
         d.pop("nested").commit()
+
+
+@contextlib.asynccontextmanager
+async def keep_async_nested_transaction(
+    session: AsyncSession, commit_on_complete: bool = True
+) -> None:
+    """
+    Same as keep_nested_transaction, but for an AsyncSession. The savepoints are handled on the
+    underlying sync session, so the repository methods see exactly the same transaction state.
+    """
+    sync_session = session.sync_session
+    d = {"nested": await session.run_sync(lambda _session: _session.begin_nested())}
+
+    @event.listens_for(sync_session, "after_transaction_end")
+    def end_savepoint(_session: Session, transaction: SessionTransaction) -> None:
+        # Always called inside a greenlet spawned by run_sync, so the SAVEPOINT can be emitted.
+        if not d["nested"].is_active:
+            d["nested"] = _session.begin_nested()
+
+    try:
+        yield
+    finally:
+        event.remove(sync_session, "after_transaction_end", end_savepoint)
+
+    if commit_on_complete and d["nested"].is_active:
+        nested = d.pop("nested")
+        await session.run_sync(lambda _session: nested.commit())
@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Column, inspect, null, Table
+from sqlalchemy.orm import Mapper, RelationshipProperty
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy_utils import get_class_by_table
+
+from src.core.utils.database_utils import DatabaseUtils
+from .base import Base
+
+
+@dataclass(frozen=True)
+class CascadeForeignKey:
+    # entity soft deleted together with the rows referred by the foreign key
+    entity: Any
+    referred_column: Column
+    foreign_key: Column
+
+
+@dataclass(frozen=True)
+class EntityMetadata:
+    entity: Any
+    primary_key: Column
+    delete_column: Optional[Column]
+    update_column: Optional[Column]
+    # "delete_column IS NULL", built once and shared by every query of the entity
+    not_deleted_criteria: Optional[ColumnElement]
+    # attribute key -> local foreign key column
+    foreign_keys: Dict[str, Column]
+    # attribute key -> entity mapped to the referred table
+    foreign_key_entities: Dict[str, Any]
+    # relationships whose rows are soft deleted together with the entity (delete-orphan)
+    cascade_relations: List[RelationshipProperty]
+    # the foreign keys of those relationships, followed by the set-based soft-delete cascade
+    cascade_foreign_keys: List[CascadeForeignKey]
+    # its table version is bumped after every write (see table_versions.py)
+    versioned: bool
+    # its writes are followed by after_flush listeners, so they always go through the flush
+    flush_only: bool
+
+
+class EntityRegistry:
+    """
+    Mapper information used by the soft-delete filter and the BaseRepository, computed once per
+    mapped entity instead of being reflected again on every query.
+    """
+
+    def __init__(self, base: Any = Base):
+        self.base = base
+        self.__entities: Dict[Any, EntityMetadata] = {}
+        self.__tables: Dict[Table, Any] = {}
+
+    # ----------- PUBLIC METHODS -----------
+    def build(self) -> None:
+        mappers = list(self.base.registry.mappers)
+
+        self.__tables = {mapper.local_table: mapper.class_ for mapper in mappers}
+        self.__entities = {mapper.class_: self.__build_metadata(mapper) for mapper in mappers}
+
+    def get(self, entity: Any) -> EntityMetadata:
+        metadata = self.__entities.get(entity)
+        if metadata is None:
+            # Entities used before the registry is built (scripts, tests) are registered on demand
+            metadata = self.__entities[entity] = self.__build_metadata(inspect(entity))
+
+        return metadata
+
+    def get_entity_by_table(self, table: Table) -> Any:
+        entity = self.__tables.get(table)
+        if entity is None:
+            entity = self.__tables[table] = get_class_by_table(self.base, table)
+
+        return entity
+
+    # ----------- PRIVATE METHODS -----------
+    def __build_metadata(self, mapper: Mapper) -> EntityMetadata:
+        delete_column = DatabaseUtils.get_column_represent_deleted(mapper.columns)
+        foreign_keys = {
+            key: column for key, column in mapper.columns.items() if column.foreign_keys
+        }
+        cascade_relations = [
+            relationship
+            for relationship in mapper.relationships
+            if relationship.cascade.delete_orphan
+        ]
+
+        return EntityMetadata(
+            entity=mapper.class_,
+            primary_key=mapper.primary_key[0],
+            delete_column=delete_column,
+            update_column=DatabaseUtils.get_column_represent_updated(mapper.columns),
+            not_deleted_criteria=delete_column == null() if delete_column is not None else None,
+            foreign_keys=foreign_keys,
+            foreign_key_entities={
+                key: self.get_entity_by_table(next(iter(column.foreign_keys)).column.table)
+                for key, column in foreign_keys.items()
+            },
+            cascade_relations=cascade_relations,
+            cascade_foreign_keys=[
+                CascadeForeignKey(
+                    entity=relationship.mapper.class_,
+                    referred_column=referred_column,
+                    foreign_key=foreign_key,
+                )
+                for relationship in cascade_relations
+                for referred_column, foreign_key in relationship.local_remote_pairs
+            ],
+            versioned=bool(mapper.local_table.info.get("versioned")),
+            flush_only=bool(mapper.local_table.info.get("flush_only")),
+        )
+
+
+entity_registry = EntityRegistry()
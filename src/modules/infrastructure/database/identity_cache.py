@@ -0,0 +1,70 @@
+from typing import Any, Dict, Iterable, Optional, Set, Tuple, TypeVar, Union
+
+from cachetools import LRUCache
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+IDENTITY_CACHE_KEY = "identity_cache"
+IDENTITY_CACHE_SIZE = 10_000  # entities per session
+
+
+class IdentityCache:
+    """
+    Entities already looked up by primary key in a session, or None for the ones that do not exist
+    (or are soft deleted). It lives in the session info, so it is dropped with the session at the
+    end of the request, and it holds strong references so the identity map keeps the cached rows.
+    """
+
+    def __init__(self, maxsize: int = IDENTITY_CACHE_SIZE):
+        self.__entries = LRUCache(maxsize=maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    # ----------- PUBLIC METHODS -----------
+    def get_many(self, entity: T, ids: Iterable[Any]) -> Tuple[Dict[Any, T], Set[Any]]:
+        """
+        Return the cached entities that exist, keyed by the given ids, and the ids not cached yet.
+        Ids cached as missing are in neither of them.
+        """
+        existing_entities, missing_ids = {}, set()
+
+        for _id in ids:
+            key = (entity, str(_id))
+            if key not in self.__entries:
+                self.misses += 1
+                missing_ids.add(_id)
+                continue
+
+            self.hits += 1
+            if self.__entries[key] is not None:
+                existing_entities[_id] = self.__entries[key]
+
+        return existing_entities, missing_ids
+
+    def set_many(self, entity: T, values: Dict[Any, Optional[T]]) -> None:
+        for _id, value in values.items():
+            self.__entries[(entity, str(_id))] = value
+
+    def invalidate(self, entity: T, _id: Any) -> None:
+        self.__entries.pop((entity, str(_id)), None)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+
+def get_identity_cache(db: Union[Session, AsyncSession]) -> IdentityCache:
+    identity_cache = db.info.get(IDENTITY_CACHE_KEY)
+    if identity_cache is None:
+        identity_cache = db.info[IDENTITY_CACHE_KEY] = IdentityCache()
+
+    return identity_cache
+
+
+# the rows cached during a rolled back transaction may no longer exist, or exist again
+@event.listens_for(Session, "after_rollback")
+def clear_identity_cache(session: Session) -> None:
+    if IDENTITY_CACHE_KEY in session.info:
+        session.info[IDENTITY_CACHE_KEY].clear()
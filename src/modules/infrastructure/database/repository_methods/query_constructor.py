@@ -1,14 +1,32 @@
-from typing import TypeVar, Union
-
-from sqlalchemy import inspect
-from sqlalchemy.orm import joinedload, load_only, Query, Session
+from typing import Dict, List, TypeVar, Union
+
+from sqlalchemy import null
+from sqlalchemy.orm import (
+    joinedload,
+    Load,
+    load_only,
+    Query,
+    raiseload,
+    selectinload,
+    Session,
+    subqueryload,
+)
+from sqlalchemy.orm.attributes import InstrumentedAttribute
 
 from src.core.types.find_many_options_type import FindManyOptions
 from src.core.types.find_one_options_type import FindOneOptions
+from ..entity_registry import entity_registry
 
 T = TypeVar("T")
 E = TypeVar("E")
 
+LOADING_STRATEGIES = {
+    "joined": joinedload,
+    "selectin": selectinload,
+    "subquery": subqueryload,
+    "raise": raiseload,
+}
+
 
 class QueryConstructor:
     def __init__(self, entity: T):
@@ -20,6 +38,7 @@ class QueryConstructor:
         db: Session,
         criteria: Union[str, int, FindOneOptions, FindManyOptions] = None,
         entity: E = None,
+        with_deleted: bool = False,
     ) -> Query:
         entity = entity or self.entity
 
@@ -28,7 +47,31 @@ class QueryConstructor:
 
         query = db.query(entity)
 
-        return self.__apply_options(query, entity, criteria)
+        return self.__apply_options(query, entity, criteria, with_deleted)
+
+    @staticmethod
+    def get_relation_strategies(
+        entity: Union[T, E], relations: Union[List[str], Dict[str, str]]
+    ) -> Dict[str, str]:
+        """
+        Loading strategy of each relation, given as a list of relations or as a dict of relation
+        to strategy ("joined", "selectin", "subquery" or "raise"). By default a collection is loaded
+        with "selectin", one `IN` query per page instead of multiplying its rows, and a single
+        related entity is joined.
+        """
+        if not isinstance(relations, dict):
+            relations = dict.fromkeys(relations)
+
+        strategies = {}
+        for relation, strategy in relations.items():
+            if strategy is None:
+                strategy = "selectin" if getattr(entity, relation).property.uselist else "joined"
+            elif strategy not in LOADING_STRATEGIES:
+                raise KeyError(f"Unknown loading strategy: {strategy} for relation {relation}")
+
+            strategies[relation] = strategy
+
+        return strategies
 
     # ----------- PRIVATE METHODS -----------
     def __apply_options(
@@ -36,6 +79,7 @@ class QueryConstructor:
         query: Query,
         entity: Union[T, E],
         options_dict: Union[FindOneOptions, FindManyOptions] = None,
+        with_deleted: bool = False,
     ) -> Query:
         if not options_dict:
             return query
@@ -54,15 +98,50 @@ class QueryConstructor:
                 query = query.offset(options_dict[key])
             elif key == "take":
                 query = query.limit(options_dict[key])
+            elif key == "seek":
+                query = query.where(*options_dict[key]["where"])
             elif key == "relations":
                 query = query.options(
-                    joinedload(getattr(entity, relation)) for relation in options_dict[key]
+                    self.__load_relation(entity, relation, strategy, with_deleted)
+                    for relation, strategy in self.get_relation_strategies(
+                        entity, options_dict[key]
+                    ).items()
                 )
             else:
                 raise KeyError(f"Unknown option: {key} in FindOptions")
 
         return query
 
+    @staticmethod
+    def __load_relation(
+        entity: Union[T, E], relation: str, strategy: str, with_deleted: bool = False
+    ) -> Load:
+        if strategy == "raise":
+            return raiseload(getattr(entity, relation))
+
+        return LOADING_STRATEGIES[strategy](
+            QueryConstructor.__get_relation(entity, relation, with_deleted)
+        )
+
+    @staticmethod
+    def __get_relation(
+        entity: Union[T, E], relation: str, with_deleted: bool = False
+    ) -> InstrumentedAttribute:
+        """
+        The soft-delete criteria of the related entity goes into the join itself, so deleted related
+        rows are never loaded instead of being removed from each result afterwards.
+        """
+        relation_attribute = getattr(entity, relation)
+        if with_deleted:
+            return relation_attribute
+
+        related_entity = relation_attribute.property.mapper.class_
+        delete_column = entity_registry.get(related_entity).delete_column
+        if delete_column is None:
+            return relation_attribute
+
+        return relation_attribute.and_(getattr(related_entity, delete_column.key) == null())
+
     @staticmethod
     def __fix_options_dict(
         options_dict: Union[FindManyOptions, FindOneOptions]
@@ -77,4 +156,4 @@ class QueryConstructor:
     def __generate_find_one_options_dict(
         criteria: Union[str, int], entity: Union[T, E]
     ) -> FindOneOptions:
-        return {"where": [inspect(entity).primary_key[0] == criteria]}
+        return {"where": [entity_registry.get(entity).primary_key == criteria]}
@@ -0,0 +1,152 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Set, Tuple, TypeVar
+
+from sqlalchemy import any_, bindparam, or_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ..entity_registry import entity_registry, EntityMetadata
+from ..identity_cache import get_identity_cache
+from .table_versions import mark_written_tables
+
+T = TypeVar("T")
+
+# entity -> (attribute keys, listener) pairs, see SoftDeleteCascade.listens_for
+cascade_listeners: Dict[Any, List[Tuple[List[str], Callable[[Session, List[tuple]], None]]]] = {}
+
+
+class SoftDeleteCascade:
+    """
+    Soft delete an entity together with its delete-orphan relations, one level of the relationship
+    graph at a time: every table reached at a depth is updated by a single
+    `UPDATE ... SET deleted_at = now WHERE foreign_key = ANY(:ids) AND deleted_at IS NULL`, and the
+    returned ids are the parents of the next depth.
+    """
+
+    def __init__(self, entity: T):
+        self.entity = entity
+
+    # ----------- PUBLIC METHODS -----------
+    @staticmethod
+    def listens_for(entity: Any, keys: List[str]) -> Callable:
+        """
+        Register a `listener(db, rows)` called at the end of every cascade that soft deleted rows of
+        `entity`, with the values of `keys` of each one. The cascade runs outside the ORM, so it is
+        the only way to see these rows, as the flush events never do.
+        """
+
+        def register(listener: Callable[[Session, List[tuple]], None]) -> Callable:
+            cascade_listeners.setdefault(entity, []).append((keys, listener))
+            return listener
+
+        return register
+
+    def execute(self, db: Session, ids: List[Any]) -> int:
+        """
+        Soft delete the entities with the given primary keys and everything cascading from them.
+        Returns the number of rows soft deleted, rows already deleted are neither counted nor
+        followed.
+        """
+        deleted_at = datetime.now()
+        metadata = entity_registry.get(self.entity)
+
+        affected = 0
+        deleted_entities = set()
+        deleted_rows: Dict[Any, List[Any]] = {}
+        level = {self.entity: [SoftDeleteCascade.__any(metadata.primary_key, ids)]}
+        while level:
+            next_level: Dict[Any, List[Any]] = {}
+
+            for entity, criteria in level.items():
+                metadata = entity_registry.get(entity)
+                rows = SoftDeleteCascade.__soft_delete(db, metadata, or_(*criteria), deleted_at)
+                affected += len(rows)
+                if rows:
+                    deleted_entities.add(entity)
+                if rows and entity in cascade_listeners:
+                    deleted_rows.setdefault(entity, []).extend(rows)
+
+                for cascade_foreign_key in metadata.cascade_foreign_keys:
+                    referred_ids = {row[cascade_foreign_key.referred_column] for row in rows}
+                    referred_ids.discard(None)
+                    if referred_ids:
+                        next_level.setdefault(cascade_foreign_key.entity, []).append(
+                            SoftDeleteCascade.__any(cascade_foreign_key.foreign_key, referred_ids)
+                        )
+
+            level = next_level
+
+        mark_written_tables(db, deleted_entities)
+
+        # once the whole cascade is done, so the listeners see every row it deleted
+        for entity, rows in deleted_rows.items():
+            columns = inspect(entity).columns
+            for keys, listener in cascade_listeners[entity]:
+                listener(db, [tuple(row[columns[key]] for key in keys) for row in rows])
+
+        return affected
+
+    # ----------- PRIVATE METHODS -----------
+    @staticmethod
+    def __soft_delete(
+        db: Session, metadata: EntityMetadata, criteria: Any, deleted_at: datetime
+    ) -> List[Any]:
+        if metadata.delete_column is None:
+            raise ValueError(f'Entity "{metadata.entity.__name__}" has no "deleted" column')
+
+        values = {metadata.delete_column.key: deleted_at}
+        if metadata.update_column is not None:
+            values[metadata.update_column.key] = deleted_at
+
+        mapper = inspect(metadata.entity)
+        returning = (
+            {metadata.primary_key}
+            | {
+                cascade_foreign_key.referred_column
+                for cascade_foreign_key in metadata.cascade_foreign_keys
+            }
+            | {
+                mapper.columns[key]
+                for keys, _ in cascade_listeners.get(metadata.entity, [])
+                for key in keys
+            }
+        )
+        statement = (
+            metadata.entity.__table__.update()
+            .where(criteria, metadata.not_deleted_criteria)
+            .values(values)
+            .returning(*returning)
+        )
+        rows = [row._mapping for row in db.execute(statement)]
+
+        SoftDeleteCascade.__synchronize_session(
+            db, metadata, {row[metadata.primary_key] for row in rows}, values
+        )
+
+        return rows
+
+    @staticmethod
+    def __synchronize_session(
+        db: Session, metadata: EntityMetadata, ids: Set[Any], values: Dict[str, Any]
+    ) -> None:
+        """
+        The rows were updated without the ORM, so the ones already loaded in the session get the
+        new values as their committed state, and none of them is served by the identity cache.
+        """
+        mapper = inspect(metadata.entity)
+        identity_cache = get_identity_cache(db)
+
+        for _id in ids:
+            identity_cache.invalidate(metadata.entity, _id)
+
+            _entity = db.identity_map.get(mapper.identity_key_from_primary_key([_id]))
+            if _entity is not None:
+                for key, value in values.items():
+                    set_committed_value(_entity, key, value)
+
+    @staticmethod
+    def __any(column: Any, ids: Any) -> Any:
+        # A single array parameter, so the statement size does not depend on the number of ids
+        return column == any_(bindparam(None, list(ids), type_=ARRAY(column.type)))
@@ -1,28 +1,36 @@
 import contextlib
+from contextvars import ContextVar
 from typing import Union
 
-from sqlalchemy import event, null
+from sqlalchemy import event
 from sqlalchemy.orm import DeclarativeMeta, Query
-from sqlalchemy_utils import get_columns
 
 from src.core.types.find_many_options_type import FindManyOptions
 from src.core.types.find_one_options_type import FindOneOptions
 from src.core.utils.database_utils import DatabaseUtils
+from ..entity_registry import entity_registry
 
 
 class PauseListener:
     def __init__(self):
-        self.paused = False
+        # Context-local, so concurrent requests on the same event loop don't pause each other
+        self._paused: ContextVar[bool] = ContextVar("soft_delete_filter_paused", default=False)
+
+    @property
+    def paused(self) -> bool:
+        return self._paused.get()
 
     @contextlib.contextmanager
     def pause(self, condition: Union[FindOneOptions, FindManyOptions, bool] = True):
-        self.paused = (
+        token = self._paused.set(
             condition
             if isinstance(condition, bool)
             else DatabaseUtils.is_with_deleted_data(condition)
         )
-        yield
-        self.paused = False
+        try:
+            yield
+        finally:
+            self._paused.reset(token)
 
     def __call__(self, fn):
         def run_fn(*arg, **kw):
@@ -39,17 +47,15 @@ pause_listener = PauseListener()
 @event.listens_for(Query, "before_compile", retval=True)
 @pause_listener
 def no_deleted(query: Query) -> Query:
-    columns = (
-        []
-        if not isinstance(query.column_descriptions[0]["entity"], DeclarativeMeta)
-        else get_columns(query.column_descriptions[0]["entity"])
-    )
-
-    column = DatabaseUtils.get_column_represent_deleted(columns)
-    if column is not None:
-        if not DatabaseUtils.should_apply_filter(query, column):
+    entity = query.column_descriptions[0]["entity"]
+    if not isinstance(entity, DeclarativeMeta):
+        return query
+
+    metadata = entity_registry.get(entity)
+    if metadata.delete_column is not None:
+        if not DatabaseUtils.should_apply_filter(query, metadata.delete_column):
             return query
 
-        query = query.enable_assertions(False).where(column == null())
+        query = query.enable_assertions(False).where(metadata.not_deleted_criteria)
 
     return query
@@ -0,0 +1,83 @@
+"""
+The versioned tables, the ones marked with `__table_args__ = {"info": {"versioned": True}}`, have a
+`<table name>_version_seq` sequence moved forward after every commit that wrote them, so anything
+built from them can tell it is stale with a single read of the sequences. Taking a sequence value
+never waits on other transactions, so concurrent writers are not serialized, and it is only taken
+once the written rows are visible, so no reader can build from the old rows under the new version.
+"""
+from typing import Any, Iterable, List, Tuple, Union
+
+from sqlalchemy import column, event, select, Sequence, table
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, SessionTransaction
+
+from ..entity_registry import entity_registry
+
+WRITTEN_TABLES_KEY = "written_versioned_tables"  # Session.info key of the tables to bump
+
+pg_sequences = table("pg_sequences", column("sequencename"), column("last_value"))
+
+
+def get_version_sequence_name(table_name: str) -> str:
+    return f"{table_name}_version_seq"
+
+
+def get_versioned_table_names(entities: Iterable[Any]) -> List[str]:
+    return sorted(
+        {entity.__tablename__ for entity in entities if entity_registry.get(entity).versioned}
+    )
+
+
+def mark_written_tables(db: Session, entities: Iterable[Any]) -> None:
+    """
+    Bump the version of the versioned tables of `entities` once the transaction is committed. The
+    flush marks its entities by itself, only the writes made without the ORM have to call it.
+    """
+    table_names = get_versioned_table_names(entities)
+    if table_names:
+        db.info.setdefault(WRITTEN_TABLES_KEY, set()).update(table_names)
+
+
+def bump_table_versions(bind: Union[Engine, Connection], table_names: Iterable[str]) -> None:
+    """Bump the version of the tables right away, outside of any transaction of the caller"""
+    sequences = [Sequence(get_version_sequence_name(table_name)) for table_name in table_names]
+    if not sequences:
+        return
+
+    with bind.engine.connect() as connection:
+        connection.execute(select(*[sequence.next_value() for sequence in sequences]))
+
+
+def get_table_versions(db: Session, entities: Iterable[Any]) -> Tuple[int, ...]:
+    """The version of the table of each entity, 0 for the tables never written"""
+    sequence_names = [get_version_sequence_name(entity.__tablename__) for entity in entities]
+    versions = dict(
+        db.execute(
+            select(pg_sequences.c.sequencename, pg_sequences.c.last_value).where(
+                pg_sequences.c.sequencename.in_(sequence_names)
+            )
+        ).all()
+    )
+
+    return tuple(versions.get(sequence_name) or 0 for sequence_name in sequence_names)
+
+
+@event.listens_for(Session, "after_flush")
+def mark_flushed_tables(session: Session, flush_context: Any) -> None:
+    mark_written_tables(
+        session, {type(target) for target in (*session.new, *session.dirty, *session.deleted)}
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def bump_committed_table_versions(session: Session) -> None:
+    table_names = session.info.pop(WRITTEN_TABLES_KEY, None)
+    if table_names:
+        bump_table_versions(session.get_bind(), sorted(table_names))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def forget_rolled_back_tables(session: Session, previous_transaction: SessionTransaction) -> None:
+    # a rolled back savepoint keeps the marks of the outer transaction: an extra bump is harmless
+    if previous_transaction.parent is None:
+        session.info.pop(WRITTEN_TABLES_KEY, None)
@@ -1,7 +1,10 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from config import (
+    APP_ENV,
     APP_TZ,
     DATABASE_CONNECTION,
     DATABASE_HOST,
@@ -15,7 +18,25 @@ SQLALCHEMY_DATABASE_URL = (
     f"{DATABASE_CONNECTION}://{DATABASE_USERNAME}:{DATABASE_PASSWORD}"
     f"@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}"
 )
+ASYNC_SQLALCHEMY_DATABASE_URL = (
+    f"{DATABASE_CONNECTION}+asyncpg://{DATABASE_USERNAME}:{DATABASE_PASSWORD}"
+    f"@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}"
+)
 
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"options": f"-c timezone={APP_TZ}"})
+# asyncpg connections are bound to the event loop that opened them, and the tests run one loop per
+# module, so pooled connections are only kept outside the test environment
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    connect_args={"server_settings": {"timezone": APP_TZ}},
+    poolclass=NullPool if APP_ENV == "test" else AsyncAdaptedQueuePool,
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=async_engine,
+    class_=AsyncSession,
+)
@@ -0,0 +1,11 @@
+from config import CELERY_BROKER_URL, JOB_BACKEND, JOB_SQLITE_PATH, JOB_STORE, JOB_WORKERS
+from .job_backends import CeleryJobBackend, LocalJobBackend
+from .job_queue import JobQueue
+from .job_stores import MemoryJobStore, SqliteJobStore
+
+job_queue = JobQueue(
+    SqliteJobStore(JOB_SQLITE_PATH) if JOB_STORE == "sqlite" else MemoryJobStore(),
+    CeleryJobBackend(CELERY_BROKER_URL)
+    if JOB_BACKEND == "celery"
+    else LocalJobBackend(JOB_WORKERS),
+)
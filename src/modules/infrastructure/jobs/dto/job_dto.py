@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, confloat
+
+from src.core.constants.enum.job_status import JobStatus
+
+
+class JobDto(BaseModel):
+    id: UUID
+    name: str
+    status: JobStatus
+    progress: confloat(ge=0, le=1) = 0
+    result: Optional[Any]
+    error: Optional[str]
+    created_at: datetime
+    updated_at: datetime
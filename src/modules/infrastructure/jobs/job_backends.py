@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+
+class JobBackend(ABC):
+    """Runs the stored jobs, given only their id: everything else is read from the job store"""
+
+    @abstractmethod
+    def bind(self, run: Callable[[str], None]) -> None:
+        """`run` executes a job by its id, in whatever process picks it"""
+
+    @abstractmethod
+    def submit(self, job_id: str) -> None:
+        pass
+
+
+class LocalJobBackend(JobBackend):
+    """Runs the jobs on a thread pool of the API process, with no broker"""
+
+    def __init__(self, max_workers: int):
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="job")
+        self.run = None
+
+    def bind(self, run: Callable[[str], None]) -> None:
+        self.run = run
+
+    def submit(self, job_id: str) -> None:
+        self.executor.submit(self.run, job_id)
+
+
+class CeleryJobBackend(JobBackend):
+    """
+    Sends the job ids to Celery workers (`celery -A src.celery_worker worker`), that must share the
+    job store with the API, e.g. a SqliteJobStore on a shared volume.
+    """
+
+    def __init__(self, broker_url: str):
+        # Celery is only needed, and imported, with this backend
+        from celery import Celery
+
+        self.app = Celery("aquavitae", broker=broker_url)
+        self.task = None
+
+    def bind(self, run: Callable[[str], None]) -> None:
+        self.task = self.app.task(name="jobs.run", ignore_result=True)(run)
+
+    def submit(self, job_id: str) -> None:
+        self.task.delay(job_id)
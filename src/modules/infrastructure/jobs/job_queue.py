@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+
+from src.core.constants.enum.job_status import JobStatus
+from src.core.types.exceptions_type import NotFoundException
+from src.modules.infrastructure.jobs.dto.job_dto import JobDto
+from src.modules.infrastructure.jobs.job_backends import JobBackend
+from src.modules.infrastructure.jobs.job_stores import JobStore
+
+JobFunction = Callable[..., Awaitable[Any]]
+
+JOB_HEARTBEAT_INTERVAL = 30  # seconds between the updates that keep a running job from going stale
+
+
+class JobQueue:
+    """
+    Runs registered async functions in the background. A job is stored with the keyword arguments
+    of its function and handed to the backend by id, so it can run in this process or in another
+    one sharing the store. The function gets a `set_progress` callback, from 0 to 1, and what it
+    returns, encoded to JSON, is the result of the job. While it runs, the job is touched every
+    `heartbeat_interval` seconds, so the store can tell it from one left behind by a stopped
+    process.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        backend: JobBackend,
+        heartbeat_interval: float = JOB_HEARTBEAT_INTERVAL,
+    ):
+        self.store = store
+        self.backend = backend
+        self.heartbeat_interval = heartbeat_interval
+        self.functions: Dict[str, JobFunction] = {}
+
+        self.backend.bind(self.run)
+
+    # ----------- PUBLIC METHODS -----------
+    def register(self, name: str) -> Callable[[JobFunction], JobFunction]:
+        def decorator(function: JobFunction) -> JobFunction:
+            self.functions[name] = function
+            return function
+
+        return decorator
+
+    def enqueue(self, name: str, kwargs: dict, dedupe_key: str = None) -> JobDto:
+        """
+        While a job with the same `dedupe_key` is pending or running, that job is returned instead
+        of a new one.
+        """
+        if name not in self.functions:
+            raise ValueError(f'There is no job registered as "{name}"')
+
+        job, created = self.store.create(name, jsonable_encoder(kwargs), dedupe_key)
+        if created:
+            self.backend.submit(job["id"])
+
+        return JobDto(**job)
+
+    def get(self, job_id: str) -> JobDto:
+        job = self.store.get(str(job_id))
+        if job is None:
+            raise NotFoundException(
+                f'Could not find any job with the id "{job_id}"', [JobDto.__name__]
+            )
+
+        return JobDto(**job)
+
+    def run(self, job_id: str) -> None:
+        job = self.store.get(job_id)
+        if job is None or job["status"] != JobStatus.PENDING.value:
+            # already run, or failed as stale while it waited
+            return
+
+        self.store.update(job_id, status=JobStatus.RUNNING.value)
+
+        def set_progress(progress: float) -> None:
+            self.store.update(job_id, progress=min(max(progress, 0), 1))
+
+        stop_heartbeat = threading.Event()
+
+        def heartbeat() -> None:
+            while not stop_heartbeat.wait(self.heartbeat_interval):
+                self.store.update(job_id)
+
+        heartbeat_thread = threading.Thread(target=heartbeat, daemon=True)
+        heartbeat_thread.start()
+
+        try:
+            try:
+                result = asyncio.run(self.functions[job["name"]](set_progress, **job["kwargs"]))
+            finally:
+                stop_heartbeat.set()
+                heartbeat_thread.join()
+        except Exception as error:
+            logging.exception(f'Job "{job_id}" failed')
+            self.store.update(
+                job_id,
+                status=JobStatus.FAILED.value,
+                error=getattr(error, "msg", None) or str(error) or type(error).__name__,
+            )
+            return
+
+        self.store.update(
+            job_id, status=JobStatus.SUCCEEDED.value, progress=1, result=jsonable_encoder(result)
+        )
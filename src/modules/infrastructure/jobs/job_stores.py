@@ -0,0 +1,209 @@
+import json
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from cachetools import TTLCache
+
+from src.core.constants.enum.job_status import JobStatus
+
+FINISHED_JOBS_SIZE = 1000  # finished jobs kept by the memory store
+FINISHED_JOBS_TTL = 60 * 60  # seconds a finished job and its result can still be read
+STALE_JOB_TIMEOUT = 10 * 60  # seconds an active job can go without updates before it is failed
+STALE_JOB_ERROR = "The job stopped without finishing"
+
+
+class JobStore(ABC):
+    """
+    Where the jobs are kept, as dicts with the JobDto fields plus the `kwargs` of the job function
+    and its `dedupe_key`. A store shared between processes lets any of them report the job status.
+    """
+
+    @abstractmethod
+    def create(self, name: str, kwargs: dict, dedupe_key: str = None) -> Tuple[dict, bool]:
+        """
+        Store a new pending job, unless a pending or running job has the same `dedupe_key`: that
+        one is returned instead. The flag tells whether the job was created.
+        """
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    def update(self, job_id: str, **values: Any) -> None:
+        pass
+
+    @staticmethod
+    def new_job(name: str, kwargs: dict, dedupe_key: str = None) -> dict:
+        now = datetime.now(timezone.utc)
+        return {
+            "id": str(uuid.uuid4()),
+            "name": name,
+            "kwargs": kwargs,
+            "dedupe_key": dedupe_key,
+            "status": JobStatus.PENDING.value,
+            "progress": 0,
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+
+class MemoryJobStore(JobStore):
+    """
+    Jobs only seen by the process that runs them, for the in-process executor. The finished jobs
+    are moved to a cache bounded in size and time, so their results do not pile up in memory.
+    """
+
+    def __init__(
+        self, finished_size: int = FINISHED_JOBS_SIZE, finished_ttl: int = FINISHED_JOBS_TTL
+    ):
+        self.jobs: Dict[str, dict] = {}
+        self.finished_jobs = TTLCache(maxsize=finished_size, ttl=finished_ttl)
+        self.lock = threading.Lock()
+
+    def create(self, name: str, kwargs: dict, dedupe_key: str = None) -> Tuple[dict, bool]:
+        with self.lock:
+            for job in self.jobs.values():
+                if dedupe_key is not None and job["dedupe_key"] == dedupe_key:
+                    return dict(job), False
+
+            job = JobStore.new_job(name, kwargs, dedupe_key)
+            self.jobs[job["id"]] = job
+            return dict(job), True
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self.lock:
+            job = self.jobs.get(str(job_id)) or self.finished_jobs.get(str(job_id))
+            return dict(job) if job else None
+
+    def update(self, job_id: str, **values: Any) -> None:
+        with self.lock:
+            job = self.jobs.get(str(job_id)) or self.finished_jobs[str(job_id)]
+            job.update(values, updated_at=datetime.now(timezone.utc))
+
+            # self.jobs only keeps the active jobs
+            if job["status"] not in JobStatus.active_statuses():
+                self.jobs.pop(str(job_id), None)
+                self.finished_jobs[str(job_id)] = job
+
+
+class SqliteJobStore(JobStore):
+    """
+    Jobs in a SQLite file, seen by every process on the host (gunicorn workers, a Celery worker).
+    A partial unique index keeps a single active job per `dedupe_key`. The running jobs are touched
+    on a heartbeat, so the active ones not updated for `stale_timeout` seconds were left behind by
+    a process that stopped: they are failed, and no longer block their `dedupe_key`.
+    """
+
+    JSON_COLUMNS = ("kwargs", "result")
+
+    def __init__(self, path: str, stale_timeout: float = STALE_JOB_TIMEOUT):
+        self.path = path
+        self.stale_timeout = stale_timeout
+
+        active_statuses = ", ".join(f"'{status}'" for status in JobStatus.active_statuses())
+        with closing(self.__connect()) as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS job ("
+                "id TEXT PRIMARY KEY, name TEXT NOT NULL, kwargs TEXT NOT NULL, dedupe_key TEXT, "
+                "status TEXT NOT NULL, progress REAL NOT NULL, result TEXT, error TEXT, "
+                "created_at TEXT NOT NULL, updated_at TEXT NOT NULL)"
+            )
+            connection.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS job_active_dedupe_key ON job (dedupe_key) "
+                f"WHERE status IN ({active_statuses})"
+            )
+
+    def create(self, name: str, kwargs: dict, dedupe_key: str = None) -> Tuple[dict, bool]:
+        job = JobStore.new_job(name, kwargs, dedupe_key)
+        values = SqliteJobStore.__to_row(job)
+
+        with closing(self.__connect()) as connection:
+            self.__fail_stale_jobs(connection)
+
+            try:
+                connection.execute(
+                    f"INSERT INTO job ({', '.join(values)}) VALUES ({', '.join('?' * len(values))})",
+                    list(values.values()),
+                )
+                return job, True
+            except sqlite3.IntegrityError:
+                active_statuses = JobStatus.active_statuses()
+                row = connection.execute(
+                    "SELECT * FROM job WHERE dedupe_key = ? "
+                    f"AND status IN ({', '.join('?' * len(active_statuses))})",
+                    [dedupe_key, *active_statuses],
+                ).fetchone()
+                if row is None:
+                    # the active job ended in between
+                    return self.create(name, kwargs, dedupe_key)
+
+                return SqliteJobStore.__from_row(row), False
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with closing(self.__connect()) as connection:
+            self.__fail_stale_jobs(connection, job_id)
+            row = connection.execute("SELECT * FROM job WHERE id = ?", [str(job_id)]).fetchone()
+
+        return SqliteJobStore.__from_row(row) if row else None
+
+    def update(self, job_id: str, **values: Any) -> None:
+        values = SqliteJobStore.__to_row({**values, "updated_at": datetime.now(timezone.utc)})
+
+        with closing(self.__connect()) as connection:
+            connection.execute(
+                f"UPDATE job SET {', '.join(f'{key} = ?' for key in values)} WHERE id = ?",
+                [*values.values(), str(job_id)],
+            )
+
+    def __fail_stale_jobs(self, connection: sqlite3.Connection, job_id: str = None) -> None:
+        """Fails the active jobs, or the given one if active, not updated for `stale_timeout`"""
+        now = datetime.now(timezone.utc)
+        active_statuses = JobStatus.active_statuses()
+        connection.execute(
+            "UPDATE job SET status = ?, error = ?, updated_at = ? "
+            f"WHERE status IN ({', '.join('?' * len(active_statuses))}) AND updated_at < ?"
+            + (" AND id = ?" if job_id is not None else ""),
+            [
+                JobStatus.FAILED.value,
+                STALE_JOB_ERROR,
+                now.isoformat(),
+                *active_statuses,
+                (now - timedelta(seconds=self.stale_timeout)).isoformat(),
+                *([str(job_id)] if job_id is not None else []),
+            ],
+        )
+
+    def __connect(self) -> sqlite3.Connection:
+        # autocommit, every statement is its own transaction
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    @staticmethod
+    def __to_row(job: dict) -> dict:
+        row = {}
+        for key, value in job.items():
+            if key in SqliteJobStore.JSON_COLUMNS:
+                value = json.dumps(value)
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+
+            row[key] = value
+
+        return row
+
+    @staticmethod
+    def __from_row(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        for key in SqliteJobStore.JSON_COLUMNS:
+            job[key] = json.loads(job[key]) if job[key] is not None else None
+
+        return job
@@ -15,6 +15,7 @@ from src.core.types.find_many_options_type import FindManyOptions
 from src.core.types.find_one_options_type import FindOneOptions
 from src.core.types.update_result_type import UpdateResult
 from src.core.utils.image_utils import ImageUtils
+from src.core.utils.pagination_utils import PaginationUtils
 from .dto.create_user_dto import CreateUserDto, CreateUserWithRoleDto
 from .dto.update_user_dto import UpdateUserDto
 from .dto.user_dto import UserDto
@@ -51,7 +52,7 @@ class UserService:
 
                 new_user = await self.user_repository.create(new_user, db_session)
 
-            new_user = self.user_repository.save(new_user, db_session)
+            new_user = await self.user_repository.save(new_user, db_session)
 
             new_user_dto = deepcopy(new_user)
             new_user_dto.profile_photo = self.image_utils.get_image(new_user.profile_photo)
@@ -82,6 +83,7 @@ class UserService:
             total,
             pagination["skip"],
             pagination["take"],
+            PaginationUtils.get_next_cursor(pagination, all_users),
         )
 
     async def find_one_user(
@@ -8,6 +8,11 @@ from sqlalchemy.orm import DeclarativeMeta
 from config import APP_ENV
 from src.modules.infrastructure.database import get_db
 from src.modules.infrastructure.database.base import Base
+from src.modules.infrastructure.database.entity_registry import entity_registry
+from src.modules.infrastructure.database.repository_methods.table_versions import (
+    bump_table_versions,
+    get_versioned_table_names,
+)
 from src.modules.infrastructure.database.session import engine
 
 T = TypeVar("T")
@@ -34,6 +39,15 @@ class DatabaseConfigTest:
 
         return items
 
+    @staticmethod
+    def __bump_table_versions(entities: List[Table]) -> None:
+        bump_table_versions(
+            engine,
+            get_versioned_table_names(
+                [entity_registry.get_entity_by_table(entity) for entity in entities]
+            ),
+        )
+
     # ----------- PUBLIC METHODS -----------
     async def close_db_connection(self) -> None:
         self.db.close()
@@ -63,6 +77,8 @@ class DatabaseConfigTest:
 
         await self.clean_all(list(reversed(entities)))
         await self.load_all(entities)
+        # the fixtures are written without the ORM, so a cache could take them for the old rows
+        self.__bump_table_versions(entities)
 
     @staticmethod
     async def clean_all(entities: List[Table]) -> None: